@@ -1,6 +1,7 @@
 """FastAPI Main Application - Quantum SCF Risk Optimizer API."""
 import sys
 import os
+from contextlib import asynccontextmanager
 from pathlib import Path
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
@@ -21,12 +22,25 @@ if str(root_path) not in sys.path:
 if str(backend_path) not in sys.path:
     sys.path.insert(0, str(backend_path))
 
+from infrastructure.http import close_clients
+from infrastructure.quantum.planqk_solver import close_hub_clients
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Shutdown: close pooled provider connections (sync clients and the async hub clients)
+    await close_hub_clients()
+    close_clients()
+
+
 app = FastAPI(
     title="Quantum SCF Risk Optimizer",
     description="Hybrid quantum/classical supply chain finance risk optimization API",
     version="1.0.0",
     docs_url="/api/docs",
-    openapi_url="/api/openapi.json"
+    openapi_url="/api/openapi.json",
+    lifespan=lifespan
 )
 
 # 1. Health Check (Immediate Priority)
@@ -1,9 +1,15 @@
 """Optimize Routes - API endpoints for SCF optimization."""
-from fastapi import APIRouter, UploadFile, File, HTTPException
+import hmac
+import os
+
+from fastapi import APIRouter, UploadFile, File, HTTPException, Header
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import Response
 from pydantic import BaseModel
 from typing import Optional
 
+from application.optimize_scf import COMPARISON_PROVIDERS
+
 from application import OptimizeSCFUseCase
 
 
@@ -11,8 +17,21 @@ router = APIRouter()
 use_case = OptimizeSCFUseCase()
 
 # In-memory storage for job results (POC - use Supabase for prod)
+# Allocations are kept as AllocationBatch columns; serialise with use_case.to_response()
 job_store: dict = {}
 
+MAX_FRONTIER_POINTS = 10_000
+
+
+def _check_providers(names: list[str]) -> None:
+    """400 for provider names no solver exists for (instead of silently running another)."""
+    unknown = [name for name in names if name.lower() not in COMPARISON_PROVIDERS]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown quantum provider(s): {', '.join(unknown)}; expected one of {', '.join(COMPARISON_PROVIDERS)}"
+        )
+
 
 class OptimizeRequest(BaseModel):
     """Request body for optimization with inline CSV."""
@@ -23,6 +42,30 @@ class OptimizeRequest(BaseModel):
     quantum_provider: str = "planqk"
 
 
+class CompareRequest(BaseModel):
+    """Request body for a cross-provider comparison run."""
+    csv_content: str
+    budget: float = 1_000_000
+    risk_tolerance: float = 50
+    esg_min: float = 60
+    providers: list[str] = list(COMPARISON_PROVIDERS)
+    timeout_s: float = 30.0
+
+
+class FrontierRequest(BaseModel):
+    """Request body for an efficient-frontier sweep over a (risk, ESG) grid."""
+    csv_content: str
+    budget: float = 1_000_000
+    risk_tolerances: list[float] = [10, 20, 30, 40, 50, 60, 70, 80, 90]
+    esg_mins: list[float] = [60]
+
+
+class ReoptimizeRequest(BaseModel):
+    """Request body for re-optimising a stored job after a book delta."""
+    delta_csv: str
+    compare_cold: bool = False
+
+
 class OptimizeResponse(BaseModel):
     """Response from optimization run."""
     job_id: str
@@ -31,6 +74,37 @@ class OptimizeResponse(BaseModel):
     comparison: dict
 
 
+class FrontierResponse(BaseModel):
+    """Response from a frontier sweep: grid axes plus one column per metric."""
+    job_id: str
+    grid: dict
+    points: dict
+    pivots: int
+    solve_time_ms: float
+
+
+class ReoptimizeResponse(BaseModel):
+    """Response from a warm-started re-optimisation."""
+    job_id: str
+    parent_job_id: str
+    classical: dict
+    quantum: dict
+    comparison: dict
+    delta: dict
+    speedup: dict
+
+
+class CompareResponse(BaseModel):
+    """Response from a cross-provider comparison run."""
+    job_id: str
+    classical: dict
+    providers: dict
+    provider_comparison: dict
+    best_provider: Optional[str] = None
+    quantum: Optional[dict] = None
+    comparison: Optional[dict] = None
+
+
 @router.post("/optimize", response_model=OptimizeResponse)
 async def optimize_scf(request: OptimizeRequest):
     """
@@ -39,8 +113,9 @@ async def optimize_scf(request: OptimizeRequest):
     Accepts CSV content with columns:
     supplier_id, tier, risk_score, yield_pct, volatility, esg_score, trade_volume
     """
+    _check_providers([request.quantum_provider])
     try:
-        tiers = use_case.parse_csv(request.csv_content)
+        tiers = use_case.parse_csv_batch(request.csv_content)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -49,7 +124,7 @@ async def optimize_scf(request: OptimizeRequest):
     if len(tiers) == 0:
         raise HTTPException(status_code=400, detail="CSV must contain at least one tier")
     
-    result = use_case.run_optimization(
+    result = await use_case.run_optimization_async(
         tiers,
         budget=request.budget,
         risk_tolerance=request.risk_tolerance,
@@ -60,7 +135,7 @@ async def optimize_scf(request: OptimizeRequest):
     # Store for PDF generation
     job_store[result["job_id"]] = result
     
-    return result
+    return use_case.to_response(result)
 
 
 @router.post("/optimize/upload", response_model=OptimizeResponse)
@@ -79,12 +154,13 @@ async def optimize_scf_upload(
     """
     if not file.filename.endswith('.csv'):
         raise HTTPException(status_code=400, detail="File must be a CSV")
+    _check_providers([quantum_provider])
     
     content = await file.read()
     csv_content = content.decode('utf-8')
     
     try:
-        tiers = use_case.parse_csv(csv_content)
+        tiers = use_case.parse_csv_batch(csv_content)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -93,7 +169,7 @@ async def optimize_scf_upload(
     if len(tiers) == 0:
         raise HTTPException(status_code=400, detail="CSV must contain at least one tier")
     
-    result = use_case.run_optimization(
+    result = await use_case.run_optimization_async(
         tiers,
         budget=budget,
         risk_tolerance=risk_tolerance,
@@ -103,7 +179,132 @@ async def optimize_scf_upload(
     
     job_store[result["job_id"]] = result
     
-    return result
+    return use_case.to_response(result)
+
+
+@router.post("/optimize/compare", response_model=CompareResponse)
+async def compare_providers(request: CompareRequest):
+    """
+    Run classical and every requested quantum provider at once.
+    
+    Each provider is bounded by `timeout_s`; slow or failing providers are reported
+    with status TIMEOUT / ERROR instead of failing the whole comparison.
+    """
+    _check_providers(request.providers)
+    try:
+        tiers = use_case.parse_csv_batch(request.csv_content)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"CSV parsing error: {str(e)}")
+    
+    if len(tiers) == 0:
+        raise HTTPException(status_code=400, detail="CSV must contain at least one tier")
+    if request.timeout_s <= 0:
+        raise HTTPException(status_code=400, detail="timeout_s must be positive")
+    
+    result = await run_in_threadpool(
+        use_case.run_comparison,
+        tiers,
+        budget=request.budget,
+        risk_tolerance=request.risk_tolerance,
+        esg_min=request.esg_min,
+        providers=request.providers,
+        timeout_s=request.timeout_s
+    )
+    
+    job_store[result["job_id"]] = result
+    
+    return use_case.to_response(result)
+
+
+@router.post("/optimize/{job_id}/reoptimize", response_model=ReoptimizeResponse)
+async def reoptimize_scf(job_id: str, request: ReoptimizeRequest):
+    """
+    Re-solve a stored job's book after a delta, warm-started from the job's results.
+    
+    The delta CSV has the usual columns plus an optional `action` column: 'upsert'
+    (default) adds or replaces a supplier by supplier_id, 'remove' drops it (only
+    supplier_id is needed). The new job can itself be re-optimised.
+    """
+    if job_id not in job_store:
+        raise HTTPException(status_code=404, detail="Job not found")
+    job = job_store[job_id]
+    if "book" not in job:
+        raise HTTPException(status_code=409, detail="Job has no quantum result to warm-start from")
+    
+    try:
+        upserts, removed = use_case.parse_csv_delta(request.delta_csv)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"CSV parsing error: {str(e)}")
+    
+    try:
+        result = await run_in_threadpool(
+            use_case.run_reoptimization, job, upserts, removed, compare_cold=request.compare_cold
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    job_store[result["job_id"]] = result
+    
+    return use_case.to_response(result)
+
+
+@router.post("/optimize/frontier", response_model=FrontierResponse)
+async def optimize_frontier(request: FrontierRequest):
+    """
+    Sweep the classical LP over every (esg_min, risk_tolerance) pair.
+    
+    Points are returned as flat columns in row-major order (ESG outer, risk inner),
+    so each column reshapes to len(esg_mins) x len(risk_tolerances) for plotting.
+    """
+    try:
+        tiers = use_case.parse_csv_batch(request.csv_content)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"CSV parsing error: {str(e)}")
+    
+    if len(tiers) == 0:
+        raise HTTPException(status_code=400, detail="CSV must contain at least one tier")
+    size = len(request.risk_tolerances) * len(request.esg_mins)
+    if size == 0:
+        raise HTTPException(status_code=400, detail="risk_tolerances and esg_mins must not be empty")
+    if size > MAX_FRONTIER_POINTS:
+        raise HTTPException(status_code=400, detail=f"Frontier grid is limited to {MAX_FRONTIER_POINTS} points")
+    
+    return await run_in_threadpool(
+        use_case.run_frontier,
+        tiers,
+        budget=request.budget,
+        risk_tolerances=request.risk_tolerances,
+        esg_mins=request.esg_mins
+    )
+
+
+@router.post("/planqk/jobs/{planqk_job_id}/callback", status_code=202)
+async def planqk_job_callback(planqk_job_id: str, x_callback_token: Optional[str] = Header(None)):
+    """
+    Webhook for PlanQK job status changes; wakes the waiting solve for an immediate check.
+    
+    The hub must send the shared PLANQK_CALLBACK_SECRET as X-Callback-Token; without a
+    configured secret callbacks are refused and solves rely on polling alone.
+    """
+    secret = os.getenv("PLANQK_CALLBACK_SECRET", "")
+    if not secret:
+        raise HTTPException(status_code=403, detail="PlanQK callbacks are not enabled")
+    if x_callback_token is None or not hmac.compare_digest(x_callback_token.encode(), secret.encode()):
+        raise HTTPException(status_code=401, detail="Invalid callback token")
+    use_case.planqk_solver.notify_job(planqk_job_id)
+    return {"accepted": planqk_job_id}
+
+
+@router.get("/providers/health")
+async def providers_health():
+    """Circuit breaker state and health (EWMA latency, error rate) of each remote provider."""
+    return {"providers": use_case.provider_status()}
 
 
 @router.get("/report/{job_id}")
@@ -113,34 +314,12 @@ async def get_report(job_id: str):
         raise HTTPException(status_code=404, detail="Job not found")
     
     job = job_store[job_id]
+    if "quantum" not in job:
+        raise HTTPException(status_code=409, detail="No quantum provider completed for this job")
     
-    # Reconstruct OptimizationResult objects for PDF
-    from domain.entities import Allocation, OptimizationResult
-    
-    classical_allocs = [
-        Allocation(**a) for a in job["classical"]["allocations"]
-    ]
-    quantum_allocs = [
-        Allocation(**a) for a in job["quantum"]["allocations"]
-    ]
-    
-    classical_result = OptimizationResult(
-        allocations=classical_allocs,
-        total_yield=job["classical"]["total_yield"],
-        total_risk=job["classical"]["total_risk"],
-        solver_type="classical",
-        solve_time_ms=job["classical"]["solve_time_ms"],
-        solver_logs=job["classical"]["solver_logs"]
-    )
-    
-    quantum_result = OptimizationResult(
-        allocations=quantum_allocs,
-        total_yield=job["quantum"]["total_yield"],
-        total_risk=job["quantum"]["total_risk"],
-        solver_type="quantum",
-        solve_time_ms=job["quantum"]["solve_time_ms"],
-        solver_logs=job["quantum"]["solver_logs"]
-    )
+    # Reconstruct OptimizationResult objects for PDF (allocations are already columnar)
+    classical_result = use_case.to_result(job["classical"], "classical")
+    quantum_result = use_case.to_result(job["quantum"], "quantum")
     
     pdf_bytes = use_case.generate_report(classical_result, quantum_result, job_id)
     
@@ -156,4 +335,4 @@ async def get_job(job_id: str):
     """Get stored job results."""
     if job_id not in job_store:
         raise HTTPException(status_code=404, detail="Job not found")
-    return job_store[job_id]
+    return use_case.to_response(job_store[job_id])
@@ -1,4 +1,5 @@
 """Application package."""
 from .optimize_scf import OptimizeSCFUseCase
+from .csv_ingest import CSVValidationError
 
-__all__ = ["OptimizeSCFUseCase"]
+__all__ = ["OptimizeSCFUseCase", "CSVValidationError"]
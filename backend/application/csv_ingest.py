@@ -0,0 +1,153 @@
+"""CSV Ingestion - Typed, columnar parsing of supplier books."""
+import csv
+from io import StringIO
+
+import numpy as np
+import pandas as pd
+
+
+REQUIRED_COLUMNS = ['supplier_id', 'tier', 'risk_score', 'yield_pct', 'volatility', 'esg_score', 'trade_volume']
+DELTA_ACTIONS = ('upsert', 'remove')
+FLOAT_COLUMNS = ['risk_score', 'yield_pct', 'volatility', 'esg_score', 'trade_volume']
+
+# Explicit dtypes so pandas never has to infer column types
+COLUMN_DTYPES = {
+    'supplier_id': str,
+    'tier': np.float64,  # parsed as float, checked integral, then cast to int64
+    **{col: np.float64 for col in FLOAT_COLUMNS},
+}
+
+# Cap on row numbers listed per column in an error message
+MAX_REPORTED_ROWS = 10
+
+try:
+    import pyarrow  # noqa: F401
+    _ENGINE = "pyarrow"
+except ImportError:
+    _ENGINE = "c"
+
+
+class CSVValidationError(ValueError):
+    """Raised when a supplier CSV fails column-level validation."""
+
+    def __init__(self, errors: dict[str, list[int]]):
+        self.errors = errors
+        details = []
+        for column, rows in errors.items():
+            shown = ", ".join(str(r) for r in rows[:MAX_REPORTED_ROWS])
+            more = f" (+{len(rows) - MAX_REPORTED_ROWS} more)" if len(rows) > MAX_REPORTED_ROWS else ""
+            details.append(f"'{column}' at rows [{shown}]{more}")
+        super().__init__("Invalid values in column " + "; ".join(details))
+
+
+def _resolve_columns(csv_content: str) -> dict[str, str]:
+    """Map normalized column names to the raw header names in the file."""
+    header = next(csv.reader(StringIO(csv_content)), [])
+    resolved = {}
+    for raw in header:
+        normalized = raw.lower().strip()
+        resolved.setdefault(normalized, raw)
+
+    missing = [col for col in REQUIRED_COLUMNS if col not in resolved]
+    if missing:
+        raise ValueError(f"Missing required columns: {missing}")
+    return resolved
+
+
+def _bad_rows(mask: np.ndarray, lines: np.ndarray = None) -> list[int]:
+    """CSV line numbers (header is row 1) for a boolean mask over data rows."""
+    if lines is None:
+        return (np.flatnonzero(mask) + 2).tolist()
+    return lines[mask].tolist()
+
+
+def read_scf_frame(csv_content: str) -> pd.DataFrame:
+    """
+    Parse supplier CSV into a typed DataFrame with one column per field.
+
+    Only the required columns are read; extra columns (e.g. descriptions) are skipped.
+    Numeric columns are validated as whole columns and every failure is reported with
+    its CSV row number instead of failing on the first bad cell.
+    """
+    resolved = _resolve_columns(csv_content)
+    raw_names = {resolved[col]: col for col in REQUIRED_COLUMNS}
+
+    # Fast path: every cell parses under the explicit dtypes
+    try:
+        df = pd.read_csv(
+            StringIO(csv_content),
+            usecols=list(raw_names),
+            dtype={raw: COLUMN_DTYPES[col] for raw, col in raw_names.items()},
+            engine=_ENGINE,
+        )
+        coerced = False
+    except (ValueError, TypeError):
+        # Slow path: read as text so unparsable cells can be located
+        df = pd.read_csv(StringIO(csv_content), usecols=list(raw_names), dtype=str, keep_default_na=True)
+        coerced = True
+    df = df.rename(columns=raw_names)[REQUIRED_COLUMNS]
+
+    return _typed_frame(df, coerced)
+
+
+def _typed_frame(df: pd.DataFrame, coerced: bool, lines: np.ndarray = None) -> pd.DataFrame:
+    """
+    Validate and type the required columns in place; `lines` gives each row's CSV line
+    number when `df` is a subset of the file.
+    """
+    errors: dict[str, list[int]] = {}
+
+    ids = df['supplier_id']
+    missing_ids = ids.isna().to_numpy() | (ids.astype(str).str.strip() == "").to_numpy()
+    if missing_ids.any():
+        errors['supplier_id'] = _bad_rows(missing_ids, lines)
+
+    for col in ['tier'] + FLOAT_COLUMNS:
+        values = pd.to_numeric(df[col], errors='coerce') if coerced else df[col]
+        values = values.to_numpy(dtype=np.float64)
+        invalid = ~np.isfinite(values)
+        if col == 'tier':
+            invalid |= np.isfinite(values) & (np.floor(values) != values)
+        if invalid.any():
+            errors[col] = _bad_rows(invalid, lines)
+        df[col] = values
+
+    if errors:
+        raise CSVValidationError(errors)
+
+    df['supplier_id'] = ids.astype(str)
+    df['tier'] = df['tier'].astype(np.int64)
+    return df
+
+
+def read_scf_delta(csv_content: str) -> tuple[pd.DataFrame, list[str]]:
+    """
+    Parse a book delta: the supplier columns plus an optional `action` column.
+
+    'upsert' (the default for a blank or missing action) adds the supplier or replaces
+    the row with the same supplier_id; 'remove' drops it and needs only supplier_id.
+    Returns (typed upsert rows, removed supplier ids).
+    """
+    header = [raw.lower().strip() for raw in next(csv.reader(StringIO(csv_content)), [])]
+    if 'action' not in header:
+        return read_scf_frame(csv_content), []
+
+    resolved = _resolve_columns(csv_content)
+    raw_names = {resolved[col]: col for col in REQUIRED_COLUMNS + ['action']}
+    df = pd.read_csv(StringIO(csv_content), usecols=list(raw_names), dtype=str, keep_default_na=True)
+    df = df.rename(columns=raw_names)
+
+    actions = df.pop('action').fillna('upsert').str.strip().str.lower().replace('', 'upsert').to_numpy()
+    lines = np.arange(len(df)) + 2
+    unknown = ~np.isin(actions, DELTA_ACTIONS)
+    if unknown.any():
+        raise CSVValidationError({'action': _bad_rows(unknown, lines)})
+
+    remove = actions == 'remove'
+    removed_ids = df['supplier_id'][remove]
+    missing_ids = removed_ids.isna().to_numpy() | (removed_ids.astype(str).str.strip() == "").to_numpy()
+    if missing_ids.any():
+        raise CSVValidationError({'supplier_id': _bad_rows(missing_ids, lines[remove])})
+
+    upserts = df[~remove][REQUIRED_COLUMNS].reset_index(drop=True)
+    return _typed_frame(upserts, coerced=True, lines=lines[~remove]), removed_ids.astype(str).tolist()
@@ -1,13 +1,37 @@
 """SCF Optimization Use Case - Application layer orchestrator."""
+import asyncio
+import os
+import time
 import uuid
+import numpy as np
 import pandas as pd
-from io import StringIO
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import Optional, Sequence, Union
 
-from domain.entities import SCFTier, OptimizationResult
+from domain.entities import SCFTier, SCFTierBatch, AllocationBatch, OptimizationResult
 from infrastructure.quantum import ClassicalSolver, DWaveSolver, PlanQKSolver, IBMSolver
 from infrastructure.cascadeguard.adapter import CascadeGuardSCFAdapter
+from infrastructure.http import provider_health
 from infrastructure.pdf import PDFReportGenerator
+from .csv_ingest import read_scf_frame, read_scf_delta, REQUIRED_COLUMNS
+
+# Solvers block on CBC subprocesses, HTTP polling and numpy, all of which release the GIL,
+# so one shared thread pool is enough to overlap them.
+_solver_pool = ThreadPoolExecutor(
+    max_workers=int(os.getenv("SOLVER_THREADS", "16")), thread_name_prefix="scf-solver"
+)
+# Comparison providers get their own threads: a provider past its timeout keeps running
+# (a started future cannot be cancelled) and must not starve /optimize solves on _solver_pool.
+_provider_pool = ThreadPoolExecutor(
+    max_workers=int(os.getenv("PROVIDER_THREADS", "16")), thread_name_prefix="scf-provider"
+)
+
+COMPARISON_PROVIDERS = ("planqk", "dwave", "ibm", "cascadeguard")
+# Providers whose local annealer can be seeded from a previous sample
+WARM_START_PROVIDERS = ("planqk", "dwave")
+
+# Job-store keys that only serve re-optimisation and never leave the API
+_INTERNAL_JOB_KEYS = ("book", "params", "cold_ms")
 
 
 class OptimizeSCFUseCase:
@@ -21,118 +45,348 @@ class OptimizeSCFUseCase:
         self.cascadeguard_solver = CascadeGuardSCFAdapter()
         self.pdf_generator = PDFReportGenerator()
     
+    def parse_csv_frame(self, csv_content: str) -> pd.DataFrame:
+        """Parse CSV content into a typed, validated columnar DataFrame."""
+        return read_scf_frame(csv_content)
+    
     def parse_csv(self, csv_content: str) -> list[SCFTier]:
         """Parse CSV content into SCFTier entities."""
-        df = pd.read_csv(StringIO(csv_content))
-        
-        # Normalize column names
-        df.columns = df.columns.str.lower().str.strip()
-        
-        required = ['supplier_id', 'tier', 'risk_score', 'yield_pct', 'volatility', 'esg_score', 'trade_volume']
-        missing = [col for col in required if col not in df.columns]
-        if missing:
-            raise ValueError(f"Missing required columns: {missing}")
-        
-        tiers = []
-        for _, row in df.iterrows():
-            tiers.append(SCFTier(
-                supplier_id=str(row['supplier_id']),
-                tier=int(row['tier']),
-                risk_score=float(row['risk_score']),
-                yield_pct=float(row['yield_pct']),
-                volatility=float(row['volatility']),
-                esg_score=float(row['esg_score']),
-                trade_volume=float(row['trade_volume'])
-            ))
-        
-        return tiers
+        df = read_scf_frame(csv_content)
+        # Materialise entities from whole columns; tolist() yields native int/float
+        columns = [df[col].tolist() for col in REQUIRED_COLUMNS]
+        return [SCFTier(*row) for row in zip(*columns)]
+    
+    def parse_csv_batch(self, csv_content: str) -> SCFTierBatch:
+        """Parse CSV content into a columnar SCFTierBatch (no per-row objects)."""
+        return SCFTierBatch.from_frame(read_scf_frame(csv_content))
+    
+    def parse_csv_delta(self, csv_content: str) -> tuple[SCFTierBatch, list[str]]:
+        """Parse a delta CSV into (upserted suppliers, removed supplier ids)."""
+        upserts, removed = read_scf_delta(csv_content)
+        return SCFTierBatch.from_frame(upserts), removed
     
     def run_optimization(
         self,
-        tiers: list[SCFTier],
+        tiers: Union[SCFTierBatch, list[SCFTier]],
         budget: float = 1_000_000,
         risk_tolerance: float = 50,
         esg_min: float = 60,
         quantum_provider: str = "planqk"
     ) -> dict:
-        """Run both classical and quantum optimization."""
-        classical_result = self.classical_solver.optimize(
-            tiers, budget, risk_tolerance, esg_min
-        )
+        """
+        Run classical and quantum optimization concurrently.
         
-        # Select quantum solver
-        if quantum_provider.lower() == "dwave":
-            quantum_solver = self.dwave_solver
-        elif quantum_provider.lower() == "ibm":
-            quantum_solver = self.ibm_solver
-        elif quantum_provider.lower() == "cascadeguard":
-            quantum_solver = self.cascadeguard_solver
+        Allocations in the returned job are AllocationBatch columns; use
+        to_response() to turn a job into its JSON form.
+        """
+        tiers = SCFTierBatch.coerce(tiers)
+        args = (tiers, budget, risk_tolerance, esg_min)
+        quantum_solver = self.quantum_solver(quantum_provider)
+
+        # Classical and quantum run side by side; latency is the slower of the two
+        classical_future = _solver_pool.submit(self.classical_solver.optimize, *args)
+        quantum_future = _solver_pool.submit(quantum_solver.optimize, *args)
+        classical_result = classical_future.result()
+        quantum_result = quantum_future.result()
+        return self._optimization_job(tiers, budget, risk_tolerance, esg_min, quantum_provider, classical_result, quantum_result)
+
+    async def run_optimization_async(
+        self,
+        tiers: Union[SCFTierBatch, list[SCFTier]],
+        budget: float = 1_000_000,
+        risk_tolerance: float = 50,
+        esg_min: float = 60,
+        quantum_provider: str = "planqk"
+    ) -> dict:
+        """
+        run_optimization for async callers (the API routes).
+
+        Solvers with an `optimize_async` (PlanQK) are awaited directly, so a hub job
+        waits on the event loop instead of blocking a thread; the rest run on the solver pool.
+        """
+        tiers = SCFTierBatch.coerce(tiers)
+        args = (tiers, budget, risk_tolerance, esg_min)
+        quantum_solver = self.quantum_solver(quantum_provider)
+
+        classical = asyncio.wrap_future(_solver_pool.submit(self.classical_solver.optimize, *args))
+        if hasattr(quantum_solver, "optimize_async"):
+            quantum = quantum_solver.optimize_async(*args)
         else:
-            quantum_solver = self.planqk_solver
+            quantum = asyncio.wrap_future(_solver_pool.submit(quantum_solver.optimize, *args))
+        classical_result, quantum_result = await asyncio.gather(classical, quantum)
+        return self._optimization_job(tiers, budget, risk_tolerance, esg_min, quantum_provider, classical_result, quantum_result)
+
+    def _optimization_job(
+        self, tiers: SCFTierBatch, budget: float, risk_tolerance: float, esg_min: float, quantum_provider: str,
+        classical_result: OptimizationResult, quantum_result: OptimizationResult
+    ) -> dict:
+        return {
+            "job_id": str(uuid.uuid4())[:8],
+            "classical": self._result_payload(classical_result),
+            "quantum": self._result_payload(quantum_result),
+            "comparison": self._compare(classical_result, quantum_result),
+            **self._job_context(
+                tiers, budget, risk_tolerance, esg_min, quantum_provider,
+                classical_result.solve_time_ms, quantum_result.solve_time_ms
+            )
+        }
+
+    def run_reoptimization(
+        self,
+        job: dict,
+        upserts: SCFTierBatch,
+        removed: list[str],
+        compare_cold: bool = False
+    ) -> dict:
+        """
+        Re-solve a stored job's book after a small delta, warm-started from its results.
+
+        The delta is applied by supplier_id (see SCFTierBatch.apply_delta) and solved with
+        the job's budget, limits and provider. The LP restarts from the previous basis and
+        the PlanQK / D-Wave annealers start every read from the previous picks. `speedup`
+        compares each warm solve with a cold one: measured on the new book when
+        `compare_cold` is set, otherwise the cold solve that started the job chain.
+        """
+        book = job["book"].apply_delta(upserts, removed)
+        if len(book) == 0:
+            raise ValueError("Delta removes every supplier")
+        params = job["params"]
+        provider = params["quantum_provider"]
+        args = (book, params["budget"], params["risk_tolerance"], params["esg_min"])
 
-        quantum_result = quantum_solver.optimize(
-            tiers, budget, risk_tolerance, esg_min
+        quantum_warm = {}
+        if provider in WARM_START_PROVIDERS and job.get("quantum", {}).get("warm_start"):
+            quantum_warm = {"warm_start": job["quantum"]["warm_start"]}
+        classical_future = _solver_pool.submit(
+            self.classical_solver.optimize, *args, warm_start=job["classical"].get("warm_start")
         )
-        
-        job_id = str(uuid.uuid4())[:8]
-        
-        # Calculate improvements
+        quantum_future = _solver_pool.submit(self.quantum_solver(provider).optimize, *args, **quantum_warm)
+        classical_result = classical_future.result()
+        quantum_result = quantum_future.result()
+
+        if compare_cold:
+            # After the warm solves, so the two runs do not compete for the same cores
+            cold = [
+                _solver_pool.submit(self.classical_solver.optimize, *args),
+                _solver_pool.submit(self.quantum_solver(provider).optimize, *args),
+            ]
+            cold_ms = dict(zip(("classical", "quantum"), (f.result().solve_time_ms for f in cold)))
+            cold_source = "measured"
+        else:
+            cold_ms, cold_source = job["cold_ms"], "previous cold job"
+
+        old_ids = job["book"].supplier_ids
+        changed = int(np.isin(upserts.supplier_ids, old_ids).sum())
+        removed_known = np.isin(np.array(removed, dtype=object), old_ids)
+        speedup = {}
+        for section, result in (("classical", classical_result), ("quantum", quantum_result)):
+            speedup[section] = {
+                "warm_ms": result.solve_time_ms,
+                "cold_ms": cold_ms[section],
+                "speedup": cold_ms[section] / result.solve_time_ms if result.solve_time_ms > 0 else 1,
+            }
+        speedup["cold_source"] = cold_source
+
+        return {
+            "job_id": str(uuid.uuid4())[:8],
+            "parent_job_id": job["job_id"],
+            "classical": self._result_payload(classical_result),
+            "quantum": self._result_payload(quantum_result),
+            "comparison": self._compare(classical_result, quantum_result),
+            "delta": {
+                "added": len(upserts) - changed,
+                "changed": changed,
+                "removed": int(removed_known.sum()),
+                "unknown_removed": [sid for sid, known in zip(removed, removed_known) if not known],
+            },
+            "speedup": speedup,
+            "book": book,
+            "params": params,
+            "cold_ms": cold_ms,
+        }
+
+    def run_comparison(
+        self,
+        tiers: Union[SCFTierBatch, list[SCFTier]],
+        budget: float = 1_000_000,
+        risk_tolerance: float = 50,
+        esg_min: float = 60,
+        providers: Optional[list[str]] = None,
+        timeout_s: float = 30.0
+    ) -> dict:
+        """
+        Run classical and several quantum providers concurrently.
+
+        Every provider gets the same `timeout_s` budget, counted from submission, so
+        the call returns after the slowest provider or the timeout, whichever is first.
+        Providers that time out or raise are reported with status TIMEOUT / ERROR and
+        left out of the ranking. `quantum` / `comparison` hold the provider with the
+        best yield so the job still works with /report and /jobs. Unknown provider
+        names raise ValueError before anything runs.
+        """
+        tiers = SCFTierBatch.coerce(tiers)
+        names = list(dict.fromkeys(p.lower() for p in (providers or COMPARISON_PROVIDERS)))
+        solvers = {name: self.quantum_solver(name) for name in names}
+        args = (tiers, budget, risk_tolerance, esg_min)
+
+        deadline = time.monotonic() + timeout_s
+        classical_future = _solver_pool.submit(self.classical_solver.optimize, *args)
+        futures = {name: _provider_pool.submit(solver.optimize, *args) for name, solver in solvers.items()}
+        classical_result = classical_future.result()
+
+        sections, comparisons = {}, {}
+        for name, future in futures.items():
+            try:
+                result = future.result(timeout=max(0.0, deadline - time.monotonic()))
+            except FutureTimeout:
+                future.cancel()
+                sections[name] = {"status": "TIMEOUT", "error": f"No result within {timeout_s:g}s"}
+                continue
+            except Exception as e:
+                sections[name] = {"status": "ERROR", "error": str(e)}
+                continue
+            sections[name] = {"status": "OK", **self._result_payload(result)}
+            comparisons[name] = self._compare(classical_result, result)
+
+        completed = [name for name in names if sections[name]["status"] == "OK"]
+        best = max(completed, key=lambda name: sections[name]["total_yield"], default=None)
+        job = {
+            "job_id": str(uuid.uuid4())[:8],
+            "classical": self._result_payload(classical_result),
+            "providers": sections,
+            "provider_comparison": comparisons,
+            "best_provider": best,
+        }
+        if best is not None:
+            job["quantum"] = {k: v for k, v in sections[best].items() if k != "status"}
+            job["comparison"] = comparisons[best]
+            job.update(self._job_context(
+                tiers, budget, risk_tolerance, esg_min, best,
+                classical_result.solve_time_ms, job["quantum"]["solve_time_ms"]
+            ))
+        return job
+
+    def run_frontier(
+        self,
+        tiers: Union[SCFTierBatch, list[SCFTier]],
+        budget: float = 1_000_000,
+        risk_tolerances: Sequence[float] = (50,),
+        esg_mins: Sequence[float] = (60,)
+    ) -> dict:
+        """
+        Efficient frontier: the classical LP over every (esg_min, risk_tolerance) pair.
+
+        Only the LP is swept (see ClassicalSolver.frontier); the quantum providers are
+        single-point solvers. Points come back as flat columns with the grid axes alongside.
+        """
+        tiers = SCFTierBatch.coerce(tiers)
+        return {
+            "job_id": str(uuid.uuid4())[:8],
+            **self.classical_solver.frontier(tiers, budget, risk_tolerances, esg_mins)
+        }
+
+    def quantum_solver(self, provider: str):
+        """Solver for a provider name (case-insensitive); unknown names raise ValueError."""
+        provider = provider.lower()
+        if provider == "planqk":
+            return self.planqk_solver
+        if provider == "dwave":
+            return self.dwave_solver
+        if provider == "ibm":
+            return self.ibm_solver
+        if provider == "cascadeguard":
+            return self.cascadeguard_solver
+        raise ValueError(f"Unknown quantum provider '{provider}'; expected one of {', '.join(COMPARISON_PROVIDERS)}")
+
+    @staticmethod
+    def provider_status() -> list[dict]:
+        """Breaker state, EWMA latency and error rate of every remote provider."""
+        return [provider_health(name).snapshot() for name in COMPARISON_PROVIDERS]
+
+    @staticmethod
+    def _compare(classical_result: OptimizationResult, quantum_result: OptimizationResult) -> dict:
+        """Improvement of a quantum result over the classical baseline."""
         yield_improvement = 0
         if classical_result.total_yield > 0:
             yield_improvement = (
                 (quantum_result.total_yield - classical_result.total_yield)
                 / classical_result.total_yield * 100
             )
-        
+
         risk_improvement = 0
         if classical_result.total_risk > 0:
             risk_improvement = (
                 (classical_result.total_risk - quantum_result.total_risk)
                 / classical_result.total_risk * 100
             )
-        
+
         return {
-            "job_id": job_id,
-            "classical": {
-                "allocations": [
-                    {
-                        "supplier_id": a.supplier_id,
-                        "allocated_amount": a.allocated_amount,
-                        "expected_return": a.expected_return,
-                        "risk_contribution": a.risk_contribution
-                    }
-                    for a in classical_result.allocations
-                ],
-                "total_yield": classical_result.total_yield,
-                "total_risk": classical_result.total_risk,
-                "solve_time_ms": classical_result.solve_time_ms,
-                "solver_logs": classical_result.solver_logs
-            },
-            "quantum": {
-                "allocations": [
-                    {
-                        "supplier_id": a.supplier_id,
-                        "allocated_amount": a.allocated_amount,
-                        "expected_return": a.expected_return,
-                        "risk_contribution": a.risk_contribution
-                    }
-                    for a in quantum_result.allocations
-                ],
-                "total_yield": quantum_result.total_yield,
-                "total_risk": quantum_result.total_risk,
-                "solve_time_ms": quantum_result.solve_time_ms,
-                "solver_logs": quantum_result.solver_logs
+            "yield_improvement_pct": yield_improvement,
+            "risk_reduction_pct": risk_improvement,
+            "speedup_factor": (
+                classical_result.solve_time_ms / quantum_result.solve_time_ms
+                if quantum_result.solve_time_ms > 0 else 1
+            )
+        }
+
+    @staticmethod
+    def _job_context(
+        book: SCFTierBatch, budget: float, risk_tolerance: float, esg_min: float, quantum_provider: str,
+        classical_ms: float, quantum_ms: float
+    ) -> dict:
+        """What run_reoptimization needs from a cold job: its book, inputs and cold solve times."""
+        return {
+            "book": book,
+            "params": {
+                "budget": budget,
+                "risk_tolerance": risk_tolerance,
+                "esg_min": esg_min,
+                "quantum_provider": quantum_provider.lower(),
             },
-            "comparison": {
-                "yield_improvement_pct": yield_improvement,
-                "risk_reduction_pct": risk_improvement,
-                "speedup_factor": (
-                    classical_result.solve_time_ms / quantum_result.solve_time_ms
-                    if quantum_result.solve_time_ms > 0 else 1
-                )
-            }
+            "cold_ms": {"classical": classical_ms, "quantum": quantum_ms},
+        }
+
+    @staticmethod
+    def _result_payload(result: OptimizationResult) -> dict:
+        """Job-store form of a solver result; allocations stay columnar."""
+        return {
+            "allocations": result.allocations,
+            "total_yield": result.total_yield,
+            "total_risk": result.total_risk,
+            "solve_time_ms": result.solve_time_ms,
+            "solver_logs": result.solver_logs,
+            "warm_start": result.warm_start
         }
     
+    @staticmethod
+    def to_response(job: dict) -> dict:
+        """Serialise a stored job for the API (allocation columns -> list of dicts)."""
+        def serialise(section: dict) -> dict:
+            section = {k: v for k, v in section.items() if k != "warm_start"}
+            if "allocations" in section:
+                section["allocations"] = section["allocations"].to_records()
+            return section
+
+        response = {k: v for k, v in job.items() if k not in _INTERNAL_JOB_KEYS}
+        for key in ("classical", "quantum"):
+            if key in job:
+                response[key] = serialise(job[key])
+        if "providers" in job:
+            response["providers"] = {name: serialise(s) for name, s in job["providers"].items()}
+        return response
+    
+    @staticmethod
+    def to_result(section: dict, solver_type: str) -> OptimizationResult:
+        """Rebuild an OptimizationResult from a stored job section."""
+        return OptimizationResult(
+            allocations=section["allocations"],
+            total_yield=section["total_yield"],
+            total_risk=section["total_risk"],
+            solver_type=solver_type,
+            solve_time_ms=section["solve_time_ms"],
+            solver_logs=section["solver_logs"]
+        )
+    
     def generate_report(
         self,
         classical_result: OptimizationResult,
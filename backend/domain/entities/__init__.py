@@ -1,4 +1,5 @@
 """Domain entities package."""
 from .scf_tier import SCFTier, Allocation, OptimizationResult
+from .scf_tier_batch import SCFTierBatch, AllocationBatch
 
-__all__ = ["SCFTier", "Allocation", "OptimizationResult"]
+__all__ = ["SCFTier", "Allocation", "OptimizationResult", "SCFTierBatch", "AllocationBatch"]
@@ -27,11 +27,16 @@ class Allocation:
 @dataclass
 class OptimizationResult:
     """Result from running optimization."""
-    allocations: list[Allocation]
+    allocations: "AllocationBatch"  # list[Allocation] is accepted and converted
     total_yield: float
     total_risk: float
     solver_type: str  # "classical" or "quantum"
     solve_time_ms: float
     solver_logs: Optional[str] = None
     confidence_score: float = 100.0  # Percentage of convergence
-    optimality_gap: float = 0.0     # Theoretical distance from global optimum
+    optimality_gap: Optional[float] = 0.0  # % above the global optimum; None when no reference is known
+    warm_start: Optional[dict] = None  # Solver state, keyed by supplier_id, that can seed a re-solve
+
+    def __post_init__(self):
+        from .scf_tier_batch import AllocationBatch
+        self.allocations = AllocationBatch.coerce(self.allocations)
@@ -0,0 +1,242 @@
+"""SCF Tier Batch - Columnar (struct-of-arrays) portfolio and allocation models."""
+import hashlib
+import sys
+from dataclasses import dataclass, fields
+from typing import Iterable, Iterator, Union
+
+import numpy as np
+
+from .scf_tier import SCFTier, Allocation
+
+
+@dataclass(frozen=True, eq=False)
+class SCFTierBatch:
+    """A whole supplier book stored as one numpy array per field."""
+    supplier_ids: np.ndarray  # object array of interned str
+    tier: np.ndarray          # int32
+    risk_score: np.ndarray    # float64, 0-100, higher = riskier
+    yield_pct: np.ndarray     # float64, expected yield percentage
+    volatility: np.ndarray    # float64, historical volatility
+    esg_score: np.ndarray     # float64, ESG compliance score 0-100
+    trade_volume: np.ndarray  # float64, trade volume in EUR
+
+    @classmethod
+    def from_columns(cls, supplier_ids, tier, risk_score, yield_pct, volatility, esg_score, trade_volume) -> "SCFTierBatch":
+        """Build a batch from any column-like inputs (lists, Series, arrays)."""
+        ids = np.array([sys.intern(str(s)) for s in supplier_ids], dtype=object)
+        return cls(
+            supplier_ids=ids,
+            tier=np.asarray(tier, dtype=np.int32),
+            risk_score=np.asarray(risk_score, dtype=np.float64),
+            yield_pct=np.asarray(yield_pct, dtype=np.float64),
+            volatility=np.asarray(volatility, dtype=np.float64),
+            esg_score=np.asarray(esg_score, dtype=np.float64),
+            trade_volume=np.asarray(trade_volume, dtype=np.float64),
+        )
+
+    @classmethod
+    def from_frame(cls, df) -> "SCFTierBatch":
+        """Build a batch from a typed DataFrame (see application.csv_ingest.read_scf_frame)."""
+        return cls.from_columns(
+            df['supplier_id'].to_numpy(),
+            df['tier'].to_numpy(),
+            df['risk_score'].to_numpy(),
+            df['yield_pct'].to_numpy(),
+            df['volatility'].to_numpy(),
+            df['esg_score'].to_numpy(),
+            df['trade_volume'].to_numpy(),
+        )
+
+    @classmethod
+    def from_tiers(cls, tiers: Iterable[SCFTier]) -> "SCFTierBatch":
+        """Build a batch from SCFTier entities."""
+        tiers = list(tiers)
+        return cls.from_columns(
+            [t.supplier_id for t in tiers],
+            [t.tier for t in tiers],
+            [t.risk_score for t in tiers],
+            [t.yield_pct for t in tiers],
+            [t.volatility for t in tiers],
+            [t.esg_score for t in tiers],
+            [t.trade_volume for t in tiers],
+        )
+
+    @classmethod
+    def coerce(cls, tiers: Union["SCFTierBatch", Iterable[SCFTier]]) -> "SCFTierBatch":
+        """Accept either a batch or a list of SCFTier; solvers call this on entry."""
+        if isinstance(tiers, cls):
+            return tiers
+        return cls.from_tiers(tiers)
+
+    def __len__(self) -> int:
+        return len(self.supplier_ids)
+
+    def __getitem__(self, idx: int) -> SCFTier:
+        return SCFTier(
+            supplier_id=self.supplier_ids[idx],
+            tier=int(self.tier[idx]),
+            risk_score=float(self.risk_score[idx]),
+            yield_pct=float(self.yield_pct[idx]),
+            volatility=float(self.volatility[idx]),
+            esg_score=float(self.esg_score[idx]),
+            trade_volume=float(self.trade_volume[idx]),
+        )
+
+    def __iter__(self) -> Iterator[SCFTier]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def to_tiers(self) -> list[SCFTier]:
+        """Materialise SCFTier entities (only for callers that need per-row objects)."""
+        columns = [
+            self.supplier_ids.tolist(), self.tier.tolist(), self.risk_score.tolist(),
+            self.yield_pct.tolist(), self.volatility.tolist(), self.esg_score.tolist(),
+            self.trade_volume.tolist(),
+        ]
+        return [SCFTier(*row) for row in zip(*columns)]
+
+    def take(self, indices) -> "SCFTierBatch":
+        """Sub-batch for the given row indices (or boolean mask)."""
+        return SCFTierBatch(
+            supplier_ids=self.supplier_ids[indices],
+            tier=self.tier[indices],
+            risk_score=self.risk_score[indices],
+            yield_pct=self.yield_pct[indices],
+            volatility=self.volatility[indices],
+            esg_score=self.esg_score[indices],
+            trade_volume=self.trade_volume[indices],
+        )
+
+    def apply_delta(self, upserts: "SCFTierBatch", removed: Iterable[str] = ()) -> "SCFTierBatch":
+        """
+        The book after a delta, matched by supplier_id: an upserted supplier replaces its
+        row in place (or is appended, in delta order, if new) and removed ones are dropped.
+        """
+        removed = np.array(list(removed), dtype=object)
+        position = {sid: i for i, sid in enumerate(upserts.supplier_ids.tolist())}
+        changed = np.flatnonzero(np.isin(self.supplier_ids, upserts.supplier_ids))
+        source = np.array([position[sid] for sid in self.supplier_ids[changed].tolist()], dtype=np.int64)
+        keep = ~np.isin(self.supplier_ids, removed)
+        added = ~np.isin(upserts.supplier_ids, self.supplier_ids) & ~np.isin(upserts.supplier_ids, removed)
+
+        columns = {}
+        for field in fields(self):
+            column = getattr(self, field.name).copy()
+            column[changed] = getattr(upserts, field.name)[source]
+            columns[field.name] = np.concatenate([column[keep], getattr(upserts, field.name)[added]])
+        return SCFTierBatch(**columns)
+
+    def content_hash(self) -> str:
+        """Stable digest of the numeric columns and ids, usable as a cache key."""
+        h = hashlib.sha256()
+        h.update("\x1f".join(self.supplier_ids.tolist()).encode("utf-8"))
+        for column in (self.tier, self.risk_score, self.yield_pct, self.volatility, self.esg_score, self.trade_volume):
+            h.update(np.ascontiguousarray(column).tobytes())
+        return h.hexdigest()
+
+    @property
+    def nbytes(self) -> int:
+        """Array memory, excluding the (shared, interned) id strings themselves."""
+        return sum(
+            a.nbytes for a in (
+                self.supplier_ids, self.tier, self.risk_score, self.yield_pct,
+                self.volatility, self.esg_score, self.trade_volume,
+            )
+        )
+
+
+@dataclass(frozen=True, eq=False)
+class AllocationBatch:
+    """Allocation decisions for many suppliers as parallel arrays."""
+    supplier_ids: np.ndarray       # object array of str
+    allocated_amount: np.ndarray   # float64, EUR
+    expected_return: np.ndarray    # float64, EUR
+    risk_contribution: np.ndarray  # float64, weighted risk points
+
+    @classmethod
+    def empty(cls) -> "AllocationBatch":
+        return cls(
+            supplier_ids=np.array([], dtype=object),
+            allocated_amount=np.array([], dtype=np.float64),
+            expected_return=np.array([], dtype=np.float64),
+            risk_contribution=np.array([], dtype=np.float64),
+        )
+
+    @classmethod
+    def from_weights(cls, batch: SCFTierBatch, indices, weights, budget: float) -> "AllocationBatch":
+        """
+        Allocate `weights` (fractions of budget) to the suppliers at `indices`.
+        Return is amount * yield_pct / 100; risk contribution is weight * risk_score.
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+        weights = np.broadcast_to(np.asarray(weights, dtype=np.float64), indices.shape)
+        amounts = weights * budget
+        return cls(
+            supplier_ids=batch.supplier_ids[indices],
+            allocated_amount=amounts,
+            expected_return=amounts * batch.yield_pct[indices] / 100,
+            risk_contribution=weights * batch.risk_score[indices],
+        )
+
+    @classmethod
+    def equal_weight(cls, batch: SCFTierBatch, indices, budget: float) -> "AllocationBatch":
+        """Split the budget equally across the selected suppliers."""
+        indices = np.asarray(indices, dtype=np.int64)
+        if len(indices) == 0:
+            return cls.empty()
+        return cls.from_weights(batch, indices, 1.0 / len(indices), budget)
+
+    @classmethod
+    def from_allocations(cls, allocations: Iterable[Allocation]) -> "AllocationBatch":
+        allocations = list(allocations)
+        return cls(
+            supplier_ids=np.array([a.supplier_id for a in allocations], dtype=object),
+            allocated_amount=np.array([a.allocated_amount for a in allocations], dtype=np.float64),
+            expected_return=np.array([a.expected_return for a in allocations], dtype=np.float64),
+            risk_contribution=np.array([a.risk_contribution for a in allocations], dtype=np.float64),
+        )
+
+    @classmethod
+    def from_records(cls, records: Iterable[dict]) -> "AllocationBatch":
+        """Inverse of to_records() - accepts the API/job_store dict form."""
+        return cls.from_allocations(Allocation(**r) for r in records)
+
+    @classmethod
+    def coerce(cls, allocations) -> "AllocationBatch":
+        if isinstance(allocations, cls):
+            return allocations
+        return cls.from_allocations(allocations)
+
+    def __len__(self) -> int:
+        return len(self.supplier_ids)
+
+    def __getitem__(self, idx: int) -> Allocation:
+        return Allocation(
+            supplier_id=self.supplier_ids[idx],
+            allocated_amount=float(self.allocated_amount[idx]),
+            expected_return=float(self.expected_return[idx]),
+            risk_contribution=float(self.risk_contribution[idx]),
+        )
+
+    def __iter__(self) -> Iterator[Allocation]:
+        for i in range(len(self)):
+            yield self[i]
+
+    @property
+    def total_yield(self) -> float:
+        return float(self.expected_return.sum())
+
+    @property
+    def total_risk(self) -> float:
+        return float(self.risk_contribution.sum())
+
+    def to_records(self) -> list[dict]:
+        """JSON-ready list of allocation dicts (API response shape)."""
+        columns = {
+            "supplier_id": self.supplier_ids.tolist(),
+            "allocated_amount": self.allocated_amount.tolist(),
+            "expected_return": self.expected_return.tolist(),
+            "risk_contribution": self.risk_contribution.tolist(),
+        }
+        keys = list(columns)
+        return [dict(zip(keys, row)) for row in zip(*columns.values())]
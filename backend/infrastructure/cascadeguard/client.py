@@ -0,0 +1,158 @@
+"""CascadeGuard Client - pooled async transport, retry budget and batching for the R-QAOA service."""
+import asyncio
+import json
+import os
+import threading
+from typing import Optional
+
+import httpx
+
+from ..http import async_http_client, io_loop, Backoff, RetryBudget
+
+_RETRYABLE_STATUS = (502, 503, 504)
+
+
+def local_dispatch(request: dict) -> dict:
+    """
+    Deterministic stand-in for the service's R-QAOA dispatch (no network, no quantum).
+    Capacity is derated by weather exposure (doubled under a stress event) and nodes are
+    dispatched in order of least weather dependency until demand is covered.
+    """
+    stress = 2.0 if request.get("is_stress_event") else 1.0
+    factor = float(request.get("weather_factor", 0.0)) * stress
+    remaining = float(request.get("total_demand_mw", 0.0))
+    dispatch = {}
+    for node in sorted(request.get("nodes", []), key=lambda n: (n["weather_dependency"], n["id"])):
+        available = max(0.0, node["capacity_mw"] * (1 - min(1.0, node["weather_dependency"] * factor)))
+        dispatch[node["id"]] = min(available, max(remaining, 0.0))
+        remaining -= dispatch[node["id"]]
+    return {
+        "engine": "local-stand-in",
+        "dispatch_mw": dispatch,
+        "served_mw": sum(dispatch.values()),
+        "unserved_mw": max(remaining, 0.0),
+    }
+
+
+def _local_handler(request: httpx.Request) -> httpx.Response:
+    body = json.loads(request.content or b"{}")
+    if request.url.path.rstrip("/").endswith("/batch"):
+        return httpx.Response(200, json={"status": "success", "results": [local_dispatch(r) for r in body["requests"]]})
+    return httpx.Response(200, json={"status": "success", "result": local_dispatch(body)})
+
+
+def local_transport() -> httpx.MockTransport:
+    """Serves /optimize and /optimize/batch in-process, following the service's API contract."""
+    return httpx.MockTransport(_local_handler)
+
+
+class CascadeGuardClient:
+    """
+    Async client for the CascadeGuard service (POST {endpoint}, POST {endpoint}/batch).
+
+    One pooled httpx.AsyncClient, owned by the shared http-io loop, carries every call,
+    so sequential portfolios reuse warm connections. Transport errors and 502/503/504
+    are retried with jittered backoff, but only while the shared RetryBudget allows it.
+    dispatch_many sends portfolios `batch_size` at a time to /batch; if the service
+    answers 404/405 there, batching is switched off and requests go out concurrently
+    (at most `max_concurrency` in flight) over the same pool.
+    """
+
+    def __init__(
+        self,
+        endpoint_url: str,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        local: bool = False,
+        max_attempts: int = 3,
+        batch_size: int = 16,
+        max_concurrency: int = 8,
+        timeout_s: float = 10.0,
+    ):
+        self.endpoint_url = endpoint_url.rstrip("/")
+        self.local = local
+        self.transport = local_transport() if local else transport
+        self.max_attempts = max_attempts
+        self.batch_size = batch_size
+        self.max_concurrency = max_concurrency
+        self.timeout_s = timeout_s
+        self.budget = RetryBudget()
+        self.batch_supported: Optional[bool] = None
+        self._http: Optional[httpx.AsyncClient] = None
+
+    def _client(self) -> httpx.AsyncClient:
+        if self._http is None:
+            self._http = async_http_client(self.transport, timeout=self.timeout_s)
+        return self._http
+
+    async def _post(self, url: str, body: dict) -> httpx.Response:
+        self.budget.deposit()
+        backoff = Backoff(base=0.2, cap=2.0)
+        for attempt in range(self.max_attempts):
+            last = attempt == self.max_attempts - 1
+            try:
+                response = await self._client().post(url, json=body)
+                if response.status_code not in _RETRYABLE_STATUS or last or not self.budget.try_spend():
+                    return response
+            except httpx.TransportError:
+                if last or not self.budget.try_spend():
+                    raise
+            await asyncio.sleep(backoff.next())
+
+    async def dispatch(self, request: dict) -> dict:
+        """One portfolio's node payload -> the service's `result`."""
+        response = await self._post(self.endpoint_url, request)
+        response.raise_for_status()
+        return response.json()["result"]
+
+    async def dispatch_many(self, requests: list[dict]) -> list[dict]:
+        """Several portfolios' payloads -> their results, in order."""
+        results = []
+        for start in range(0, len(requests), self.batch_size):
+            chunk = requests[start:start + self.batch_size]
+            if self.batch_supported is not False:
+                response = await self._post(f"{self.endpoint_url}/batch", {"requests": chunk})
+                if response.status_code in (404, 405):
+                    self.batch_supported = False
+                else:
+                    response.raise_for_status()
+                    self.batch_supported = True
+                    results.extend(response.json()["results"])
+                    continue
+            gate = asyncio.Semaphore(self.max_concurrency)
+
+            async def one(request: dict) -> dict:
+                async with gate:
+                    return await self.dispatch(request)
+
+            results.extend(await asyncio.gather(*[one(r) for r in chunk]))
+        return results
+
+    async def aclose(self) -> None:
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+    def dispatch_sync(self, request: dict) -> dict:
+        return io_loop.submit(self.dispatch(request)).result()
+
+    def dispatch_many_sync(self, requests: list[dict]) -> list[dict]:
+        return io_loop.submit(self.dispatch_many(requests)).result()
+
+
+_clients: dict[tuple, CascadeGuardClient] = {}
+_clients_lock = threading.Lock()
+
+
+def cascadeguard_client(endpoint_url: str, local: Optional[bool] = None) -> CascadeGuardClient:
+    """
+    Shared client per endpoint. `local=True` (or CASCADE_GUARD_MODE=local) answers from
+    local_dispatch in-process, for tests and offline demos.
+    """
+    if local is None:
+        local = os.getenv("CASCADE_GUARD_MODE", "remote").strip().lower() == "local"
+    key = (endpoint_url, local)
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = _clients[key] = CascadeGuardClient(endpoint_url, local=local)
+        return client
@@ -0,0 +1,10 @@
+"""Shared HTTP infrastructure - pooled provider clients and cached credentials."""
+from .pool import HTTP2_AVAILABLE, http_client, async_http_client, close_clients
+from .tokens import TokenManager, token_manager
+from .health import ProviderHealth, CircuitOpenError, provider_health, health_snapshot
+from .loop import BackgroundLoop, io_loop
+from .retry import Backoff, RetryBudget
+
+__all__ = ["HTTP2_AVAILABLE", "http_client", "async_http_client", "close_clients", "TokenManager", "token_manager",
+           "ProviderHealth", "CircuitOpenError", "provider_health", "health_snapshot",
+           "BackgroundLoop", "io_loop", "Backoff", "RetryBudget"]
@@ -0,0 +1,161 @@
+"""Provider health tracking - EWMA latency / error rate and a circuit breaker per remote provider."""
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Optional
+
+CLOSED, OPEN, HALF_OPEN = "CLOSED", "OPEN", "HALF_OPEN"
+
+
+class CircuitOpenError(RuntimeError):
+    """The provider's breaker is open; callers should take their local path immediately."""
+
+
+class ProviderHealth:
+    """
+    Health of one remote provider, shared by every request that calls it.
+
+    Latency and error rate are exponentially weighted (weight `alpha` on the newest
+    call); a call slower than `slow_call_s` counts as an error. The breaker opens after
+    `consecutive_failures` failures in a row, or once the error rate reaches
+    `error_threshold` over at least `min_calls` calls. After `cooldown_s` one probe is let
+    through (HALF_OPEN): success closes the breaker, failure re-opens it for another
+    cooldown. Everything else is rejected at once while the breaker is not CLOSED.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        alpha: float = 0.2,
+        error_threshold: float = 0.5,
+        min_calls: int = 5,
+        consecutive_failures: int = 3,
+        cooldown_s: float = 30.0,
+        slow_call_s: float = 20.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.alpha = alpha
+        self.error_threshold = error_threshold
+        self.min_calls = min_calls
+        self.consecutive_failures = consecutive_failures
+        self.cooldown_s = cooldown_s
+        self.slow_call_s = slow_call_s
+        self.clock = clock
+        self.state = CLOSED
+        self.latency_ms: Optional[float] = None
+        self.error_rate = 0.0
+        self.calls = 0
+        self.failures_in_row = 0
+        self.opened_at = 0.0
+        self.rejected = 0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Whether a call may go out now; in HALF_OPEN only the single probe is allowed."""
+        with self._lock:
+            if self.state == OPEN and self.clock() - self.opened_at >= self.cooldown_s:
+                self.state = HALF_OPEN
+            if self.state == CLOSED:
+                return True
+            if self.state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            self.rejected += 1
+            return False
+
+    def record(self, ok: bool, latency_s: float) -> None:
+        with self._lock:
+            ok = ok and latency_s <= self.slow_call_s
+            ms = latency_s * 1000
+            self.latency_ms = ms if self.latency_ms is None else self.latency_ms + self.alpha * (ms - self.latency_ms)
+            self.error_rate += self.alpha * ((0.0 if ok else 1.0) - self.error_rate)
+            self.calls += 1
+            self.failures_in_row = 0 if ok else self.failures_in_row + 1
+
+            if self.state == HALF_OPEN:
+                self._probe_in_flight = False
+                if ok:
+                    self.state, self.error_rate = CLOSED, 0.0
+                else:
+                    self._trip()
+            elif self.state == CLOSED and not ok and (
+                self.failures_in_row >= self.consecutive_failures
+                or (self.calls >= self.min_calls and self.error_rate >= self.error_threshold)
+            ):
+                self._trip()
+
+    def release(self) -> None:
+        """An allowed call ended without an outcome (e.g. cancelled); frees the half-open probe slot."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def _trip(self) -> None:
+        self.state, self.opened_at = OPEN, self.clock()
+
+    @contextmanager
+    def guard(self):
+        """
+        Wrap one remote call: raises CircuitOpenError if the breaker rejects it, records
+        success on normal exit and failure on any exception (re-raised). BaseExceptions
+        such as task cancellation are not held against the provider.
+        """
+        if not self.allow():
+            raise CircuitOpenError(f"{self.name} circuit {self.state}, skipping remote call")
+        start = time.monotonic()
+        try:
+            yield
+        except Exception:
+            self.record(False, time.monotonic() - start)
+            raise
+        except BaseException:
+            self.release()
+            raise
+        self.record(True, time.monotonic() - start)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "provider": self.name,
+                "state": self.state,
+                "ewma_latency_ms": None if self.latency_ms is None else round(self.latency_ms, 1),
+                "error_rate": round(self.error_rate, 3),
+                "calls": self.calls,
+                "consecutive_failures": self.failures_in_row,
+                "rejected": self.rejected,
+                "retry_in_s": round(max(0.0, self.cooldown_s - (self.clock() - self.opened_at)), 1) if self.state == OPEN else 0.0,
+            }
+
+    def describe(self) -> str:
+        """One-line summary for solver_logs."""
+        snap = self.snapshot()
+        latency = "n/a" if snap["ewma_latency_ms"] is None else f"{snap['ewma_latency_ms']:.0f} ms"
+        return f"Circuit: {self.name} {snap['state']} (EWMA latency {latency}, error rate {snap['error_rate']:.0%})"
+
+
+_providers: dict[str, ProviderHealth] = {}
+_providers_lock = threading.Lock()
+
+
+def provider_health(name: str) -> ProviderHealth:
+    """Process-wide health tracker for a provider; thresholds come from BREAKER_* env vars."""
+    with _providers_lock:
+        health = _providers.get(name)
+        if health is None:
+            health = _providers[name] = ProviderHealth(
+                name,
+                error_threshold=float(os.getenv("BREAKER_ERROR_RATE", "0.5")),
+                consecutive_failures=int(os.getenv("BREAKER_CONSECUTIVE_FAILURES", "3")),
+                cooldown_s=float(os.getenv("BREAKER_COOLDOWN_S", "30")),
+                slow_call_s=float(os.getenv("BREAKER_SLOW_CALL_S", "20")),
+            )
+        return health
+
+
+def health_snapshot() -> list[dict]:
+    """Snapshot of every provider that has been called (or checked) in this process."""
+    with _providers_lock:
+        providers = list(_providers.values())
+    return [p.snapshot() for p in providers]
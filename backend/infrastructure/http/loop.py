@@ -0,0 +1,28 @@
+"""Background event loop for driving async HTTP clients from synchronous solver code."""
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Coroutine, Optional
+
+
+class BackgroundLoop:
+    """A daemon thread running one event loop; every remote job shares it instead of holding a thread."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+
+    def loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, name=self.name, daemon=True).start()
+            return self._loop
+
+    def submit(self, coro: Coroutine) -> Future:
+        """Schedule `coro` on the shared loop; cancelling the returned future cancels the task."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop())
+
+
+io_loop = BackgroundLoop("http-io")
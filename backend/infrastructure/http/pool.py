@@ -0,0 +1,49 @@
+"""Long-lived, pooled HTTP clients - one per provider, reused across requests."""
+import importlib.util
+import os
+import threading
+
+import httpx
+
+# HTTP/2 needs the optional `h2` package (httpx[http2]); without it clients keep HTTP/1.1 keep-alive
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+_LIMITS = httpx.Limits(
+    max_connections=int(os.getenv("HTTP_POOL_MAX_CONNECTIONS", "32")),
+    max_keepalive_connections=int(os.getenv("HTTP_POOL_MAX_KEEPALIVE", "16")),
+    keepalive_expiry=float(os.getenv("HTTP_POOL_KEEPALIVE_S", "60")),
+)
+
+_clients: dict[str, httpx.Client] = {}
+_lock = threading.Lock()
+
+
+def http_client(provider: str) -> httpx.Client:
+    """
+    The process-wide synchronous client for `provider` ("planqk", "ibm", ...).
+    httpx.Client is thread-safe, so every solver thread shares its connection pool
+    and TLS sessions instead of handshaking per call. Do not close the returned client.
+    """
+    with _lock:
+        client = _clients.get(provider)
+        if client is None or client.is_closed:
+            client = httpx.Client(http2=HTTP2_AVAILABLE, limits=_LIMITS, timeout=10.0)
+            _clients[provider] = client
+        return client
+
+
+def async_http_client(transport: httpx.AsyncBaseTransport = None, timeout: float = 10.0) -> httpx.AsyncClient:
+    """
+    A pooled async client with the shared limits. Async clients are bound to the event
+    loop that first uses them, so the owner (e.g. PlanQKAsyncClient on the http-io loop)
+    keeps the instance for its lifetime.
+    """
+    return httpx.AsyncClient(http2=HTTP2_AVAILABLE and transport is None, limits=_LIMITS, timeout=timeout, transport=transport)
+
+
+def close_clients() -> None:
+    """Close every pooled synchronous client (shutdown hook)."""
+    with _lock:
+        for client in _clients.values():
+            client.close()
+        _clients.clear()
@@ -0,0 +1,47 @@
+"""Retry pacing - jittered exponential backoff and a retry budget shared per provider."""
+import random
+import threading
+from typing import Optional
+
+
+class Backoff:
+    """
+    Exponential delays with jitter: attempt n waits base * factor**n (capped at `cap`),
+    scaled down by a random fraction of up to `jitter` so concurrent callers spread out.
+    """
+
+    def __init__(self, base: float = 0.5, cap: float = 8.0, factor: float = 2.0, jitter: float = 0.5,
+                 rng: Optional[random.Random] = None):
+        self.base, self.cap, self.factor, self.jitter = base, cap, factor, jitter
+        self.rng = rng or random.Random()
+        self.attempt = 0
+
+    def next(self) -> float:
+        delay = min(self.cap, self.base * self.factor ** self.attempt)
+        self.attempt += 1
+        return delay * (1 - self.jitter * self.rng.random())
+
+
+class RetryBudget:
+    """
+    Caps retries at a fraction of traffic: every first attempt deposits `ratio` tokens
+    (up to `max_tokens`), every retry spends one. A struggling provider therefore sees
+    at most ~(1 + ratio) x its normal load instead of max_attempts x.
+    """
+
+    def __init__(self, ratio: float = 0.2, max_tokens: float = 10.0):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self.tokens = max_tokens
+        self._lock = threading.Lock()
+
+    def deposit(self) -> None:
+        with self._lock:
+            self.tokens = min(self.max_tokens, self.tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        with self._lock:
+            if self.tokens >= 1.0:
+                self.tokens -= 1.0
+                return True
+            return False
@@ -0,0 +1,76 @@
+"""Cached bearer tokens with single-flight refresh."""
+import asyncio
+import threading
+import time
+from typing import Callable, Optional
+
+# fetch() -> (access_token, expires_in_seconds)
+TokenFetcher = Callable[[], tuple[str, float]]
+
+
+class TokenManager:
+    """
+    Caches one provider token until `refresh_margin_s` before it expires.
+
+    Refreshes are single-flight: when many threads (or event-loop tasks, via
+    token_async) find the token stale at once, one of them calls `fetch` and the
+    rest wait for and reuse its result. A failed fetch is raised to every waiter
+    and the next call retries.
+    """
+
+    def __init__(self, fetch: TokenFetcher, refresh_margin_s: float = 60.0, clock: Callable[[], float] = time.monotonic):
+        self.fetch = fetch
+        self.refresh_margin_s = refresh_margin_s
+        self.clock = clock
+        self._token: Optional[str] = None
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+        self.refreshes = 0
+
+    def _fresh(self) -> Optional[str]:
+        if self._token is not None and self.clock() < self._expires_at - self.refresh_margin_s:
+            return self._token
+        return None
+
+    def cached(self) -> bool:
+        """Whether token() would return without a network round trip."""
+        return self._fresh() is not None
+
+    def token(self) -> str:
+        token = self._fresh()
+        if token is not None:
+            return token
+        with self._lock:
+            # Another caller may have refreshed while we waited for the lock
+            token = self._fresh()
+            if token is not None:
+                return token
+            token, expires_in = self.fetch()
+            self._token, self._expires_at = token, self.clock() + float(expires_in)
+            self.refreshes += 1
+            return token
+
+    async def token_async(self) -> str:
+        """Cached hits return inline; a refresh runs in the default executor so the loop keeps serving."""
+        token = self._fresh()
+        if token is not None:
+            return token
+        return await asyncio.get_running_loop().run_in_executor(None, self.token)
+
+    def invalidate(self) -> None:
+        """Drop the cached token (e.g. after a 401)."""
+        with self._lock:
+            self._token, self._expires_at = None, 0.0
+
+
+_managers: dict[tuple, TokenManager] = {}
+_managers_lock = threading.Lock()
+
+
+def token_manager(key: tuple, fetch: TokenFetcher, refresh_margin_s: float = 60.0) -> TokenManager:
+    """Process-wide TokenManager per key (provider, credential id), shared by all solver instances."""
+    with _managers_lock:
+        manager = _managers.get(key)
+        if manager is None:
+            manager = _managers[key] = TokenManager(fetch, refresh_margin_s)
+        return manager
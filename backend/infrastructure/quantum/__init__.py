@@ -3,5 +3,11 @@ from .classical_solver import ClassicalSolver
 from .dwave_solver import DWaveSolver
 from .planqk_solver import PlanQKSolver
 from .ibm_solver import IBMSolver
+from .qubo import QUBOModel, QUBOCompiler, qubo_compiler
+from .annealer import VectorizedAnnealer, local_sampler
+from .parallel_sampler import ParallelNealSampler
+from .planqk_client import PlanQKAsyncClient, PlanQKJobError
 
-__all__ = ["ClassicalSolver", "DWaveSolver", "PlanQKSolver", "IBMSolver"]
+__all__ = ["ClassicalSolver", "DWaveSolver", "PlanQKSolver", "IBMSolver", "QUBOModel", "QUBOCompiler", "qubo_compiler",
+           "VectorizedAnnealer", "local_sampler", "ParallelNealSampler",
+           "PlanQKAsyncClient", "PlanQKJobError"]
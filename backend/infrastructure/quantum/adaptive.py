@@ -0,0 +1,111 @@
+"""Adaptive Sampling - reads in growing rounds until the best energy is found often enough."""
+import os
+import time
+from typing import Optional
+
+import numpy as np
+
+from .qubo import QUBOModel
+
+# Share of reads (in %) that must hit the best energy before sampling stops
+TARGET_CONFIDENCE = float(os.getenv("ADAPTIVE_TARGET_CONFIDENCE", "50"))
+# Wall-clock budget; no round starts that would be expected to end past it
+TIME_BUDGET_S = float(os.getenv("ADAPTIVE_TIME_BUDGET_S", "2.0"))
+
+
+def confidence(energies: np.ndarray, tol: float = 1e-6) -> float:
+    """Share of reads (in %) at the lowest energy - the D-Wave solver's convergence statistic."""
+    if not len(energies):
+        return 0.0
+    return float((np.abs(energies - energies.min()) < tol).mean() * 100)
+
+
+class AdaptiveSampler:
+    """
+    Wraps a local sampler (VectorizedAnnealer / ParallelNealSampler) and samples in rounds.
+
+    The first round runs `first_reads` reads, and every later round as many reads as all
+    rounds before it, so the total doubles each time. After each round sampling stops if
+      - confidence: the share of reads at the best energy reached `target_confidence`,
+      - converged: a round that doubled the reads found nothing better, and the best
+        energy has been hit at least `min_hits` times (rugged landscapes where the hit
+        rate plateaus below the target),
+      - time budget: the next round, at the last round's cost per read, would end past
+        `time_budget_s`,
+      - max reads: `max_reads` are spent.
+    A small QUBO whose reads all land in the ground state stops after the first round;
+    a large one keeps sampling while its estimate still improves and time allows. Round
+    r uses seed + r, so the first round alone reproduces a plain call with `seed`.
+
+    The merged SampleSet's info["adaptive"] holds the reads used, why sampling stopped
+    and the per-round trace of (reads so far, best energy, confidence).
+    """
+
+    def __init__(
+        self,
+        sampler,
+        first_reads: int = 10,
+        max_reads: int = 400,
+        target_confidence: Optional[float] = None,
+        time_budget_s: Optional[float] = None,
+        min_hits: int = 3,
+    ):
+        self.sampler = sampler
+        self.first_reads = first_reads
+        self.max_reads = max_reads
+        self.min_hits = min_hits
+        self.target_confidence = TARGET_CONFIDENCE if target_confidence is None else target_confidence
+        self.time_budget_s = TIME_BUDGET_S if time_budget_s is None else time_budget_s
+
+    @property
+    def label(self) -> str:
+        return self.sampler.label
+
+    def sample(self, model: QUBOModel, seed: Optional[int] = 42, initial_state: Optional[np.ndarray] = None):
+        import dimod
+        start = time.monotonic()
+        parts, energies, trace = [], np.zeros(0), []
+        reads = min(self.first_reads, self.max_reads)
+        while True:
+            round_start = time.monotonic()
+            round_seed = None if seed is None else seed + len(parts)
+            part = self.sampler.sample(model, num_reads=reads, seed=round_seed, initial_state=initial_state)
+            parts.append(part)
+            energies = np.concatenate([energies, np.repeat(part.record.energy, part.record.num_occurrences)])
+            trace.append((len(energies), float(energies.min()), confidence(energies)))
+            per_read = (time.monotonic() - round_start) / reads
+
+            hits = trace[-1][2] * len(energies) / 100
+            reads = min(len(energies), self.max_reads - len(energies))
+            if trace[-1][2] >= self.target_confidence:
+                stop = "confidence"
+            elif len(trace) > 1 and trace[-1][1] >= trace[-2][1] - 1e-6 and hits >= self.min_hits:
+                stop = "converged"
+            elif reads <= 0:
+                stop = "max reads"
+            elif time.monotonic() - start + per_read * reads > self.time_budget_s:
+                stop = "time budget"
+            else:
+                continue
+            break
+
+        response = dimod.concatenate(parts) if len(parts) > 1 else parts[0]
+        response.info["adaptive"] = {
+            "num_reads": len(energies),
+            "stop": stop,
+            "target": self.target_confidence,
+            "trace": trace,
+        }
+        return response
+
+
+def describe(info: dict) -> str:
+    """Log line for a SampleSet's info["adaptive"]."""
+    adaptive = info.get("adaptive")
+    if not adaptive:
+        return "Sampling: fixed reads"
+    trace = ", ".join(f"{reads}: {energy:.4f} @ {conf:.0f}%" for reads, energy, conf in adaptive["trace"])
+    return (
+        f"Sampling: {adaptive['num_reads']} reads in {len(adaptive['trace'])} rounds, stopped on "
+        f"{adaptive['stop']} (target {adaptive['target']:.0f}%); trace {trace}"
+    )
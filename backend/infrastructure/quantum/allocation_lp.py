@@ -0,0 +1,236 @@
+"""Allocation LP - exact solver specialised to the three-row SCF allocation LP."""
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class AllocationLPSolution:
+    """
+    Optimal vertex of  max c.x  s.t.  sum(x) = 1,  r.x <= R,  e.x >= E,  x >= 0.
+
+    Dual prices follow the usual sensitivity reading: `risk_price` (>= 0) is the objective
+    gained per unit of extra risk tolerance, `esg_price` (>= 0) the objective lost per unit
+    of higher ESG minimum, and `allocation_price` the dual of the full-allocation row (the
+    risk/ESG-adjusted value of the marginal supplier). `basis` is the final basis, which
+    can warm-start a solve of the same book with other limits.
+    """
+    weights: np.ndarray
+    status: str
+    objective: float
+    allocation_price: float
+    risk_price: float
+    esg_price: float
+    iterations: int
+    basis: tuple = ()
+
+
+def solve_allocation_lp(
+    objective: np.ndarray,
+    risk: np.ndarray,
+    esg: np.ndarray,
+    risk_tolerance: float,
+    esg_min: float,
+    tol: float = 1e-9,
+    max_iterations: int = 1000,
+    warm_basis: Optional[Sequence[int]] = None,
+) -> AllocationLPSolution:
+    """
+    Two-phase revised simplex on the 3-row LP, pricing all n columns per pivot as one
+    numpy expression: the basis is a 3x3 matrix, so a pivot costs O(n) and a basic
+    solution has at most three nonzero weights. The bounds x <= 1 are implied by
+    sum(x) = 1 and x >= 0, so they need no rows. Dantzig pricing switches to Bland's
+    rule after a run of degenerate pivots, so the method cannot cycle.
+
+    `warm_basis` (a previous solution's `basis`) skips phase 1. When only the limits have
+    changed the old basis is still dual feasible and a few dual simplex pivots restore
+    primal feasibility; when the book changed but the old vertex is still feasible,
+    primal pivots continue from it. Otherwise the solve starts cold.
+
+    Status is "Optimal", "Infeasible", or "Not Solved" (iteration limit) - the caller
+    can then fall back to a general LP backend.
+    """
+    c = np.asarray(objective, dtype=np.float64)
+    r = np.asarray(risk, dtype=np.float64)
+    e = np.asarray(esg, dtype=np.float64)
+    n = len(c)
+    b = np.array([1.0, float(risk_tolerance), float(esg_min)])
+
+    # Columns 0..n-1 suppliers, n risk slack (0,1,0), n+1 ESG surplus (0,0,-1), n+2.. artificials
+    slack_cols = np.array([[0.0, 0.0], [1.0, 0.0], [0.0, -1.0]])
+    signs = np.where(b < 0, -1.0, 1.0)
+    artificial = n + 2
+
+    def column(j: int) -> np.ndarray:
+        if j < n:
+            return np.array([1.0, r[j], e[j]])
+        if j < artificial:
+            return slack_cols[:, j - n]
+        k = j - artificial
+        col = np.zeros(3)
+        col[k] = signs[k]
+        return col
+
+    basis = [artificial, artificial + 1, artificial + 2]
+    B = np.diag(signs)
+    x_B = np.abs(b)
+
+    c_scale = max(1.0, float(np.abs(c).max(initial=0.0)))
+    b_scale = max(1.0, float(np.abs(b).max()))
+    iterations = 0
+
+    def reduced_costs(phase: int) -> tuple[np.ndarray, np.ndarray]:
+        # Phase 1 maximises -sum(artificials); phase 2 the real objective
+        if phase == 1:
+            cost_B = np.array([-1.0 if j >= artificial else 0.0 for j in basis])
+        else:
+            cost_B = np.array([c[j] if j < n else 0.0 for j in basis])
+        y = np.linalg.solve(B.T, cost_B)
+
+        # Reduced costs of every column, suppliers in one vectorised expression
+        d = (c if phase == 2 else 0.0) - (y[0] + y[1] * r + y[2] * e)
+        d[[j for j in basis if j < n]] = 0.0
+        d_slack = -(y @ slack_cols)
+        for k in range(2):
+            if n + k in basis:
+                d_slack[k] = 0.0
+        return d, d_slack
+
+    def pivot(leave: int, enter: int, theta: float, u: np.ndarray) -> None:
+        nonlocal B, x_B
+        x_B = x_B - theta * u
+        x_B[leave] = theta
+        basis[leave] = enter
+        B = B.copy()
+        B[:, leave] = column(enter)
+
+    def run_dual() -> Optional[str]:
+        """Dual simplex from a dual-feasible basis until the basic weights are nonnegative."""
+        nonlocal iterations
+        while True:
+            leave = int(np.argmin(x_B))
+            if x_B[leave] >= -tol * b_scale:
+                return None
+            if iterations >= max_iterations:
+                return "Not Solved"
+            d, d_slack = reduced_costs(2)
+            # Row `leave` of B^-1 A, all supplier columns at once
+            row = np.linalg.solve(B.T, np.eye(3)[leave])
+            alpha = row[0] + row[1] * r + row[2] * e
+            alpha_slack = row @ slack_cols
+            ratios = np.full(n, np.inf)
+            np.divide(d, alpha, out=ratios, where=alpha < -tol)
+            slack_ratios = np.full(2, np.inf)
+            np.divide(d_slack, alpha_slack, out=slack_ratios, where=alpha_slack < -tol)
+            best = int(np.argmin(ratios)) if n else -1
+            best_slack = int(np.argmin(slack_ratios))
+            best_ratio = ratios[best] if n else np.inf
+            if not np.isfinite(min(best_ratio, slack_ratios[best_slack])):
+                # The violated row cannot be repaired by any column: the limits are infeasible
+                return "Infeasible"
+            enter = best if best_ratio <= slack_ratios[best_slack] else n + best_slack
+            u = np.linalg.solve(B, column(enter))
+            pivot(leave, enter, x_B[leave] / u[leave], u)
+            iterations += 1
+
+    def warm_start() -> Optional[str]:
+        """Installs `warm_basis`; returns "primal" / "dual" for the feasibility it has, else None."""
+        nonlocal B, x_B
+        if warm_basis is None or len(warm_basis) != 3 or len(set(warm_basis)) != 3:
+            return None
+        if not all(0 <= j < artificial for j in warm_basis):
+            return None
+        basis[:] = [int(j) for j in warm_basis]
+        B = np.column_stack([column(j) for j in basis])
+        if np.linalg.cond(B) > 1e12:
+            return None
+        x_B = np.linalg.solve(B, b)
+        if x_B.min() >= -tol * b_scale:
+            return "primal"
+        d, d_slack = reduced_costs(2)
+        return "dual" if max(d.max(initial=-np.inf), d_slack.max()) <= tol * c_scale else None
+
+    def run_phase(phase: int) -> Optional[str]:
+        nonlocal iterations
+        degenerate = 0
+        while True:
+            if iterations >= max_iterations:
+                return "Not Solved"
+            d, d_slack = reduced_costs(phase)
+            threshold = tol * (c_scale if phase == 2 else 1.0)
+            if degenerate < 50:
+                best = int(np.argmax(d)) if n else -1
+                best_slack = int(np.argmax(d_slack))
+                if n and d[best] >= d_slack[best_slack]:
+                    enter, gain = best, d[best]
+                else:
+                    enter, gain = n + best_slack, d_slack[best_slack]
+            else:
+                # Bland: lowest-index improving column
+                improving = np.flatnonzero(d > threshold) if n else np.array([], dtype=np.int64)
+                if len(improving):
+                    enter, gain = int(improving[0]), d[improving[0]]
+                else:
+                    k = int(np.argmax(d_slack > threshold))
+                    enter, gain = n + k, d_slack[k]
+            if gain <= threshold:
+                return None
+
+            u = np.linalg.solve(B, column(enter))
+            # Artificials stuck in the basis at level 0 must leave before they could grow
+            ratios = np.full(3, np.inf)
+            for k, j in enumerate(basis):
+                if u[k] > tol:
+                    ratios[k] = max(x_B[k], 0.0) / u[k]
+                elif phase == 2 and j >= artificial and abs(u[k]) > tol:
+                    ratios[k] = 0.0
+            if not np.isfinite(ratios).any():
+                return "Unbounded"
+            theta = ratios.min()
+            ties = [k for k in range(3) if ratios[k] <= theta + tol * b_scale]
+            # Prefer driving out artificials, then the lowest column index (Bland)
+            leave = min(ties, key=lambda k: (basis[k] < artificial, basis[k]))
+
+            pivot(leave, enter, theta, u)
+            degenerate = degenerate + 1 if theta <= tol * b_scale else 0
+            iterations += 1
+
+    def solution(status: str, y: Optional[np.ndarray] = None) -> AllocationLPSolution:
+        weights = np.zeros(n)
+        if status == "Optimal":
+            for k, j in enumerate(basis):
+                if j < n:
+                    weights[j] = max(x_B[k], 0.0)
+        y = np.zeros(3) if y is None else y
+        return AllocationLPSolution(
+            weights=weights,
+            status=status,
+            objective=float(c @ weights) if status == "Optimal" else 0.0,
+            allocation_price=float(y[0]),
+            risk_price=float(y[1]),
+            esg_price=float(-y[2]),
+            iterations=iterations,
+            basis=tuple(basis),
+        )
+
+    warm = warm_start()
+    if warm == "dual":
+        outcome = run_dual()
+        if outcome is not None:
+            return solution(outcome)
+    elif warm is None:
+        basis[:] = [artificial, artificial + 1, artificial + 2]
+        B, x_B = np.diag(signs), np.abs(b)
+        outcome = run_phase(1)
+        if outcome is not None:
+            return solution(outcome)
+        infeasibility = sum(x_B[k] for k, j in enumerate(basis) if j >= artificial)
+        if infeasibility > 1e-7 * b_scale:
+            return solution("Infeasible")
+
+    outcome = run_phase(2)
+    if outcome is not None:
+        return solution(outcome)
+    cost_B = np.array([c[j] if j < n else 0.0 for j in basis])
+    return solution("Optimal", np.linalg.solve(B.T, cost_B))
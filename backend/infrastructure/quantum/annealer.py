@@ -0,0 +1,317 @@
+"""Vectorised Simulated Annealing - numpy annealer running every read as one row of a 2-D state."""
+import os
+import time
+from typing import Optional
+
+import numpy as np
+import scipy.sparse as sp
+
+from .qubo import QUBOModel
+
+
+class _CardinalityKernel:
+    """Uniform coupling c on every pair: the local field is c * (k - x_i), k = selected count per read."""
+
+    def __init__(self, weight: float):
+        self.weight = weight
+
+    def prepare(self, slices: list) -> None:
+        pass
+
+    def reset(self, X: np.ndarray) -> None:
+        self.k = X.sum(axis=1)
+
+    def field(self, X: np.ndarray, s: int, idx: np.ndarray) -> np.ndarray:
+        return self.weight * (self.k[:, None] - X[:, idx])
+
+    def update(self, s: int, step: np.ndarray) -> None:
+        self.k += step.sum(axis=1)
+
+    def max_field(self, n: int) -> np.ndarray:
+        return np.full(n, abs(self.weight) * max(n - 1, 0))
+
+
+class _BlockKernel:
+    """Same-group coupling w: the local field is w * (count of x's group - x_i), counts kept per read."""
+
+    def __init__(self, codes: np.ndarray, weight: float):
+        _, self.codes = np.unique(codes, return_inverse=True)
+        self.weight = weight
+        n, groups = len(self.codes), int(self.codes.max(initial=-1)) + 1
+        self.onehot = sp.csr_matrix((np.ones(n), (np.arange(n), self.codes)), shape=(n, groups))
+        # Few groups (tiers, regions): a dense indicator turns count updates into a small GEMM
+        if n * groups <= 4_000_000:
+            self.onehot = self.onehot.toarray()
+
+    def prepare(self, slices: list) -> None:
+        self.slices = [(self.codes[idx], self.onehot[idx]) for idx in slices]
+
+    def reset(self, X: np.ndarray) -> None:
+        self.counts = np.asarray(X @ self.onehot)
+
+    def field(self, X: np.ndarray, s: int, idx: np.ndarray) -> np.ndarray:
+        return self.weight * (self.counts[:, self.slices[s][0]] - X[:, idx])
+
+    def update(self, s: int, step: np.ndarray) -> None:
+        self.counts += np.asarray(step @ self.slices[s][1])
+
+    def max_field(self, n: int) -> np.ndarray:
+        sizes = np.bincount(self.codes)
+        return abs(self.weight) * (sizes[self.codes] - 1)
+
+
+def _band_bounds(ranked: np.ndarray, band: float) -> tuple[np.ndarray, np.ndarray]:
+    """
+    For each sorted position p, the [lo, hi) range of positions q with |ranked[q] - ranked[p]| < band.
+    searchsorted on ranked +/- band gives the bounds up to rounding; they are then nudged
+    (a whole run of equal values at a time) until they agree with the exact predicate.
+    """
+    n = len(ranked)
+    positions = np.arange(n)
+    inside = lambda q: np.abs(ranked[np.clip(q, 0, n - 1)] - ranked) < band
+    lo = np.searchsorted(ranked, ranked - band, side='left')
+    hi = np.searchsorted(ranked, ranked + band, side='right')
+    while True:
+        shrink_lo = (lo < positions) & ~inside(lo)
+        grow_lo = (lo > 0) & inside(lo - 1)
+        shrink_hi = (hi > positions + 1) & ~inside(hi - 1)
+        grow_hi = (hi < n) & inside(hi)
+        if not (shrink_lo.any() or grow_lo.any() or shrink_hi.any() or grow_hi.any()):
+            return lo, hi
+        lo = np.where(shrink_lo, np.searchsorted(ranked, ranked[np.clip(lo, 0, n - 1)], side='right'), lo)
+        lo = np.where(grow_lo, np.searchsorted(ranked, ranked[np.clip(lo - 1, 0, n - 1)], side='left'), lo)
+        hi = np.where(shrink_hi, np.searchsorted(ranked, ranked[np.clip(hi - 1, 0, n - 1)], side='left'), hi)
+        hi = np.where(grow_hi, np.searchsorted(ranked, ranked[np.clip(hi, 0, n - 1)], side='right'), hi)
+
+
+class _WindowKernel:
+    """
+    Risk-band coupling w on pairs with |v_i - v_j| < band: the local field is w times the number
+    of selected neighbours in the band, read off prefix sums over the value-sorted order.
+    """
+
+    def __init__(self, keys: np.ndarray, band: float, weight: float):
+        self.weight = weight
+        self.order = np.argsort(keys, kind='stable')
+        ranked = keys[self.order]
+        n = len(ranked)
+        lo, hi = _band_bounds(ranked, band)
+        rank = np.empty(n, dtype=np.int64)
+        rank[self.order] = np.arange(n)
+        self.lo, self.hi = lo[rank], hi[rank]
+
+    def prepare(self, slices: list) -> None:
+        self.slices = [(self.lo[idx], self.hi[idx]) for idx in slices]
+
+    def reset(self, X: np.ndarray) -> None:
+        pass
+
+    def field(self, X: np.ndarray, s: int, idx: np.ndarray) -> np.ndarray:
+        lo, hi = self.slices[s]
+        prefix = np.zeros((len(X), len(self.order) + 1))
+        np.cumsum(X[:, self.order], axis=1, out=prefix[:, 1:])
+        return self.weight * (prefix[:, hi] - prefix[:, lo] - X[:, idx])
+
+    def update(self, s: int, step: np.ndarray) -> None:
+        pass
+
+    def max_field(self, n: int) -> np.ndarray:
+        return abs(self.weight) * (self.hi - self.lo - 1)
+
+
+class _SparseKernel:
+    """General couplings: full local fields F = X @ (Q + Q^T), updated by the rows of flipped variables."""
+
+    def __init__(self, n: int, rows: np.ndarray, cols: np.ndarray, values: np.ndarray):
+        upper = sp.csr_matrix((values, (rows, cols)), shape=(n, n))
+        self.Q = (upper + upper.T).tocsr()
+
+    def prepare(self, slices: list) -> None:
+        # Q is symmetric, so a flip changes every field by its row of Q
+        self.slices = [self.Q[idx] for idx in slices]
+
+    def reset(self, X: np.ndarray) -> None:
+        self.F = np.asarray(X @ self.Q)
+
+    def field(self, X: np.ndarray, s: int, idx: np.ndarray) -> np.ndarray:
+        return self.F[:, idx]
+
+    def update(self, s: int, step: np.ndarray) -> None:
+        # Only accepted flips contribute; keep the product sparse until the final add
+        self.F += (sp.csr_matrix(step) @ self.slices[s]).toarray()
+
+    def max_field(self, n: int) -> np.ndarray:
+        return np.asarray(abs(self.Q).sum(axis=1)).ravel()
+
+
+class VectorizedAnnealer:
+    """
+    Metropolis simulated annealing over a (num_reads, n) state array.
+
+    Variables are visited in a fixed random order, cut into at most `max_chunks` slices
+    per sweep; all reads evaluate and accept flips for a slice in one numpy step. Local
+    fields come from kernels matched to the QUBO structure:
+      - cardinality: uniform pair penalty (D-Wave / Kipu), O(1) per flip from a running count
+      - block:       same-tier / same-region penalties, from per-group counts
+      - window:      |risk_i - risk_j| < band penalties, from prefix sums over risk order
+      - sparse:      whatever couplings are left
+    Flips within a slice are judged against the same fields, so each read finishes
+    with a greedy single-flip descent to land on a true local minimum.
+
+    Given an `initial_state` (e.g. the previous best sample of a slightly changed book),
+    every read starts from it and only the cold `warm_fraction` of the schedule is run,
+    so the seed is refined rather than melted down.
+
+    `beta_scale` multiplies the default (hot, cold) betas, e.g. as tuned per problem
+    size in schedule.py; it is ignored when an explicit `beta_range` is given.
+    """
+
+    label = "Vectorised Annealer"
+
+    def __init__(self, num_sweeps: int = 100, max_chunks: int = 16, beta_range: Optional[tuple] = None,
+                 warm_fraction: float = 0.25, beta_scale: tuple = (1.0, 1.0)):
+        self.num_sweeps = num_sweeps
+        self.max_chunks = max_chunks
+        self.beta_range = beta_range
+        self.warm_fraction = warm_fraction
+        self.beta_scale = beta_scale
+
+    def _kernels(self, model: QUBOModel) -> list:
+        n = model.num_variables
+        kernels = []
+        if model.uniform_coupling:
+            kernels.append(_CardinalityKernel(model.uniform_coupling))
+
+        residual = model.values.astype(np.float64)
+        for codes, weight in model.blocks:
+            codes = np.asarray(codes)
+            kernels.append(_BlockKernel(codes, weight))
+            residual -= weight * (codes[model.rows] == codes[model.cols])
+        for keys, band, weight in model.windows:
+            keys = np.asarray(keys, dtype=np.float64)
+            kernels.append(_WindowKernel(keys, band, weight))
+            residual -= weight * (np.abs(keys[model.rows] - keys[model.cols]) < band)
+
+        scale = max(1.0, float(np.abs(model.values).max(initial=0.0)))
+        keep = np.abs(residual) > 1e-9 * scale
+        if keep.any():
+            kernels.append(_SparseKernel(n, model.rows[keep], model.cols[keep], residual[keep]))
+        return kernels
+
+    def _schedule(self, model: QUBOModel, kernels: list) -> np.ndarray:
+        """Geometric beta schedule; default range follows neal (hot: ln2 / max delta, cold: ln100 / min delta)."""
+        if self.beta_range is not None:
+            hot, cold = self.beta_range
+        else:
+            n = model.num_variables
+            bound = np.abs(model.linear) + sum(k.max_field(n) for k in kernels)
+            magnitudes = np.concatenate([np.abs(model.linear), np.abs(model.values), [abs(model.uniform_coupling)]])
+            magnitudes = magnitudes[magnitudes > 0]
+            max_delta = float(bound.max(initial=0.0)) or 1.0
+            min_delta = float(magnitudes.min()) if len(magnitudes) else 1.0
+            hot, cold = np.log(2) / max_delta * self.beta_scale[0], np.log(100) / min_delta * self.beta_scale[1]
+        return np.geomspace(hot, max(cold, hot), self.num_sweeps)
+
+    @staticmethod
+    def _fields(model: QUBOModel, kernels: list, X: np.ndarray, s: int, idx: np.ndarray) -> np.ndarray:
+        field = model.linear[idx]
+        for k in kernels:
+            field = field + k.field(X, s, idx)
+        return field
+
+    def _descend(self, model: QUBOModel, kernels: list, X: np.ndarray, s: int, everything: np.ndarray) -> np.ndarray:
+        """Steepest single-flip descent until no read has an improving move (slice `s` spans all variables)."""
+        reads = np.arange(len(X))
+        for _ in range(model.num_variables):
+            delta = (1 - 2 * X) * self._fields(model, kernels, X, s, everything)
+            best = delta.argmin(axis=1)
+            improving = delta[reads, best] < -1e-12
+            if not improving.any():
+                break
+            rows, cols = reads[improving], best[improving]
+            step = np.zeros_like(X)
+            step[rows, cols] = 1 - 2 * X[rows, cols]
+            X += step
+            for k in kernels:
+                k.update(s, step)
+        return X
+
+    def anneal(self, model: QUBOModel, num_reads: int = 100, seed: Optional[int] = 42,
+               initial_state: Optional[np.ndarray] = None) -> np.ndarray:
+        """Returns the final (num_reads, n) binary states."""
+        rng = np.random.default_rng(seed)
+        n = model.num_variables
+        if initial_state is None:
+            X = rng.integers(0, 2, size=(num_reads, n)).astype(np.float64)
+        else:
+            X = np.tile(np.asarray(initial_state, dtype=np.float64).reshape(1, n), (num_reads, 1))
+        if n == 0:
+            return X
+
+        kernels = self._kernels(model)
+        everything = np.arange(n)
+        slices = np.array_split(rng.permutation(n), min(n, self.max_chunks))
+        for k in kernels:
+            k.prepare(slices + [everything])
+            k.reset(X)
+
+        schedule = self._schedule(model, kernels)
+        if initial_state is not None:
+            schedule = schedule[-max(1, int(round(self.num_sweeps * self.warm_fraction))):]
+        for beta in schedule:
+            for s, idx in enumerate(slices):
+                x = X[:, idx]
+                delta = (1 - 2 * x) * self._fields(model, kernels, X, s, idx)
+                # Metropolis: accept with prob min(1, exp(-beta * delta)), i.e. beta * delta < Exp(1)
+                accept = beta * delta < rng.standard_exponential(delta.shape)
+                step = np.where(accept, 1 - 2 * x, 0.0)
+                X[:, idx] = x + step
+                for k in kernels:
+                    k.update(s, step)
+        return self._descend(model, kernels, X, len(slices), everything)
+
+    def sample(self, model: QUBOModel, num_reads: int = 100, seed: Optional[int] = 42,
+               initial_state: Optional[np.ndarray] = None):
+        """dimod SampleSet, so callers keep using `.first` / `.data()` exactly as with neal."""
+        import dimod
+        start = time.time()
+        X = self.anneal(model, num_reads=num_reads, seed=seed, initial_state=initial_state)
+        sweeps = self.num_sweeps if initial_state is None else max(1, int(round(self.num_sweeps * self.warm_fraction)))
+        return dimod.SampleSet.from_samples(
+            (X.astype(np.int8), np.arange(model.num_variables)),
+            dimod.BINARY,
+            energy=model.energies(X),
+            info={"sampler": "vectorized", "num_sweeps": sweeps, "warm_start": initial_state is not None,
+                  "anneal_ms": (time.time() - start) * 1000},
+        )
+
+
+def warm_state(supplier_ids: np.ndarray, warm_start: Optional[dict]) -> Optional[np.ndarray]:
+    """
+    Initial annealer state for a book from a previous result's warm_start: suppliers
+    picked last time start selected, everything else (including new suppliers) not.
+    """
+    if not warm_start or "selected" not in warm_start:
+        return None
+    return np.isin(supplier_ids, np.array(warm_start["selected"], dtype=object)).astype(np.int8)
+
+
+def annealer_backend() -> str:
+    """ANNEALER_BACKEND: 'vectorized' (default) or 'neal' (multi-process neal)."""
+    return "neal" if os.getenv("ANNEALER_BACKEND", "vectorized").lower() == "neal" else "vectorized"
+
+
+def local_sampler(schedule=None, backend: Optional[str] = None):
+    """
+    Local annealer for `backend` (default ANNEALER_BACKEND), with the sweeps and beta
+    scaling of an AnnealSchedule (see schedule.tuned_schedule) where it sets them.
+    """
+    options = {}
+    if schedule is not None:
+        options["beta_scale"] = schedule.beta_scale
+        if schedule.num_sweeps:
+            options["num_sweeps"] = schedule.num_sweeps
+    if (backend or annealer_backend()) == "neal":
+        from .parallel_sampler import ParallelNealSampler
+        return ParallelNealSampler(**options)
+    return VectorizedAnnealer(**options)
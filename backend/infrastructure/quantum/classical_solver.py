@@ -1,94 +1,249 @@
-"""Classical Solver - PuLP-based QUBO optimizer for baseline comparison."""
+"""Classical Solver - LP optimizer (structured simplex, HiGHS, or PuLP/CBC) for baseline comparison."""
+import os
 import time
-from typing import Optional
-import pulp
+from typing import Optional, Sequence, Union
+import numpy as np
+from scipy.optimize import linprog
 
-from domain.entities import SCFTier, Allocation, OptimizationResult
+from domain.entities import SCFTier, SCFTierBatch, AllocationBatch, OptimizationResult
 from ports.secondary.solver_port import SolverPort
+from .allocation_lp import solve_allocation_lp
+
+
+# PuLP-style status names for scipy.optimize.linprog status codes
+_HIGHS_STATUS = {0: "Optimal", 1: "Not Solved", 2: "Infeasible", 3: "Unbounded", 4: "Not Solved"}
 
 
 class ClassicalSolver(SolverPort):
-    """PuLP-based classical linear programming solver."""
-    
-    def optimize(
-        self,
-        tiers: list[SCFTier],
-        budget: float,
-        risk_tolerance: float,
-        esg_min: float
-    ) -> OptimizationResult:
-        """Optimize using PuLP linear programming."""
-        start_time = time.time()
-        
+    """
+    Classical linear programming solver.
+
+    The LP (maximise risk-adjusted yield over allocation weights in [0, 1] subject to
+    full allocation, a weighted-risk cap and a weighted-ESG floor) has only three rows,
+    so by default it is solved exactly by solve_allocation_lp, a simplex specialised to
+    that shape which also reports the constraints' dual prices; if it hits its iteration
+    limit the same LP goes to HiGHS. HiGHS through scipy's linprog (backend="highs") and
+    PuLP/CBC (backend="pulp") remain selectable via CLASSICAL_BACKEND; CBC writes the model
+    to disk and runs the CBC binary, which costs tens of milliseconds.
+    """
+
+    BACKENDS = ("structured", "highs", "pulp")
+    SIMPLEX_MAX_VARIABLES = 2000
+
+    def __init__(self, backend: Optional[str] = None):
+        backend = (backend or os.getenv("CLASSICAL_BACKEND", "structured")).lower()
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unknown classical backend '{backend}', expected one of {self.BACKENDS}")
+        self.backend = backend
+
+    @staticmethod
+    def _objective(batch: SCFTierBatch) -> np.ndarray:
+        # Objective: Maximize yield-weighted allocations, penalize risk
+        risk_penalty = 0.5
+        return batch.yield_pct - risk_penalty * batch.risk_score / 100
+
+    @staticmethod
+    def _warm_basis(batch: SCFTierBatch, warm_start: Optional[dict]) -> Optional[list[int]]:
+        """Previous basis (by supplier_id) as columns of this book; None if a basic supplier is gone."""
+        if not warm_start or "basic_suppliers" not in warm_start:
+            return None
+        n = len(batch)
+        columns = []
+        for sid in warm_start["basic_suppliers"]:
+            matches = np.flatnonzero(batch.supplier_ids == sid)
+            if len(matches) == 0:
+                return None
+            columns.append(int(matches[0]))
+        return columns + [n + ("risk", "esg").index(slack) for slack in warm_start["basic_slacks"]]
+
+    def _solve_structured(
+        self, batch: SCFTierBatch, risk_tolerance: float, esg_min: float, warm_start: Optional[dict] = None
+    ) -> tuple[np.ndarray, str, str, Optional[dict]]:
+        """Specialised 3-row simplex; returns (allocation weights, status, log lines, warm start state)."""
+        warm_basis = self._warm_basis(batch, warm_start)
+        solution = solve_allocation_lp(
+            self._objective(batch), batch.risk_score, batch.esg_score, risk_tolerance, esg_min,
+            warm_basis=warm_basis
+        )
+        if solution.status == "Not Solved":
+            alloc_pct, status = self._solve_highs(batch, risk_tolerance, esg_min)
+            return alloc_pct, status, f"Backend: HIGHS (structured simplex hit its limit after {solution.iterations} pivots)", None
+        warm = ", warm basis" if warm_basis is not None else ""
+        lines = [f"Backend: STRUCTURED ({solution.iterations} pivots{warm})"]
+        state = None
+        if solution.status == "Optimal":
+            n = len(batch)
+            if max(solution.basis) < n + 2:  # no artificial left basic at level zero
+                state = {
+                    "basic_suppliers": [batch.supplier_ids[j] for j in solution.basis if j < n],
+                    "basic_slacks": [("risk", "esg")[j - n] for j in solution.basis if j >= n],
+                }
+            lines.append(
+                f"Dual prices: allocation {solution.allocation_price:.4f}, "
+                f"risk {solution.risk_price:.4f}/pt, ESG {solution.esg_price:.4f}/pt"
+            )
+        return solution.weights, solution.status, "\n".join(lines), state
+
+    def _solve_highs(self, batch: SCFTierBatch, risk_tolerance: float, esg_min: float) -> tuple[np.ndarray, str]:
+        """In-process HiGHS; returns (allocation weights, status)."""
+        n = len(batch)
+        # Three rows, n columns: dual simplex wins on small books, but its iteration count
+        # grows with n; interior point (+ crossover to a vertex) is ~8x faster from ~10k up
+        method = "highs-ds" if n <= self.SIMPLEX_MAX_VARIABLES else "highs-ipm"
+        res = linprog(
+            -self._objective(batch),
+            # Weighted risk <= tolerance, weighted ESG >= minimum (as -ESG <= -minimum)
+            A_ub=np.vstack([batch.risk_score, -batch.esg_score]),
+            b_ub=[risk_tolerance, -esg_min],
+            # Total allocation = 100%
+            A_eq=np.ones((1, n)),
+            b_eq=[1.0],
+            bounds=(0, 1),
+            method=method,
+        )
+        alloc_pct = res.x if res.x is not None else np.zeros(n)
+        return np.asarray(alloc_pct, dtype=np.float64), _HIGHS_STATUS.get(res.status, "Not Solved")
+
+    def _solve_pulp(self, batch: SCFTierBatch, risk_tolerance: float, esg_min: float) -> tuple[np.ndarray, str]:
+        """Reference PuLP/CBC model; returns (allocation weights, status)."""
+        import pulp
+        n = len(batch)
+
         # Create problem
         prob = pulp.LpProblem("SCF_Optimization", pulp.LpMaximize)
         
         # Decision variables: allocation percentage for each tier
-        alloc_vars = {
-            tier.supplier_id: pulp.LpVariable(
-                f"alloc_{tier.supplier_id}",
-                lowBound=0,
-                upBound=1
-            )
-            for tier in tiers
-        }
+        # (indexed by position so duplicate/odd supplier ids cannot clash)
+        alloc_vars = [
+            pulp.LpVariable(f"alloc_{i}", lowBound=0, upBound=1)
+            for i in range(n)
+        ]
         
-        # Objective: Maximize yield-weighted allocations, penalize risk
-        risk_penalty = 0.5
-        prob += pulp.lpSum([
-            alloc_vars[t.supplier_id] * (t.yield_pct - risk_penalty * t.risk_score / 100)
-            for t in tiers
-        ]), "Maximize_Risk_Adjusted_Yield"
+        prob += pulp.LpAffineExpression(zip(alloc_vars, self._objective(batch).tolist())), "Maximize_Risk_Adjusted_Yield"
         
         # Constraint 1: Total allocation = 100%
-        prob += pulp.lpSum([alloc_vars[t.supplier_id] for t in tiers]) == 1, "Total_Allocation"
+        prob += pulp.LpAffineExpression((v, 1.0) for v in alloc_vars) == 1, "Total_Allocation"
         
         # Constraint 2: Weighted risk <= tolerance
-        prob += pulp.lpSum([
-            alloc_vars[t.supplier_id] * t.risk_score for t in tiers
-        ]) <= risk_tolerance, "Risk_Tolerance"
+        prob += pulp.LpAffineExpression(zip(alloc_vars, batch.risk_score.tolist())) <= risk_tolerance, "Risk_Tolerance"
         
         # Constraint 3: Weighted ESG >= minimum
-        prob += pulp.lpSum([
-            alloc_vars[t.supplier_id] * t.esg_score for t in tiers
-        ]) >= esg_min, "ESG_Minimum"
+        prob += pulp.LpAffineExpression(zip(alloc_vars, batch.esg_score.tolist())) >= esg_min, "ESG_Minimum"
         
         # Solve with fixed seed for determinism
         # PuLP/CBC doesn't have a direct seed param in all versions, 
         # but we use a deterministic branch-and-bound behavior
         prob.solve(pulp.PULP_CBC_CMD(msg=0, threads=1))
         
+        alloc_pct = np.array([v.varValue or 0.0 for v in alloc_vars], dtype=np.float64)
+        return alloc_pct, pulp.LpStatus[prob.status]
+    
+    def optimize(
+        self,
+        tiers: Union[SCFTierBatch, list[SCFTier]],
+        budget: float,
+        risk_tolerance: float,
+        esg_min: float,
+        warm_start: Optional[dict] = None
+    ) -> OptimizationResult:
+        """
+        Optimize the allocation LP with the configured backend. The structured backend
+        restarts from `warm_start` (a previous result's basis) and returns its own.
+        """
+        start_time = time.time()
+        batch = SCFTierBatch.coerce(tiers)
+        state = None
+        
+        if self.backend == "structured":
+            alloc_pct, status, backend_log, state = self._solve_structured(batch, risk_tolerance, esg_min, warm_start)
+        elif self.backend == "pulp":
+            alloc_pct, status = self._solve_pulp(batch, risk_tolerance, esg_min)
+            backend_log = "Backend: PULP"
+        else:
+            alloc_pct, status = self._solve_highs(batch, risk_tolerance, esg_min)
+            backend_log = "Backend: HIGHS"
+        
         solve_time = (time.time() - start_time) * 1000
         
         # Build allocations
-        allocations = []
-        total_yield = 0.0
-        total_risk = 0.0
-        
-        for tier in tiers:
-            alloc_pct = pulp.value(alloc_vars[tier.supplier_id]) or 0.0
-            if alloc_pct > 0.001:  # Skip negligible allocations
-                allocated_amount = alloc_pct * budget
-                expected_return = allocated_amount * tier.yield_pct / 100
-                risk_contribution = alloc_pct * tier.risk_score
-                
-                allocations.append(Allocation(
-                    supplier_id=tier.supplier_id,
-                    allocated_amount=allocated_amount,
-                    expected_return=expected_return,
-                    risk_contribution=risk_contribution
-                ))
-                
-                total_yield += expected_return
-                total_risk += risk_contribution
+        selected = np.flatnonzero(alloc_pct > 0.001)  # Skip negligible allocations
+        allocations = AllocationBatch.from_weights(batch, selected, alloc_pct[selected], budget)
         
         return OptimizationResult(
             allocations=allocations,
-            total_yield=total_yield,
-            total_risk=total_risk,
+            total_yield=allocations.total_yield,
+            total_risk=allocations.total_risk,
             solver_type="classical",
             solve_time_ms=solve_time,
-            solver_logs=f"Status: {pulp.LpStatus[prob.status]}\nDeterministic: True (Seed: Fixed)",
+            solver_logs=f"Status: {status}\n{backend_log}\nDeterministic: True (Seed: Fixed)",
             confidence_score=100.0,
-            optimality_gap=0.0
+            optimality_gap=0.0,
+            warm_start=state
         )
+
+    def frontier(
+        self,
+        tiers: Union[SCFTierBatch, list[SCFTier]],
+        budget: float,
+        risk_tolerances: Sequence[float],
+        esg_mins: Sequence[float]
+    ) -> dict:
+        """
+        Solve the LP over the grid esg_mins x risk_tolerances and return flat, row-major
+        columns (one entry per point, ESG outer, risk inner) ready for plotting.
+
+        Only the right-hand side changes between points, so the grid is walked in
+        serpentine order and each solve is warm-started from its neighbour's basis:
+        most points then take zero or one dual simplex pivot, and the sweep costs about
+        as much as a few cold solves. Infeasible points have null yield and risk.
+        Always uses the structured solver (HiGHS for points it cannot finish).
+        """
+        start_time = time.time()
+        batch = SCFTierBatch.coerce(tiers)
+        objective = self._objective(batch)
+        risk_tolerances = [float(v) for v in risk_tolerances]
+        esg_mins = [float(v) for v in esg_mins]
+        size = len(risk_tolerances) * len(esg_mins)
+
+        columns = {
+            "risk_tolerance": [None] * size,
+            "esg_min": [None] * size,
+            "status": [None] * size,
+            "total_yield": [None] * size,
+            "total_risk": [None] * size,
+            "risk_price": [None] * size,
+            "esg_price": [None] * size,
+            "suppliers": [0] * size,
+        }
+        basis, pivots = None, 0
+        for row, esg_min in enumerate(esg_mins):
+            order = range(len(risk_tolerances))
+            for col in (order if row % 2 == 0 else reversed(order)):
+                risk_tolerance = risk_tolerances[col]
+                i = row * len(risk_tolerances) + col
+                solution = solve_allocation_lp(
+                    objective, batch.risk_score, batch.esg_score, risk_tolerance, esg_min, warm_basis=basis
+                )
+                pivots += solution.iterations
+                weights, status = solution.weights, solution.status
+                if status == "Not Solved":
+                    weights, status = self._solve_highs(batch, risk_tolerance, esg_min)
+                elif status == "Optimal":
+                    basis = solution.basis
+                    columns["risk_price"][i] = solution.risk_price
+                    columns["esg_price"][i] = solution.esg_price
+
+                columns["risk_tolerance"][i] = risk_tolerance
+                columns["esg_min"][i] = esg_min
+                columns["status"][i] = status
+                if status == "Optimal":
+                    columns["total_yield"][i] = float(budget * (weights @ batch.yield_pct) / 100)
+                    columns["total_risk"][i] = float(weights @ batch.risk_score)
+                    columns["suppliers"][i] = int(np.count_nonzero(weights > 0.001))
+
+        return {
+            "grid": {"risk_tolerance": risk_tolerances, "esg_min": esg_mins},
+            "points": columns,
+            "pivots": pivots,
+            "solve_time_ms": (time.time() - start_time) * 1000,
+        }
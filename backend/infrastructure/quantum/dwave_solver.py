@@ -3,8 +3,18 @@ import time
 import os
 from typing import Optional
 
-from domain.entities import SCFTier, Allocation, OptimizationResult
+import numpy as np
+
+from domain.entities import SCFTier, SCFTierBatch, AllocationBatch, OptimizationResult
 from ports.secondary.solver_port import SolverPort
+from .qubo import QUBOModel, qubo_compiler
+from .annealer import local_sampler, warm_state
+from .adaptive import AdaptiveSampler, describe as describe_sampling
+from .schedule import tuned_schedule
+from .ground_state import gap_report
+from .presolve import presolve
+from .postprocess import postprocess, sample_row, sample_states
+from infrastructure.http import provider_health
 
 
 class DWaveSolver(SolverPort):
@@ -14,116 +24,94 @@ class DWaveSolver(SolverPort):
         self.leap_token = os.environ.get("DWAVE_API_TOKEN")
         self._use_fallback = False
         
-    def _build_qubo(self, tiers: list[SCFTier]) -> dict:
-        """Build QUBO matrix for the optimization problem."""
-        n = len(tiers)
-        Q = {}
-        # Simple max-yield min-risk formulation
-        for i, tier in enumerate(tiers):
-            Q[(i, i)] = -tier.yield_pct + 0.5 * tier.risk_score
-        
-        penalty = 500
-        for i in range(n):
-            for j in range(i + 1, n):
-                Q[(i, j)] = penalty / n
-        return Q
+    def _build_qubo(self, tiers) -> QUBOModel:
+        """Compile (or fetch the cached) max-yield min-risk QUBO for the book."""
+        return qubo_compiler.compile(tiers, "dwave")
     
-    def _try_dwave_solve(self, Q: dict):
+    def _try_dwave_solve(self, model: QUBOModel):
         """Attempt to solve using real D-Wave hardware."""
         if not self.leap_token:
             return None, "No token provided"
         try:
-            from dwave.system import LeapHybridSampler
-            sampler = LeapHybridSampler(token=self.leap_token)
-            response = sampler.sample_qubo(Q)
+            with provider_health("dwave").guard():
+                from dwave.system import LeapHybridSampler
+                sampler = LeapHybridSampler(token=self.leap_token)
+                response = sampler.sample(model.to_bqm())
             return response.first.sample, "Real Quantum (D-Wave Leap)"
         except Exception as e:
             return None, str(e)
     
-    def _simulated_fallback(self, Q: dict) -> tuple:
-        """Fallback to local Simulated Annealing (Neal) - Lightweight & Faster."""
-        try:
-            import neal
-            # Fix seed=42 for deterministic POC results
-            sampler = neal.SimulatedAnnealingSampler()
-            response = sampler.sample_qubo(Q, num_reads=50, seed=42)
-            return response.first.sample, "Simulated Quantum (Neal Annealer)"
-        except Exception as e:
-            # Ultimate greedy fallback
-            size = max(max(k) for k in Q.keys()) + 1
-            sample = {i: 1 if Q.get((i, i), 0) < 0 else 0 for i in range(size)}
-            return sample, f"Greedy fallback: {str(e)}"
+    def _simulated_fallback(self, model: QUBOModel, max_reads: int = 400, initial_state: Optional[np.ndarray] = None) -> tuple:
+        """
+        Fallback to local Simulated Annealing (vectorised annealer, or neal via ANNEALER_BACKEND),
+        read in adaptive rounds until the best energy is found often enough (see AdaptiveSampler).
+        Sweeps, beta range and the first round's reads come from the tuned schedule table.
+        """
+        schedule = tuned_schedule(model)
+        sampler = AdaptiveSampler(local_sampler(schedule), first_reads=schedule.num_reads or 10, max_reads=max_reads)
+        # Fix seed=42 for deterministic POC results
+        response = sampler.sample(model, seed=42, initial_state=initial_state)
+        method = f"Simulated Quantum ({sampler.label})"
+        if initial_state is not None:
+            method += f", warm-started from {int(initial_state.sum())} previous picks"
+        return response, f"{method}\n{schedule.describe()}\n{describe_sampling(response.info)}"
     
     def optimize(
-        self, tiers, budget, risk_tolerance, esg_min
+        self, tiers, budget, risk_tolerance, esg_min, warm_start: Optional[dict] = None
     ) -> OptimizationResult:
+        """`warm_start` (a previous result's) seeds the local annealer with its picks."""
         start_time = time.time()
-        Q = self._build_qubo(tiers)
+        batch = SCFTierBatch.coerce(tiers)
+        model = self._build_qubo(batch)
+        # Only the variables presolve could not fix are sampled; samples are expanded back below
+        presolved = presolve(model)
+        core = presolved.core
         
         # 1. Try real quantum first
-        sample, method = self._try_dwave_solve(Q)
+        sample, method = self._try_dwave_solve(core)
+        core_states = None
         
         # 2. Fallback if needed
         if not sample:
             self._use_fallback = True
             try:
-                import neal
-                import numpy as np
-                sampler = neal.SimulatedAnnealingSampler()
-                # Run multiple reads to calculate "Convergence"
-                num_reads = 100
-                response = sampler.sample_qubo(Q, num_reads=num_reads, seed=42)
+                # Run reads in rounds until "Convergence" (or the time budget)
+                initial_state = presolved.restrict(warm_state(batch.supplier_ids, warm_start))
+                response, method = self._simulated_fallback(core, initial_state=initial_state)
                 sample = response.first.sample
+                core_states = sample_states(response, core.num_variables)
                 
                 # Calculate Scientific Metrics
                 # Confidence = (How many times did we find this exact energy?) / Total Reads
+                num_reads = response.info["adaptive"]["num_reads"]
                 min_energy = response.first.energy
                 energy_matches = sum(1 for d in response.data() if abs(d.energy - min_energy) < 1e-6)
                 confidence = (energy_matches / num_reads) * 100
-                
-                # Optimality Gap = Standard Deviation of top 5 solutions
-                energies = [d.energy for d in response.data()][:5]
-                opt_gap = float(np.std(energies)) if len(energies) > 1 else 0.05
-                
-                method = "Simulated Quantum (Neal Annealer)"
             except Exception as e:
-                sample = {i: 1 if Q.get((i, i), 0) < 0 else 0 for i in range(len(tiers))}
+                sample = dict(enumerate((core.linear < 0).astype(int).tolist()))
                 method = f"Greedy fallback: {str(e)}"
                 confidence = 65.0
-                opt_gap = 2.5
+        else:
+            confidence = 100.0
         
-        solve_time = (time.time() - start_time) * 1000
-        selected_indices = [i for i, v in sample.items() if v == 1]
+        # Every read competes in post-processing, not just the lowest-energy one
+        states = presolved.expand_states(sample_row(sample, core.num_variables) if core_states is None else core_states)
         
-        # Guaranteed allocation even if solver returns empty
-        if not selected_indices:
-            selected_indices = [0] 
-
-        alloc_per_selected = 1.0 / len(selected_indices)
-        allocations = []
-        total_yield = 0.0
-        total_risk = 0.0
-        
-        for idx in selected_indices:
-            if idx < len(tiers):
-                tier = tiers[idx]
-                amt = alloc_per_selected * budget
-                allocations.append(Allocation(
-                    supplier_id=tier.supplier_id,
-                    allocated_amount=amt,
-                    expected_return=amt * tier.yield_pct / 100,
-                    risk_contribution=alloc_per_selected * tier.risk_score
-                ))
-                total_yield += amt * tier.yield_pct / 100
-                total_risk += alloc_per_selected * tier.risk_score
+        choice = postprocess(batch, states, risk_tolerance, esg_min)
+        solve_time = (time.time() - start_time) * 1000
+        # Gap of the returned allocation against the exact ground state (small books) or a
+        # lower bound, outside the timed solve
+        opt_gap, gap_log = gap_report(model, choice.sample())
+        allocations = AllocationBatch.from_weights(batch, choice.indices, choice.weights, budget)
         
         return OptimizationResult(
             allocations=allocations,
-            total_yield=total_yield,
-            total_risk=total_risk,
+            total_yield=allocations.total_yield,
+            total_risk=allocations.total_risk,
             solver_type="Quantum (Hardware)" if not self._use_fallback else "Quantum (Simulated)",
             solve_time_ms=solve_time,
-            solver_logs=f"Method: {method}",
+            solver_logs=f"Method: {method}\n{presolved.describe()}\n{choice.describe(risk_tolerance, esg_min)}\n{gap_log}\nConfidence: {confidence:.1f}% (share of reads at the best sample's energy)\n{provider_health('dwave').describe()}",
             confidence_score=confidence,
-            optimality_gap=min(opt_gap, 5.0) # Cap display for visual polish
+            optimality_gap=opt_gap,
+            warm_start={"selected": allocations.supplier_ids.tolist()}
         )
@@ -1,165 +1,197 @@
 """IBM Quantum Solver - European Sovereign Tier (Ehningen)."""
 import time
 import os
-import httpx
+import hashlib
 from typing import Optional
+import numpy as np
 
-from domain.entities import SCFTier, Allocation, OptimizationResult
+from domain.entities import SCFTier, SCFTierBatch, AllocationBatch, OptimizationResult
 from ports.secondary.solver_port import SolverPort
+from infrastructure.http import http_client, token_manager, provider_health
+from .qubo import QUBOModel, qubo_compiler
+from .annealer import local_sampler
+from .schedule import tuned_schedule
+from .ground_state import GrayCodeEnumerator, gap_report
+from .presolve import presolve
+from .postprocess import postprocess, sample_states
+
+
+class _Elimination:
+    """
+    Array-backed QUBO under recursive fixing. Fixing x_v = 1 adds v's couplings to its
+    neighbours' linear terms (one CSR row, O(degree)); fixing x_v = 0 only drops it.
+    """
+
+    def __init__(self, model: QUBOModel):
+        self.model = model
+        upper = model.coupling_matrix
+        self.Q = (upper + upper.T).tocsr()
+        self.linear = model.linear.astype(np.float64)
+        self.values = np.full(model.num_variables, -1, dtype=np.int8)
+
+    @property
+    def free(self) -> np.ndarray:
+        return np.flatnonzero(self.values < 0)
+
+    def fix(self, variables: np.ndarray, values: np.ndarray) -> None:
+        self.values[variables] = values
+        ones = variables[values == 1]
+        for v in ones.tolist():
+            start, end = self.Q.indptr[v], self.Q.indptr[v + 1]
+            self.linear[self.Q.indices[start:end]] += self.Q.data[start:end]
+        self.linear += self.model.uniform_coupling * len(ones)
+
+    def reduced(self) -> QUBOModel:
+        free = self.free
+        return self.model.submodel(free, self.linear[free])
+
+    def complete(self, free_states: np.ndarray) -> np.ndarray:
+        """Full assignments: the fixed values plus each (reads, free) row on the free variables."""
+        free_states = np.atleast_2d(free_states)
+        states = np.tile(np.maximum(self.values, 0).astype(np.float64), (len(free_states), 1))
+        states[:, self.free] = free_states
+        return states
+
 
 class IBMSolver(SolverPort):
     """IBM Quantum Solver using European-hosted Eagle processors."""
     
-    def __init__(self):
+    def __init__(self, recursion_steps: Optional[int] = None, exact_variables: int = 16):
         self.api_key = os.environ.get("IBM_API_KEY")
         self.instance_crn = os.environ.get("IBM_SERVICE_CRN")
         self._use_fallback = False
+        # R-QAOA depth: more stages fix fewer variables each, at one (smaller) anneal per stage
+        if recursion_steps is None:
+            recursion_steps = int(os.environ.get("IBM_RQAOA_STEPS", "3"))
+        self.recursion_steps = recursion_steps
+        self.exact_variables = exact_variables
         
+    def _fetch_token(self) -> tuple[str, float]:
+        res = http_client("ibm").post(
+            "https://iam.cloud.ibm.com/identity/token",
+            data={
+                "grant_type": "urn:ibm:params:oauth:grant-type:apikey",
+                "apikey": self.api_key
+            },
+            timeout=10.0
+        )
+        res.raise_for_status()
+        body = res.json()
+        return body.get("access_token"), float(body.get("expires_in", 3600))
+
     def _authenticate(self) -> Optional[str]:
-        """Authenticate with IBM Cloud to get a bearer token."""
+        """IBM Cloud bearer token, cached process-wide until shortly before expiry."""
         if not self.api_key:
             return None
+        key_id = hashlib.sha256(self.api_key.encode()).hexdigest()[:12]
+        tokens = token_manager(("ibm", key_id), self._fetch_token)
         try:
-            with httpx.Client() as client:
-                res = client.post(
-                    "https://iam.cloud.ibm.com/identity/token",
-                    data={
-                        "grant_type": "urn:ibm:params:oauth:grant-type:apikey",
-                        "apikey": self.api_key
-                    },
-                    timeout=10.0
-                )
-                res.raise_for_status()
-                return res.json().get("access_token")
+            # Only a refresh goes over the network, so only refreshes are judged by the breaker
+            if tokens.cached():
+                return tokens.token()
+            with provider_health("ibm").guard():
+                return tokens.token()
         except Exception:
             return None
 
-    def _recursive_qaoa_solve(self, Q: dict, n_vars: int) -> dict:
+    @staticmethod
+    def _stage_sampler(reduced: QUBOModel):
+        """neal sampler on the tuned schedule for a stage's reduced size."""
+        return local_sampler(tuned_schedule(reduced, "neal"), backend="neal")
+
+    def _recursive_qaoa_solve(self, model: QUBOModel) -> tuple[np.ndarray, str]:
         """
-        Implementation of Recursive-QAOA (R-QAOA).
-        Iteratively reduces problem size by fixing high-correlation variables.
+        Implementation of Recursive-QAOA (R-QAOA) on an array-backed model.
+
+        Each of `recursion_steps` stages samples the remaining variables once and reads the
+        correlations <Z_i> off that sample set (in a real QPU run these are measured
+        expectation values). The most polarised share of the variables is fixed to its
+        sign, their couplings are absorbed into the neighbours' linear terms, and the next
+        stage samples only what is left, warm-started from the stage's best sample. Once
+        `exact_variables` or fewer remain they are solved exactly, as in R-QAOA's final
+        brute-force step. Returns every stage's reads completed to full assignments,
+        lowest energy first, so post-processing sees all of them. Each stage anneals with
+        the tuned neal schedule for its reduced size; read counts stay fixed, since the
+        correlations need a full sample.
         """
+        n = model.num_variables
         try:
-            import neal
-            sampler = neal.SimulatedAnnealingSampler()
-            
-            current_Q = Q.copy()
-            fixed_vars = {}
-            remaining_vars = list(range(n_vars))
-            
-            # Recursive steps: Fix variables with highest 'correlation' (simulated)
-            # In a real QPU, this would involve measuring <Zi Zj> expectation values.
-            max_recursion = min(3, n_vars - 1)
-            for _ in range(max_recursion):
-                if not remaining_vars:
-                    break
-                    
-                response = sampler.sample_qubo(current_Q, num_reads=50)
-                sample = response.first.sample
-                
-                # Heuristic: Fix the variable that has the strongest self-bias (diagonal)
-                # This mimics the R-QAOA process of eliminating degrees of freedom.
-                best_var = -1
-                max_bias = -1
-                for v in remaining_vars:
-                    bias = abs(current_Q.get((v, v), 0))
-                    if bias > max_bias:
-                        max_bias = bias
-                        best_var = v
-                
-                if best_var != -1:
-                    fixed_vars[best_var] = sample[best_var]
-                    remaining_vars.remove(best_var)
-                    # Simple Q-matrix reduction: Remove the fixed variable
-                    new_Q = {}
-                    for (i, j), val in current_Q.items():
-                        if i != best_var and j != best_var:
-                            new_Q[(i, j)] = val
-                    current_Q = new_Q
+            elimination = _Elimination(model)
+            per_stage = -(-max(n - self.exact_variables, 0) // max(self.recursion_steps, 1))
+            candidates, warm, stages = [], None, 0
+
+            while len(elimination.free) > self.exact_variables and stages < self.recursion_steps:
+                free = elimination.free
+                reduced = elimination.reduced()
+                response = self._stage_sampler(reduced).sample(reduced, num_reads=50, seed=42, initial_state=warm)
+                X = sample_states(response, len(free))
+                candidates.append(elimination.complete(X))
+
+                # Fix the variables the sample set agrees on most, Z = 2x - 1
+                correlation = (2 * X - 1).mean(axis=0)
+                chosen = np.argsort(-np.abs(correlation), kind="stable")[:per_stage]
+                values = np.where(correlation[chosen] == 0, X[0, chosen], correlation[chosen] > 0)
+                elimination.fix(free[chosen], values.astype(np.int8))
+                rest = np.ones(len(free), dtype=bool)
+                rest[chosen] = False
+                warm = X[0, rest]
+                stages += 1
 
             # Final solve for remaining variables
-            if remaining_vars:
-                final_res = sampler.sample_qubo(current_Q, num_reads=100)
-                final_sample = final_res.first.sample
-                fixed_vars.update(final_sample)
-            
-            return fixed_vars
-            
-        except Exception:
+            reduced = elimination.reduced()
+            if reduced.num_variables <= self.exact_variables:
+                candidates.append(elimination.complete(GrayCodeEnumerator().solve(reduced).state))
+                final = "exact final solve"
+            else:
+                response = self._stage_sampler(reduced).sample(reduced, num_reads=100, seed=42, initial_state=warm)
+                candidates.append(elimination.complete(sample_states(response, reduced.num_variables)))
+                final = "annealed final solve"
+            states = np.vstack(candidates)
+            log = f"{stages}-Stage Recursive Reduction ({n} -> {reduced.num_variables} variables, {final})"
+            return states[np.argsort(model.energies(states), kind="stable")], log
+
+        except Exception as e:
             # Fallback to standard solve if recursion fails
-            return {i: 1 for i in range(n_vars)}
+            return np.ones((1, n)), f"Recursion failed: {e}"
 
     def optimize(
         self, tiers, budget, risk_tolerance, esg_min
     ) -> OptimizationResult:
         start_time = time.time()
+        batch = SCFTierBatch.coerce(tiers)
         
         # 1. Higher-Order Construction - Calibrated Weights
-        n = len(tiers)
-        Q = {}
-        for i, tier in enumerate(tiers):
-            # ESG is our 'Sovereign Buffer' - high weighting to secure non-correlated ESG nodes
-            esg_buffer = (tier.esg_score - 50) * 0.3
-            # Balanced Diagonal (Yield vs Risk vs ESG)
-            Q[(i, i)] = -tier.yield_pct + (0.15 * tier.risk_score) - esg_buffer
-            
-        # 2. Add Systemic Correlation Penalties (Regional HOBO Layer)
-        for i in range(n):
-            for j in range(i + 1, n):
-                # Regional Cluster Risk - Targeted Penalty
-                region_i = tiers[i].supplier_id.split('_')[0]
-                region_j = tiers[j].supplier_id.split('_')[0]
-                
-                penalty = 0
-                if region_i == region_j:
-                    # Regional correlation penalty - prices systemic shock probability
-                    penalty += 4.5
-                
-                # Tier dependency penalty
-                if tiers[i].tier == tiers[j].tier:
-                    penalty += 1.5
-                
-                if penalty > 0:
-                    Q[(i, j)] = penalty
+        # ESG 'Sovereign Buffer' diagonal plus Systemic Correlation Penalties (Regional HOBO Layer),
+        # see qubo.ibm_qubo
+        model = qubo_compiler.compile(batch, "ibm")
+        # R-QAOA only sees the variables presolve could not fix
+        presolved = presolve(model)
 
-        # 3. Execute with R-QAOA (Advanced Recursive Logic)
+        # 2. Execute with R-QAOA (Advanced Recursive Logic)
         token = self._authenticate()
-        auth_status = "✅ Authenticated with IBM Quantum" if token else "⚠️ API Key Missing (Using local R-QAOA Simulator)"
+        if token:
+            auth_status = "✅ Authenticated with IBM Quantum"
+        elif self.api_key:
+            auth_status = "⚠️ IBM Cloud auth unavailable (Using local R-QAOA Simulator)"
+        else:
+            auth_status = "⚠️ API Key Missing (Using local R-QAOA Simulator)"
         
-        sample = self._recursive_qaoa_solve(Q, n)
+        core_states, execution = self._recursive_qaoa_solve(presolved.core)
+        states = presolved.expand_states(core_states)
         method = "Recursive-QAOA (R-QAOA) v2.1"
             
+        choice = postprocess(batch, states, risk_tolerance, esg_min)
         solve_time = (time.time() - start_time) * 1000
-        selected_indices = [i for i, v in sample.items() if v == 1]
-        
-        allocations = []
-        if not selected_indices:
-            selected_indices = [0]
-            
-        alloc_per_selected = 1.0 / len(selected_indices)
-        total_yield = 0.0
-        total_risk = 0.0
-        
-        for idx in selected_indices:
-            if idx < len(tiers):
-                tier = tiers[idx]
-                amt = alloc_per_selected * budget
-                allocations.append(Allocation(
-                    supplier_id=tier.supplier_id,
-                    allocated_amount=amt,
-                    expected_return=amt * tier.yield_pct / 100,
-                    risk_contribution=alloc_per_selected * tier.risk_score
-                ))
-                total_yield += amt * tier.yield_pct / 100
-                total_risk += alloc_per_selected * tier.risk_score
+        opt_gap, gap_log = gap_report(model, choice.sample())
+        allocations = AllocationBatch.from_weights(batch, choice.indices, choice.weights, budget)
                 
         return OptimizationResult(
             allocations=allocations,
-            total_yield=total_yield,
-            total_risk=total_risk,
+            total_yield=allocations.total_yield,
+            total_risk=allocations.total_risk,
             solver_type="IBM Quantum Eagle (Ehningen)",
             solve_time_ms=solve_time,
-            solver_logs=f"{auth_status}\nAlgorithm: {method}\nExecution: 3-Stage Recursive Reduction",
+            solver_logs=f"{auth_status}\nAlgorithm: {method}\nExecution: {execution}\n{presolved.describe()}\n{choice.describe(risk_tolerance, esg_min)}\n{gap_log}\n{provider_health('ibm').describe()}",
             confidence_score=99.9,
-            optimality_gap=0.01
+            optimality_gap=opt_gap
         )
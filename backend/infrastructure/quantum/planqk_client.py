@@ -0,0 +1,163 @@
+"""Async PlanQK Client - non-blocking submission and polling of Kipu hub service jobs."""
+import asyncio
+import inspect
+from typing import Awaitable, Callable, Optional, Union
+
+import httpx
+
+from infrastructure.http import async_http_client
+from infrastructure.http.retry import Backoff
+
+TERMINAL_STATES = ("SUCCEEDED", "FAILED", "CANCELLED", "UNKNOWN")
+
+# on_status(job_id, status) - plain function or coroutine function
+StatusCallback = Callable[[str, str], Union[None, Awaitable[None]]]
+# headers() -> auth headers, awaited per request so tokens can be refreshed between polls
+HeaderProvider = Callable[[], Awaitable[dict]]
+# on_unauthorized() - drops cached credentials after a 401; plain function or coroutine function
+UnauthorizedHook = Callable[[], Union[None, Awaitable[None]]]
+
+
+class PlanQKJobError(RuntimeError):
+    """A PlanQK job ended without a usable result (failed, cancelled or past its deadline)."""
+
+
+class PlanQKAsyncClient:
+    """
+    asyncio-native client for a PlanQK managed service (POST /, GET /{id}, GET /{id}/result).
+
+    One pooled httpx.AsyncClient (HTTP/2 when available) serves every job, so any number of
+    jobs can be in flight from a single event loop. Status polls back off exponentially
+    with jitter until `deadline_s`; a webhook can call notify(job_id) to end the current
+    wait early, so callback-driven deployments are not limited by the poll interval.
+    A 401 calls `on_unauthorized` (e.g. TokenManager.invalidate) and resends the request
+    once with fresh headers.
+    """
+
+    def __init__(
+        self,
+        service_url: str,
+        headers: Optional[HeaderProvider] = None,
+        on_unauthorized: Optional[UnauthorizedHook] = None,
+        deadline_s: float = 30.0,
+        poll_base_s: float = 0.5,
+        poll_cap_s: float = 8.0,
+        jitter: float = 0.5,
+        request_timeout_s: float = 10.0,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.base_url = service_url if service_url.endswith("/") else f"{service_url}/"
+        self.headers = headers
+        self.on_unauthorized = on_unauthorized
+        self.deadline_s = deadline_s
+        self.poll_base_s = poll_base_s
+        self.poll_cap_s = poll_cap_s
+        self.jitter = jitter
+        self.request_timeout_s = request_timeout_s
+        self.transport = transport
+        self._http: Optional[httpx.AsyncClient] = None
+        self._wakeups: dict[str, asyncio.Event] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _client(self) -> httpx.AsyncClient:
+        if self._http is None:
+            self._loop = asyncio.get_running_loop()
+            self._http = async_http_client(self.transport, timeout=self.request_timeout_s)
+        return self._http
+
+    async def _headers(self, **extra) -> dict:
+        headers = await self.headers() if self.headers else {}
+        return {**headers, "Accept": "application/json", **extra}
+
+    async def _send(self, method: str, url: str, extra_headers: Optional[dict] = None, **kwargs) -> httpx.Response:
+        """One request; on 401 the cached credentials are dropped and it is resent once."""
+        res = await self._client().request(method, url, headers=await self._headers(**(extra_headers or {})), **kwargs)
+        if res.status_code == 401 and self.on_unauthorized is not None:
+            outcome = self.on_unauthorized()
+            if inspect.isawaitable(outcome):
+                await outcome
+            res = await self._client().request(method, url, headers=await self._headers(**(extra_headers or {})), **kwargs)
+        return res
+
+    async def submit(self, data: dict, params: dict) -> str:
+        """Start a service execution; returns the PlanQK job id."""
+        res = await self._send(
+            "POST",
+            self.base_url,
+            extra_headers={"Content-Type": "application/json"},
+            json={"data": data, "params": params},
+            timeout=30.0,
+        )
+        res.raise_for_status()
+        return res.json().get("id")
+
+    async def status(self, job_id: str) -> str:
+        res = await self._send("GET", f"{self.base_url}{job_id}")
+        res.raise_for_status()
+        return res.json().get("status")
+
+    async def result(self, job_id: str) -> dict:
+        res = await self._send("GET", f"{self.base_url}{job_id}/result")
+        res.raise_for_status()
+        return res.json()
+
+    async def cancel(self, job_id: str) -> None:
+        """Best-effort cancellation of a job nobody is waiting for any more."""
+        try:
+            await self._send("PUT", f"{self.base_url}{job_id}/cancel", timeout=5.0)
+        except httpx.HTTPError:
+            pass
+
+    def notify(self, job_id: str) -> None:
+        """Wake the waiter of `job_id` for an immediate status check; safe from any thread."""
+        event, loop = self._wakeups.get(job_id), self._loop
+        if event is not None and loop is not None:
+            loop.call_soon_threadsafe(event.set)
+
+    async def wait(self, job_id: str, deadline_s: Optional[float] = None, on_status: Optional[StatusCallback] = None) -> str:
+        """Poll until the job reaches a terminal state; raises PlanQKJobError past the deadline."""
+        loop = asyncio.get_running_loop()
+        budget = self.deadline_s if deadline_s is None else deadline_s
+        deadline = loop.time() + budget
+        backoff = Backoff(self.poll_base_s, self.poll_cap_s, jitter=self.jitter)
+        wakeup = self._wakeups.setdefault(job_id, asyncio.Event())
+        last = None
+        try:
+            while True:
+                status = await self.status(job_id)
+                if status != last and on_status is not None:
+                    outcome = on_status(job_id, status)
+                    if inspect.isawaitable(outcome):
+                        await outcome
+                last = status
+                if status in TERMINAL_STATES:
+                    return status
+
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    raise PlanQKJobError(f"Job {job_id} timed out after {budget:g}s ({status})")
+                wakeup.clear()
+                try:
+                    await asyncio.wait_for(wakeup.wait(), timeout=min(backoff.next(), remaining))
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self._wakeups.pop(job_id, None)
+
+    async def run(self, data: dict, params: dict, deadline_s: Optional[float] = None,
+                  on_status: Optional[StatusCallback] = None) -> tuple[str, dict]:
+        """Submit, wait and fetch the result; returns (job_id, result). Cancelling the task cancels the job."""
+        job_id = await self.submit(data, params)
+        try:
+            status = await self.wait(job_id, deadline_s, on_status)
+        except (asyncio.CancelledError, PlanQKJobError):
+            await asyncio.shield(self.cancel(job_id))
+            raise
+        if status != "SUCCEEDED":
+            raise PlanQKJobError(f"Job {job_id} {status}")
+        return job_id, await self.result(job_id)
+
+    async def aclose(self) -> None:
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
@@ -1,224 +1,318 @@
 """PlanQK/Kipu Quantum Solver - European sovereign quantum alternative."""
+import asyncio
 import time
 import os
-import httpx
 import base64
-from typing import Optional
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Union
+import numpy as np
 
-from domain.entities import SCFTier, Allocation, OptimizationResult
+from domain.entities import SCFTier, SCFTierBatch, AllocationBatch, OptimizationResult
 from ports.secondary.solver_port import SolverPort
+from .qubo import QUBOModel, qubo_compiler
+from .annealer import local_sampler, warm_state
+from .adaptive import AdaptiveSampler, describe as describe_sampling
+from .schedule import tuned_schedule
+from .ground_state import gap_report
+from .presolve import presolve
+from .postprocess import postprocess, sample_row, sample_states
+from infrastructure.http import http_client, token_manager, TokenManager, provider_health, CircuitOpenError, io_loop
+from .planqk_client import PlanQKAsyncClient, PlanQKJobError, StatusCallback
+
+# Sandbox legs and post-processing of PlanQK solves (hub legs run on the shared http-io event loop)
+_hedge_pool = ThreadPoolExecutor(
+    max_workers=int(os.getenv("PLANQK_HEDGE_THREADS", "8")), thread_name_prefix="planqk-hedge"
+)
+
+# One long-lived hub client (connection pool) per service URL
+_hub_clients: dict[str, PlanQKAsyncClient] = {}
+_hub_clients_lock = threading.Lock()
+
+
+async def close_hub_clients() -> None:
+    """Close every hub client's connection pool on the http-io loop that owns it (shutdown hook)."""
+    with _hub_clients_lock:
+        clients = list(_hub_clients.values())
+        _hub_clients.clear()
+    for client in clients:
+        await asyncio.wrap_future(io_loop.submit(client.aclose()))
+
 
 class PlanQKSolver(SolverPort):
     """PlanQK/Kipu Solver using European Quantum Cloud via REST API."""
     
-    def __init__(self):
+    def __init__(self, hedge: Optional[bool] = None, hedge_sla_s: Optional[float] = None):
         # PlanQK uses Service Gateway Credentials
         self.access_key = os.environ.get("PLANQK_ACCESS_KEY", "").strip()
         self.secret_key = os.environ.get("PLANQK_SECRET_KEY", "").strip()
         self.service_url = os.environ.get("PLANQK_SERVICE_URL", "").strip()
-        self._use_fallback = False
+        # Hedged mode: race the hub against the local sandbox, preferring the hub within the SLA
+        if hedge is None:
+            hedge = os.environ.get("PLANQK_HEDGE", "1").strip().lower() not in ("0", "false", "no")
+        self.hedge = hedge
+        self.hedge_sla_s = hedge_sla_s if hedge_sla_s is not None else float(os.environ.get("PLANQK_HEDGE_SLA_S", "5"))
+        self.deadline_s = float(os.environ.get("PLANQK_DEADLINE_S", "30"))
         
-    def _build_qubo(self, tiers: list[SCFTier]) -> dict:
+    def _build_qubo(self, tiers: Union[SCFTierBatch, list[SCFTier]]) -> QUBOModel:
         """
-        Build Advanced HOBO-inspired QUBO matrix.
+        Build Advanced HOBO-inspired QUBO model (see qubo.planqk_qubo).
         Targets double-digit alpha by pricing systemic cluster risks.
         """
-        n = len(tiers)
-        Q = {}
-        
-        # 1. Advanced Node Weighting (Yield + Compliance Arbitrage)
-        for i, tier in enumerate(tiers):
-            # We treat ESG not just as a bonus, but as an insurance premium.
-            # Avoidance of high-risk ESG suppliers prevents future liability spikes.
-            esg_compliance_value = (tier.esg_score - 50) * 0.1
-            yield_term = -tier.yield_pct 
-            risk_term = 0.4 * tier.risk_score
-            
-            Q[(i, i)] = yield_term + risk_term - esg_compliance_value
-
-        # 2. Systemic Cluster Risk (The 'HOBO' proxy)
-        # Instead of a flat penalty, we penalize suppliers with similar risk profiles
-        # to prevent 'Portfolio Correlation Collapse'
-        for i in range(n):
-            for j in range(i + 1, n):
-                # Calculate correlation proxy based on tier and risk scores
-                correlation_risk = abs(tiers[i].risk_score - tiers[j].risk_score) < 5
-                same_tier = tiers[i].tier == tiers[j].tier
-                
-                penalty = 0
-                if same_tier: penalty += 500  # Diversity requirement
-                if correlation_risk: penalty += 1200 # Systemic failure overlap
-                
-                Q[(i, j)] = penalty / n
-        return Q
+        return qubo_compiler.compile(tiers, "planqk")
     
-    def _planqk_solve(self, tiers: list[SCFTier], budget: float, risk_tolerance: float, esg_min: float):
-        """Attempt to solve using PlanQK/Kipu REST API with polling."""
+    def _client(self) -> PlanQKAsyncClient:
+        """Hub client shared by every solver for this service URL; its jobs run on the shared http-io loop."""
+        with _hub_clients_lock:
+            client = _hub_clients.get(self.service_url)
+            if client is None:
+                client = _hub_clients[self.service_url] = PlanQKAsyncClient(
+                    self.service_url, headers=self._auth_header, on_unauthorized=self._drop_token,
+                    deadline_s=self.deadline_s
+                )
+            return client
+
+    def _fetch_token(self) -> tuple[str, float]:
+        """Traditional OAuth2 client-credentials token request over the pooled PlanQK connection."""
+        auth_str = f"{self.access_key}:{self.secret_key}"
+        encoded_auth = base64.b64encode(auth_str.encode()).decode()
+        token_res = http_client("planqk").post(
+            "https://gateway.hub.kipu-quantum.com/token",
+            data={"grant_type": "client_credentials"},
+            headers={"Authorization": f"Basic {encoded_auth}"},
+            timeout=10.0
+        )
+        token_res.raise_for_status()
+        body = token_res.json()
+        return body.get("access_token"), float(body.get("expires_in", 300))
+
+    def _tokens(self) -> TokenManager:
+        secret_id = hashlib.sha256(self.secret_key.encode()).hexdigest()[:12]
+        return token_manager(("planqk", self.access_key, secret_id), self._fetch_token)
+
+    def _drop_token(self) -> None:
+        """The hub answered 401: forget the cached bearer token so the resend fetches a new one."""
+        if self.access_key and self.secret_key:
+            self._tokens().invalidate()
+
+    async def _auth_header(self) -> dict:
+        """PAT header, or a cached client-credentials bearer token (refreshed once, shortly before expiry)."""
         pat = os.environ.get("PLANQK_PERSONAL_ACCESS_TOKEN")
+        if pat:
+            return {"Authorization": f"Bearer {pat}"}
+        if not (self.access_key and self.secret_key):
+            raise PlanQKJobError("Missing PlanQK credentials (PAT or Key/Secret)")
+        try:
+            token = await self._tokens().token_async()
+        except Exception as e:
+            raise PlanQKJobError(f"PlanQK Auth Error: {str(e)}")
+        return {"Authorization": f"Bearer {token}"}
+
+    async def _planqk_solve_async(
+        self, batch: SCFTierBatch, budget: float, risk_tolerance: float, esg_min: float,
+        on_status: Optional[StatusCallback] = None
+    ):
+        """Solve on the PlanQK/Kipu hub without blocking: submit, back-off polling, fetch result."""
         if not self.service_url:
             return None, "Missing PLANQK_SERVICE_URL"
-            
-        auth_header = {}
-        if pat:
-            auth_header = {"Authorization": f"Bearer {pat}"}
-        elif self.access_key and self.secret_key:
-            # Traditional OAuth2 token request
-            try:
-                auth_str = f"{self.access_key}:{self.secret_key}"
-                encoded_auth = base64.b64encode(auth_str.encode()).decode()
-                with httpx.Client() as client:
-                    token_res = client.post(
-                        "https://gateway.hub.kipu-quantum.com/token",
-                        data={"grant_type": "client_credentials"},
-                        headers={"Authorization": f"Basic {encoded_auth}"},
-                        timeout=10.0
-                    )
-                    token_res.raise_for_status()
-                    token = token_res.json().get("access_token")
-                    auth_header = {"Authorization": f"Bearer {token}"}
-            except Exception as e:
-                return None, f"PlanQK Auth Error: {str(e)}"
-        else:
+        if not (os.environ.get("PLANQK_PERSONAL_ACCESS_TOKEN") or (self.access_key and self.secret_key)):
             return None, "Missing PlanQK credentials (PAT or Key/Secret)"
 
+        # Prepare tiers data for the service
+        tiers_data = [
+            {
+                "supplier_id": supplier_id,
+                "risk_score": risk_score,
+                "yield_pct": yield_pct,
+                "esg_score": esg_score
+            }
+            for supplier_id, risk_score, yield_pct, esg_score in zip(
+                batch.supplier_ids.tolist(),
+                batch.risk_score.tolist(),
+                batch.yield_pct.tolist(),
+                batch.esg_score.tolist()
+            )
+        ]
         try:
-            # Prepare tiers data for the service
-            tiers_data = [
-                {
-                    "supplier_id": t.supplier_id,
-                    "risk_score": float(t.risk_score),
-                    "yield_pct": float(t.yield_pct),
-                    "esg_score": float(t.esg_score)
-                }
-                for t in tiers
-            ]
-
-            with httpx.Client() as client:
-                # 1. Execute Service
-                payload = {
-                    "data": {
-                        "tiers": tiers_data,
-                        "budget": float(budget)
-                    },
-                    "params": {
-                        "risk_tolerance": float(risk_tolerance),
-                        "esg_min": float(esg_min)
-                    }
-                }
-                
-                # Ensure trailing slash for service URL as per docs
-                base_url = self.service_url if self.service_url.endswith("/") else f"{self.service_url}/"
-                
-                exec_res = client.post(
-                    base_url,
-                    json=payload,
-                    headers={**auth_header, "Content-Type": "application/json", "Accept": "application/json"},
-                    timeout=30.0
+            # An open breaker answers at once, so the sandbox is used without waiting out timeouts
+            with provider_health("planqk").guard():
+                # The token comes from the same gateway, so its failures and timeouts count too
+                await self._auth_header()
+                job_id, result_data = await self._client().run(
+                    {"tiers": tiers_data, "budget": float(budget)},
+                    {"risk_tolerance": float(risk_tolerance), "esg_min": float(esg_min)},
+                    on_status=on_status,
                 )
-                exec_res.raise_for_status()
-                exec_data = exec_res.json()
-                job_id = exec_data.get("id")
-                
-                # 2. Poll for result (Wait up to 30s for POC)
-                max_retries = 15
-                for i in range(max_retries):
-                    status_res = client.get(
-                        f"{base_url}{job_id}",
-                        headers={**auth_header, "Accept": "application/json"},
-                        timeout=10.0
-                    )
-                    status_res.raise_for_status()
-                    job_status = status_res.json().get("status")
-                    
-                    if job_status == "SUCCEEDED":
-                        result_res = client.get(
-                            f"{base_url}{job_id}/result",
-                            headers={**auth_header, "Accept": "application/json"},
-                            timeout=10.0
-                        )
-                        result_res.raise_for_status()
-                        result_data = result_res.json()
-                        # Extract bitstring/sample from result
-                        sample = result_data.get("sample") or result_data.get("result", {}).get("sample")
-                        # Handle potential string keys from JSON
-                        if sample:
-                            sample = {int(k) if isinstance(k, str) and k.isdigit() else k: v for k, v in sample.items()}
-                        return sample, f"Sovereign Quantum (Kipu Hub - Job {job_id})"
-                    
-                    if job_status in ["FAILED", "CANCELLED", "UNKNOWN"]:
-                        return None, f"Job {job_id} {job_status}"
-                        
-                    time.sleep(2) # Wait before next poll
-                    
-                return None, f"Job {job_id} timed out after {max_retries*2}s"
-                
+        except (CircuitOpenError, PlanQKJobError) as e:
+            return None, str(e)
         except Exception as e:
             return None, f"PlanQK Execution Error: {str(e)}"
 
-    def _simulated_fallback(self, Q: dict) -> tuple:
-        """Local Simulated Annealing - 'Berlin Sandbox' mode."""
+        # Extract bitstring/sample from result
+        sample = result_data.get("sample") or result_data.get("result", {}).get("sample")
+        # Handle potential string keys from JSON
+        if sample:
+            sample = {int(k) if isinstance(k, str) and k.isdigit() else k: v for k, v in sample.items()}
+        return sample, f"Sovereign Quantum (Kipu Hub - Job {job_id})"
+
+    def notify_job(self, job_id: str) -> None:
+        """Completion callback from the hub: re-check `job_id` now instead of at its next poll."""
+        for client in list(_hub_clients.values()):
+            client.notify(job_id)
+
+    def _planqk_solve_future(self, batch: SCFTierBatch, budget: float, risk_tolerance: float, esg_min: float):
+        """Start a hub solve on the shared http-io loop; cancelling the future cancels the job."""
+        return io_loop.submit(self._planqk_solve_async(batch, budget, risk_tolerance, esg_min))
+
+    def _simulated_fallback(self, model: QUBOModel, initial_state: Optional[np.ndarray] = None) -> tuple:
+        """Local Simulated Annealing - 'Berlin Sandbox' mode, on the presolved core of `model`; returns all reads."""
         try:
-            import neal
-            sampler = neal.SimulatedAnnealingSampler()
-            response = sampler.sample_qubo(Q, num_reads=50, seed=42)
-            return response.first.sample, "Simulated Quantum (Berlin Sandbox)"
+            presolved = presolve(model)
+            # Tuned schedule for the core; reads in adaptive rounds (up to 200) instead of a fixed 50
+            schedule = tuned_schedule(presolved.core)
+            sampler = AdaptiveSampler(local_sampler(schedule), first_reads=schedule.num_reads or 10, max_reads=200)
+            response = sampler.sample(presolved.core, seed=42, initial_state=presolved.restrict(initial_state))
+            warm = "" if initial_state is None else f", warm-started from {int(initial_state.sum())} previous picks"
+            states = presolved.expand_states(sample_states(response, presolved.core.num_variables))
+            return states, (
+                f"Simulated Quantum (Berlin Sandbox, {sampler.label}{warm})\n"
+                f"{schedule.describe()}\n{describe_sampling(response.info)}"
+            )
         except Exception as e:
             # Ultimate fallback
-            size = 0
-            if Q:
-                for k in Q.keys():
-                    if isinstance(k, tuple):
-                        size = max(size, k[0] + 1, k[1] + 1)
-            sample = {i: 1 for i in range(size)}
+            sample = {i: 1 for i in range(model.num_variables)}
             return sample, f"Greedy fallback: {str(e)}"
 
+    def _sandbox_solve(self, batch: SCFTierBatch, initial_state: Optional[np.ndarray] = None) -> tuple:
+        return self._simulated_fallback(self._build_qubo(batch), initial_state)
+
+    async def _hedged_solve(
+        self, batch: SCFTierBatch, budget: float, risk_tolerance: float, esg_min: float,
+        initial_state: Optional[np.ndarray] = None
+    ) -> tuple:
+        """
+        Start the hub job and the sandbox annealer together.
+
+        The hub result wins if it arrives within `hedge_sla_s`; after that the first
+        usable result wins, and a losing hub job is cancelled. Returns
+        (sample, method, remote_won, log); log names the winner, both finish times and
+        the margin (positive: how long the loser would have made the caller wait).
+        """
+        start = time.monotonic()
+        finished = {}
+
+        def timed(name, future):
+            future.add_done_callback(lambda _: finished.setdefault(name, time.monotonic() - start))
+            return future
+
+        remote = timed("remote", asyncio.wrap_future(self._planqk_solve_future(batch, budget, risk_tolerance, esg_min)))
+        local = timed("local", asyncio.wrap_future(_hedge_pool.submit(self._sandbox_solve, batch, initial_state)))
+
+        # Inside the SLA only the hub can end the race; past it, whichever leg lands first
+        done, _ = await asyncio.wait({remote}, timeout=self.hedge_sla_s)
+        if not done:
+            await asyncio.wait({remote, local}, return_when=asyncio.FIRST_COMPLETED)
+
+        remote_error = None
+        remote_done = remote.done()
+        if remote_done:
+            try:
+                sample, method = remote.result()
+            except Exception as e:
+                sample, method = None, f"PlanQK Execution Error: {str(e)}"
+            if sample:
+                winner, loser, payload, remote_won = "remote", "local", (sample, method), True
+            else:
+                remote_error = method
+        if not remote_done or remote_error is not None:
+            winner, loser, payload, remote_won = "local", "remote", await local, False
+        # Done-callbacks may still be in flight for the winner; its finish time is "now" then
+        won_at = finished.get(winner, time.monotonic() - start) * 1000
+        if loser in finished:
+            lost_at = finished[loser] * 1000
+            other = f"{loser} at {lost_at:.0f} ms, margin {lost_at - won_at:+.0f} ms"
+        else:
+            other = f"{loser} still running, ignored"
+        if not remote_done:
+            # The cancelled hub call is released, not recorded, by its breaker guard; count the
+            # SLA miss here so a hub that keeps hanging still opens the breaker
+            provider_health("planqk").record(False, time.monotonic() - start)
+        # Cancels a pending hub task, which stops polling and cancels the job on the hub
+        remote.cancel()
+        log = f"Hedge: {winner} won at {won_at:.0f} ms ({other}; SLA {self.hedge_sla_s * 1000:.0f} ms)\n"
+        if remote_error is not None:
+            log = f"PlanQK API Failed: {remote_error}. Sandbox result used.\n{log}"
+        elif not remote_won:
+            log = f"PlanQK API exceeded SLA. Sandbox result used.\n{log}"
+        return payload[0], payload[1], remote_won, log
+
     def optimize(
-        self, tiers: list[SCFTier], budget: float, risk_tolerance: float, esg_min: float
+        self, tiers: Union[SCFTierBatch, list[SCFTier]], budget: float, risk_tolerance: float, esg_min: float,
+        warm_start: Optional[dict] = None
+    ) -> OptimizationResult:
+        """Blocking wrapper around optimize_async for synchronous callers (runs on the shared http-io loop)."""
+        return io_loop.submit(self.optimize_async(tiers, budget, risk_tolerance, esg_min, warm_start)).result()
+
+    async def optimize_async(
+        self, tiers: Union[SCFTierBatch, list[SCFTier]], budget: float, risk_tolerance: float, esg_min: float,
+        warm_start: Optional[dict] = None
     ) -> OptimizationResult:
+        """
+        `warm_start` (a previous result's) seeds the sandbox annealer; the hub always solves cold.
+
+        Awaiting the hub holds no thread; the sandbox and the post-processing run on the hedge pool.
+        """
         start_time = time.time()
-        
-        # 1. Try PlanQK/Kipu REST API
-        sample, method = self._planqk_solve(tiers, budget, risk_tolerance, esg_min)
-        error_log = ""
-        
-        # 2. Fallback to Local Sandbox if API fails or credentials missing
-        if not sample:
-            error_log = f"PlanQK API Failed: {method}. Falling back to sandbox.\n"
-            self._use_fallback = True
-            Q = self._build_qubo(tiers)
-            sample, method = self._simulated_fallback(Q)
+        batch = SCFTierBatch.coerce(tiers)
+        initial_state = warm_state(batch.supplier_ids, warm_start)
+        loop = asyncio.get_running_loop()
+
+        if self.hedge:
+            # Per-call: the solver is shared by concurrent requests on the solver pool
+            sample, method, remote_won, error_log = await self._hedged_solve(batch, budget, risk_tolerance, esg_min, initial_state)
+            use_fallback = not remote_won
+        else:
+            # 1. Try PlanQK/Kipu REST API
+            sample, method = await asyncio.wrap_future(self._planqk_solve_future(batch, budget, risk_tolerance, esg_min))
+            error_log = ""
+            use_fallback = False
             
+            # 2. Fallback to Local Sandbox if API fails or credentials missing
+            if not sample:
+                error_log = f"PlanQK API Failed: {method}. Falling back to sandbox.\n"
+                use_fallback = True
+                sample, method = await loop.run_in_executor(_hedge_pool, self._sandbox_solve, batch, initial_state)
+
+        return await loop.run_in_executor(
+            _hedge_pool, self._result, batch, budget, risk_tolerance, esg_min,
+            sample, method, use_fallback, error_log, start_time
+        )
+
+    def _result(
+        self, batch: SCFTierBatch, budget: float, risk_tolerance: float, esg_min: float,
+        sample, method: str, use_fallback: bool, error_log: str, start_time: float
+    ) -> OptimizationResult:
+        """Post-process the winning sample into allocations and logs."""
+        # The sandbox returns its whole sample set (lowest energy first), the hub a single sample
+        states = sample if isinstance(sample, np.ndarray) else sample_row(sample, len(batch))
+        choice = postprocess(batch, states, risk_tolerance, esg_min)
         solve_time = (time.time() - start_time) * 1000
-        selected_indices = [i for i, v in sample.items() if v == 1]
-        
-        allocations = []
-        if not selected_indices:
-            selected_indices = [0]
-            
-        alloc_per_selected = 1.0 / len(selected_indices)
-        total_yield = 0.0
-        total_risk = 0.0
-        
-        for idx in selected_indices:
-            if idx < len(tiers):
-                tier = tiers[idx]
-                amt = alloc_per_selected * budget
-                allocations.append(Allocation(
-                    supplier_id=tier.supplier_id,
-                    allocated_amount=amt,
-                    expected_return=amt * tier.yield_pct / 100,
-                    risk_contribution=alloc_per_selected * tier.risk_score
-                ))
-                total_yield += amt * tier.yield_pct / 100
-                total_risk += alloc_per_selected * tier.risk_score
+        # The hub solves the Kipu formulation, the sandbox the local one; measure each against its own
+        model = qubo_compiler.compile(batch, "planqk" if use_fallback else "kipu")
+        opt_gap, gap_log = gap_report(model, choice.sample())
+        if use_fallback:
+            gap_log = f"{presolve(model).describe()}\n{gap_log}"
+        allocations = AllocationBatch.from_weights(batch, choice.indices, choice.weights, budget)
                 
         return OptimizationResult(
             allocations=allocations,
-            total_yield=total_yield,
-            total_risk=total_risk,
-            solver_type="Sovereign Quantum (Kipu Hub)" if not self._use_fallback else "Sandbox (EU Fallback)",
+            total_yield=allocations.total_yield,
+            total_risk=allocations.total_risk,
+            solver_type="Sovereign Quantum (Kipu Hub)" if not use_fallback else "Sandbox (EU Fallback)",
             solve_time_ms=solve_time,
-            solver_logs=f"{error_log}Method: {method}\nPlatform: PlanQK (Germany)",
+            solver_logs=f"{error_log}Method: {method}\nPlatform: PlanQK (Germany)\n{choice.describe(risk_tolerance, esg_min)}\n{gap_log}\n{provider_health('planqk').describe()}",
             confidence_score=99.7,
-            optimality_gap=0.03
+            optimality_gap=opt_gap,
+            warm_start={"selected": allocations.supplier_ids.tolist()}
         )
@@ -0,0 +1,120 @@
+"""Sample Post-Processing - best risk/ESG-feasible allocation from a solver's whole sample set."""
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from domain.entities import SCFTierBatch
+from .allocation_lp import solve_allocation_lp
+from .classical_solver import ClassicalSolver
+
+# Distinct subsets re-sized by the allocation LP (0 keeps equal weights)
+RESIZE_TOP_K = int(os.getenv("QUANTUM_RESIZE_TOP_K", "0"))
+
+
+def sample_states(response, num_variables: int) -> np.ndarray:
+    """SampleSet -> (reads, n) 0/1 states in variable order, lowest energy first."""
+    X = np.zeros((len(response), num_variables))
+    X[:, np.asarray(list(response.variables), dtype=np.int64)] = response.record.sample
+    return X[np.argsort(response.record.energy, kind="stable")]
+
+
+def sample_row(sample: dict, num_variables: int) -> np.ndarray:
+    """One {variable: 0/1} sample -> a (1, n) state."""
+    X = np.zeros((1, num_variables))
+    for i, v in sample.items():
+        if isinstance(i, (int, np.integer)) and 0 <= i < num_variables:
+            X[0, i] = v
+    return X
+
+
+@dataclass(frozen=True)
+class PostProcessed:
+    """Chosen allocation (supplier positions and budget weights) and how it was found."""
+    indices: np.ndarray
+    weights: np.ndarray
+    risk: float
+    esg: float
+    feasible: bool
+    resized: bool
+    distinct: int
+    num_feasible: int
+
+    def describe(self, risk_tolerance: float, esg_min: float) -> str:
+        found = f"{self.num_feasible} of {self.distinct} distinct samples feasible"
+        limits = f"risk {self.risk:.2f} vs {risk_tolerance:g}, ESG {self.esg:.2f} vs {esg_min:g}"
+        if not self.feasible:
+            return f"Post-processing: {found}; lowest-energy sample kept ({limits})"
+        how = "LP re-sized" if self.resized else "equal weights"
+        return f"Post-processing: {found}; {how} over {len(self.indices)} suppliers ({limits})"
+
+    def sample(self) -> dict:
+        """The chosen suppliers as a {variable: 1} sample, e.g. for gap_report."""
+        return dict.fromkeys(self.indices.tolist(), 1)
+
+
+def postprocess(
+    batch: SCFTierBatch,
+    samples: np.ndarray,
+    risk_tolerance: float,
+    esg_min: float,
+    top_k: Optional[int] = None,
+    tol: float = 1e-9,
+) -> PostProcessed:
+    """
+    Picks the allocation a quantum solver returns from all of its samples, not just the first.
+
+    `samples` is (reads, n) over the book's suppliers, lowest energy first. Every distinct
+    non-empty sample is priced at equal weights in one product with the (n, 3) matrix of
+    risk, ESG and risk-adjusted yield (the classical LP's objective); those within
+    `risk_tolerance` and `esg_min` compete on yield. With `top_k` (default
+    QUANTUM_RESIZE_TOP_K) the k best subsets are also re-weighted by the three-row
+    allocation LP restricted to their suppliers, which can also rescue subsets that
+    equal weights leave infeasible. If nothing is feasible the lowest-energy sample is
+    kept at equal weights, as before.
+    """
+    top_k = RESIZE_TOP_K if top_k is None else top_k
+    n = len(batch)
+    X = np.asarray(samples) > 0.5
+    # Distinct rows, keeping the energy order of their first occurrence
+    _, first = np.unique(X, axis=0, return_index=True)
+    X = X[np.sort(first)]
+    X = X[X.any(axis=1)]
+    if not len(X):
+        X = np.zeros((1, n), dtype=bool)
+        X[0, 0] = True
+
+    objective = ClassicalSolver._objective(batch)
+    W = X / X.sum(axis=1, keepdims=True)
+    risk, esg, value = (W @ np.column_stack([batch.risk_score, batch.esg_score, objective])).T
+    scale = max(1.0, abs(risk_tolerance), abs(esg_min))
+    feasible = (risk <= risk_tolerance + tol * scale) & (esg >= esg_min - tol * scale)
+
+    best = None
+    if feasible.any():
+        row = int(np.flatnonzero(feasible)[np.argmax(value[feasible])])
+        best = (value[row], np.flatnonzero(X[row]), W[row, X[row]], risk[row], esg[row], False)
+
+    # Feasible subsets first, then the rest, each by equal-weight yield
+    for row in np.lexsort((-value, ~feasible))[:top_k].tolist():
+        members = np.flatnonzero(X[row])
+        solution = solve_allocation_lp(
+            objective[members], batch.risk_score[members], batch.esg_score[members], risk_tolerance, esg_min
+        )
+        if solution.status != "Optimal" or (best is not None and solution.objective <= best[0] + tol):
+            continue
+        used = solution.weights > 0
+        weights = solution.weights[used]
+        best = (
+            solution.objective, members[used], weights,
+            float(weights @ batch.risk_score[members[used]]), float(weights @ batch.esg_score[members[used]]), True,
+        )
+
+    if best is None:
+        members = np.flatnonzero(X[0])
+        return PostProcessed(members, W[0, X[0]], float(risk[0]), float(esg[0]), False, False, len(X), 0)
+    _, indices, weights, best_risk, best_esg, resized = best
+    return PostProcessed(
+        indices, weights, float(best_risk), float(best_esg), True, resized, len(X), int(feasible.sum())
+    )
@@ -0,0 +1,235 @@
+"""QUBO Presolve - persistency fixing and duplicate-supplier capping ahead of sampling."""
+import os
+import threading
+import weakref
+from dataclasses import dataclass, field
+from typing import Optional
+
+import numpy as np
+
+from .qubo import QUBOModel
+
+# Roof duality runs a max-flow over every coupling; past this it costs more than it saves
+ROOF_MAX_INTERACTIONS = 250_000
+MAX_ROUNDS = 50
+
+
+@dataclass(frozen=True, eq=False)
+class PresolvedModel:
+    """
+    A QUBO split into fixed variables and the `core` still to be sampled.
+
+    Core variable k is original variable `free[k]`; `values` holds the fixed value of
+    every other variable (-1 where free). The core carries the couplings of fixed-at-1
+    variables in its linear terms, so core energy + `offset` is the full model's energy,
+    and any optimum of the core expands to an optimum of the full model.
+    """
+    model: QUBOModel
+    core: QUBOModel
+    free: np.ndarray              # int64 (m,)
+    values: np.ndarray            # int8 (n,)
+    offset: float = 0.0
+    fixed_by: dict = field(default_factory=dict)
+
+    @property
+    def num_fixed(self) -> int:
+        return self.model.num_variables - self.core.num_variables
+
+    def expand(self, core_sample: dict) -> dict:
+        """{core variable: 0/1} -> {original variable: 0/1}, fixed variables filled in."""
+        sample = {i: int(v) for i, v in enumerate(self.values.tolist()) if v >= 0}
+        free = self.free.tolist()
+        sample.update((free[k], v) for k, v in core_sample.items() if 0 <= k < len(free))
+        return sample
+
+    def expand_states(self, core_states: np.ndarray) -> np.ndarray:
+        """(reads, m) core states -> (reads, n) full states."""
+        states = np.tile(np.maximum(self.values, 0).astype(np.float64), (len(core_states), 1))
+        states[:, self.free] = core_states
+        return states
+
+    def restrict(self, state: Optional[np.ndarray]) -> Optional[np.ndarray]:
+        """Full (n,) state (e.g. a warm start) -> its core part."""
+        return None if state is None else np.asarray(state)[self.free]
+
+    def describe(self) -> str:
+        n, m = self.model.num_variables, self.core.num_variables
+        if not self.num_fixed:
+            return f"Presolve: {n} variables, none fixed"
+        rules = ", ".join(f"{count} by {rule}" for rule, count in self.fixed_by.items() if count)
+        return f"Presolve: {n} -> {m} variables ({rules})"
+
+
+def _duplicate_groups(model: QUBOModel) -> list[tuple[np.ndarray, float]]:
+    """
+    Sets of interchangeable variables with the coupling w between any two of them.
+
+    Only models whose couplings are entirely described by `uniform_coupling` and the
+    block/window hints qualify: there, equal linear terms and equal hint keys mean
+    identical coupling rows (same tier, region and risk in the book).
+    """
+    n = model.num_variables
+    residual = model.values.astype(np.float64)
+    columns = [model.linear]
+    intra = model.uniform_coupling
+    for codes, weight in model.blocks:
+        codes = np.asarray(codes)
+        residual -= weight * (codes[model.rows] == codes[model.cols])
+        columns.append(np.unique(codes, return_inverse=True)[1])
+        intra += weight
+    for keys, band, weight in model.windows:
+        keys = np.asarray(keys, dtype=np.float64)
+        residual -= weight * (np.abs(keys[model.rows] - keys[model.cols]) < band)
+        columns.append(keys)
+        intra += weight if band > 0 else 0.0
+    scale = max(1.0, float(np.abs(model.values).max(initial=0.0)))
+    if n < 2 or (np.abs(residual) > 1e-9 * scale).any():
+        return []
+
+    _, inverse, counts = np.unique(np.column_stack(columns), axis=0, return_inverse=True, return_counts=True)
+    inverse = inverse.ravel()
+    order = np.argsort(inverse, kind="stable")
+    starts = np.concatenate([[0], np.cumsum(counts)])
+    return [(order[starts[g]:starts[g + 1]], intra) for g in np.flatnonzero(counts > 1)]
+
+
+class _Fixer:
+    """Running state of the presolve: fixed values plus the effective linear terms and coupling bounds."""
+
+    def __init__(self, model: QUBOModel):
+        self.model = model
+        self.values = np.full(model.num_variables, -1, dtype=np.int8)
+        # Symmetric couplings, and their negative / positive parts, as CSR for one matvec per bound
+        upper = model.coupling_matrix
+        self.Q = (upper + upper.T).tocsr()
+        self.Q_low, self.Q_high = self.Q.copy(), self.Q.copy()
+        self.Q_low.data = np.minimum(self.Q.data, 0)
+        self.Q_high.data = np.maximum(self.Q.data, 0)
+
+    def bounds(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Per variable: linear term with fixed-at-1 neighbours folded in, and the most
+        negative / most positive total coupling it can still see from free neighbours.
+        """
+        u = self.model.uniform_coupling
+        free, one = (self.values < 0).astype(np.float64), (self.values == 1).astype(np.float64)
+        others = max(int(free.sum()) - 1, 0)
+        linear = self.model.linear + u * one.sum() + self.Q @ one
+        low = self.Q_low @ free + min(u, 0.0) * others
+        high = self.Q_high @ free + max(u, 0.0) * others
+        return linear, low, high
+
+    def persistency(self) -> int:
+        """
+        x_i = 0 when switching it on can never lower the energy (linear + most negative
+        coupling >= 0), x_i = 1 when switching it off never can (linear + most positive <= 0).
+        """
+        linear, low, high = self.bounds()
+        free = self.values < 0
+        off = free & (linear + low >= 0)
+        on = free & ~off & (linear + high <= 0)
+        self.values[off], self.values[on] = 0, 1
+        return int(off.sum() + on.sum())
+
+    def duplicates(self, groups: list) -> int:
+        """
+        Caps each set of k interchangeable variables. Their selected copies can always be
+        taken to be the first ones, and the t-th copy adds linear + (t-1) w + (coupling to
+        the rest). Copies whose addition can never be negative are fixed at 0, copies
+        whose addition can never be positive at 1.
+        """
+        linear, low, high = self.bounds()
+        fixed = 0
+        for members, w in groups:
+            members = members[self.values[members] < 0]
+            k = len(members)
+            if k < 2 or w <= 0:
+                continue
+            head = members[0]
+            sparse = w - self.model.uniform_coupling
+            low_rest = low[head] - (k - 1) * (min(sparse, 0.0) + min(self.model.uniform_coupling, 0.0))
+            high_rest = high[head] - (k - 1) * (max(sparse, 0.0) + max(self.model.uniform_coupling, 0.0))
+            keep = int(np.clip(np.ceil(-(linear[head] + low_rest) / w), 0, k))
+            reach = -(linear[head] + high_rest) / w
+            forced = min(int(np.clip(np.floor(reach) + 1, 0, k)) if reach >= 0 else 0, keep)
+            self.values[members[keep:]] = 0
+            self.values[members[:forced]] = 1
+            fixed += k - keep + forced
+        return fixed
+
+    def roof_duality(self) -> int:
+        """Strong persistencies of the current core from roof duality (dwave-preprocessing)."""
+        try:
+            from dwave.preprocessing import roof_duality
+        except ImportError:
+            return 0
+        m, free = self.model, self.values < 0
+        count = int(free.sum())
+        interactions = count * (count - 1) // 2 if m.uniform_coupling else int((free[m.rows] & free[m.cols]).sum())
+        if not count or interactions > ROOF_MAX_INTERACTIONS:
+            return 0
+        core, free = self.core()
+        _, assignment = roof_duality(core.to_bqm(), strict=True)
+        for k, v in assignment.items():
+            self.values[free[k]] = v
+        return len(assignment)
+
+    def core(self) -> tuple[QUBOModel, np.ndarray]:
+        m = self.model
+        free = np.flatnonzero(self.values < 0)
+        if len(free) == m.num_variables:
+            return m, free
+        linear, _, _ = self.bounds()
+        core = m.submodel(free, linear[free])
+        return core, free
+
+
+_presolved: "weakref.WeakKeyDictionary[QUBOModel, PresolvedModel]" = weakref.WeakKeyDictionary()
+_presolved_lock = threading.Lock()
+
+
+def presolve(model: QUBOModel) -> PresolvedModel:
+    """
+    Fixes every variable whose optimal value is forced and returns the reduced core.
+
+    Cheap persistency and duplicate rules run to a fixpoint; roof duality then fixes
+    what they could not, and the cheap rules get one more pass. The core keeps the
+    uniform coupling and block/window hints, so the vectorised annealer's kernels still
+    apply. Cached per (cached, immutable) model; QUBO_PRESOLVE=0 returns the model as is.
+    """
+    n = model.num_variables
+    if os.getenv("QUBO_PRESOLVE", "1").strip().lower() in ("0", "false", "no"):
+        return PresolvedModel(model, model, np.arange(n), np.full(n, -1, dtype=np.int8))
+    with _presolved_lock:
+        presolved = _presolved.get(model)
+    if presolved is not None:
+        return presolved
+
+    fixer = _Fixer(model)
+    groups = _duplicate_groups(model)
+    fixed_by = {"persistency": 0, "duplicate capping": 0, "roof duality": 0}
+
+    def cheap_rules() -> None:
+        for _ in range(MAX_ROUNDS):
+            fixed = fixer.persistency()
+            fixed_by["persistency"] += fixed
+            capped = fixer.duplicates(groups) if groups else 0
+            fixed_by["duplicate capping"] += capped
+            if not fixed + capped:
+                break
+
+    cheap_rules()
+    fixed_by["roof duality"] = fixer.roof_duality()
+    if fixed_by["roof duality"]:
+        cheap_rules()
+
+    core, free = fixer.core()
+    one = fixer.values == 1
+    ones = int(one.sum())
+    offset = float(model.linear[one].sum()) + model.uniform_coupling * ones * (ones - 1) / 2
+    offset += float(model.values[one[model.rows] & one[model.cols]].sum())
+    presolved = PresolvedModel(model, core, free, fixer.values, offset, fixed_by)
+
+    with _presolved_lock:
+        _presolved[model] = presolved
+    return presolved
@@ -0,0 +1,289 @@
+"""QUBO Compilation - Array-native QUBO models shared by all annealing providers."""
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Union
+
+import numpy as np
+import scipy.sparse as sp
+
+from domain.entities import SCFTier, SCFTierBatch
+
+
+@dataclass(frozen=True, eq=False)
+class QUBOModel:
+    """
+    Binary quadratic model over variables 0..n-1.
+
+    Energy(x) = linear . x + sum_{i<j} (values_ij + uniform_coupling) * x_i * x_j
+
+    Couplings are stored as upper-triangle COO arrays (rows < cols). A penalty that
+    applies to every pair (e.g. a concentration penalty) is kept as the scalar
+    `uniform_coupling` so the n^2 pairs are only materialised when a sampler needs them.
+
+    `blocks` and `windows` are optional structure hints describing where `values` came from:
+      blocks:  (codes, weight)        -> every i<j pair with codes_i == codes_j carries weight
+      windows: (keys, band, weight)   -> every i<j pair with |keys_i - keys_j| < band carries weight
+    The pairs are still present in `values`; the hints let the vectorised annealer price
+    them from group counts / sorted prefix sums instead of per pair.
+    """
+    formulation: str
+    linear: np.ndarray            # float64 (n,)
+    rows: np.ndarray              # int32 (nnz,)
+    cols: np.ndarray              # int32 (nnz,)
+    values: np.ndarray            # float64 (nnz,)
+    uniform_coupling: float = 0.0
+    blocks: tuple = ()
+    windows: tuple = ()
+
+    @property
+    def num_variables(self) -> int:
+        return len(self.linear)
+
+    @property
+    def num_interactions(self) -> int:
+        n = self.num_variables
+        if self.uniform_coupling:
+            return n * (n - 1) // 2
+        return len(self.values)
+
+    @property
+    def coupling_matrix(self) -> sp.csr_matrix:
+        """Sparse (non-uniform) couplings as an upper-triangular n x n CSR matrix."""
+        n = self.num_variables
+        return sp.csr_matrix((self.values, (self.rows, self.cols)), shape=(n, n))
+
+    def pair_arrays(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """All i<j couplings as (rows, cols, values), with the uniform term expanded."""
+        if not self.uniform_coupling:
+            return self.rows, self.cols, self.values
+        n = self.num_variables
+        rows, cols = np.triu_indices(n, 1)
+        rows, cols = rows.astype(np.int32), cols.astype(np.int32)
+        values = np.full(len(rows), self.uniform_coupling, dtype=np.float64)
+        if len(self.values):
+            # triu_indices is row-major, so flat keys are already sorted
+            keys = rows.astype(np.int64) * n + cols
+            pos = np.searchsorted(keys, self.rows.astype(np.int64) * n + self.cols)
+            np.add.at(values, pos, self.values)
+        return rows, cols, values
+
+    def energies(self, states) -> np.ndarray:
+        """Energy of one (n,) or many (reads, n) binary states."""
+        X = np.atleast_2d(np.asarray(states, dtype=np.float64))
+        energy = X @ self.linear
+        if len(self.values):
+            energy += np.einsum('ij,ij->i', (self.coupling_matrix @ X.T).T, X)
+        if self.uniform_coupling:
+            k = X.sum(axis=1)
+            energy += self.uniform_coupling * k * (k - 1) / 2
+        return energy
+
+    def to_bqm(self):
+        """dimod BinaryQuadraticModel built straight from the arrays (for neal / Leap)."""
+        import dimod
+        rows, cols, values = self.pair_arrays()
+        return dimod.BinaryQuadraticModel.from_numpy_vectors(
+            self.linear, (rows, cols, values), 0.0, dimod.BINARY
+        )
+
+    def submodel(self, keep: np.ndarray, linear: np.ndarray) -> "QUBOModel":
+        """
+        Model over the sorted variables `keep` (renumbered 0..len(keep)-1) with linear terms
+        `linear`, e.g. with the couplings of variables fixed at 1 already folded in. The
+        uniform coupling and block/window hints carry over, so annealer kernels still apply.
+        """
+        index = np.full(self.num_variables, -1, dtype=np.int64)
+        index[keep] = np.arange(len(keep))
+        inside = (index[self.rows] >= 0) & (index[self.cols] >= 0)
+        return QUBOModel(
+            self.formulation,
+            np.asarray(linear, dtype=np.float64),
+            index[self.rows[inside]].astype(np.int32),
+            index[self.cols[inside]].astype(np.int32),
+            self.values[inside],
+            uniform_coupling=self.uniform_coupling,
+            blocks=tuple((np.asarray(codes)[keep], weight) for codes, weight in self.blocks),
+            windows=tuple((np.asarray(keys)[keep], band, weight) for keys, band, weight in self.windows),
+        )
+
+    def to_dict(self) -> dict:
+        """Legacy {(i, j): bias} form for callers that still work on dict QUBOs."""
+        Q = {(i, i): q for i, q in enumerate(self.linear.tolist())}
+        rows, cols, values = self.pair_arrays()
+        Q.update(zip(zip(rows.tolist(), cols.tolist()), values.tolist()))
+        return Q
+
+
+def _group_pairs(codes: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """All i<j pairs sharing a group code. Buckets by a stable sort, then emits each bucket's triangle."""
+    order = np.argsort(codes, kind='stable')
+    ranked = codes[order]
+    bounds = np.flatnonzero(ranked[1:] != ranked[:-1]) + 1
+    rows, cols = [], []
+    for members in np.split(order, bounds):
+        if len(members) < 2:
+            continue
+        a, b = np.triu_indices(len(members), 1)
+        # stable sort keeps members ascending, so a < b maps to row < col
+        rows.append(members[a])
+        cols.append(members[b])
+    if not rows:
+        return np.array([], dtype=np.int64), np.array([], dtype=np.int64)
+    return np.concatenate(rows), np.concatenate(cols)
+
+
+def _window_pairs(values: np.ndarray, band: float) -> tuple[np.ndarray, np.ndarray]:
+    """All i<j pairs with |values_i - values_j| < band, via a sliding window over the sorted values."""
+    order = np.argsort(values, kind='stable')
+    ranked = values[order]
+    # Slightly generous window end, then filter with the exact predicate below
+    ends = np.searchsorted(ranked, np.nextafter(ranked + band, np.inf), side='right')
+    counts = ends - np.arange(len(ranked)) - 1
+    left = np.repeat(np.arange(len(ranked)), counts)
+    right = left + 1 + (np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts))
+    i, j = order[left], order[right]
+    keep = np.abs(values[i] - values[j]) < band
+    i, j = i[keep], j[keep]
+    return np.minimum(i, j), np.maximum(i, j)
+
+
+def _sum_pairs(n: int, *terms: tuple) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Merge (rows, cols, weight) pair lists into one sorted upper-triangle COO, summing
+    weights where pairs overlap (e.g. same tier AND correlated risk).
+    """
+    keys = np.concatenate([rows.astype(np.int64) * n + cols for rows, cols, _ in terms])
+    weights = np.concatenate([np.full(len(rows), w, dtype=np.float64) for rows, _, w in terms])
+    keys, inverse = np.unique(keys, return_inverse=True)
+    summed = np.bincount(inverse, weights=weights, minlength=len(keys)).astype(np.float64)
+    return (keys // n).astype(np.int32), (keys % n).astype(np.int32), summed
+
+
+def _no_pairs():
+    return np.array([], dtype=np.int32), np.array([], dtype=np.int32), np.array([], dtype=np.float64)
+
+
+def dwave_qubo(batch: SCFTierBatch, penalty: float = 500.0) -> QUBOModel:
+    """Simple max-yield min-risk formulation with a flat concentration penalty."""
+    n = len(batch)
+    linear = -batch.yield_pct + 0.5 * batch.risk_score
+    return QUBOModel("dwave", linear, *_no_pairs(), uniform_coupling=penalty / n if n else 0.0)
+
+
+def planqk_qubo(
+    batch: SCFTierBatch,
+    diversity_penalty: float = 500.0,
+    correlation_penalty: float = 1200.0,
+    correlation_band: float = 5.0,
+) -> QUBOModel:
+    """
+    HOBO-inspired formulation: ESG is priced as an insurance premium on the diagonal,
+    and pairs in the same tier or with |risk_i - risk_j| < band share a cluster penalty.
+    """
+    n = len(batch)
+    # 1. Node weighting: yield, risk and ESG compliance arbitrage
+    esg_compliance_value = (batch.esg_score - 50) * 0.1
+    yield_term = -batch.yield_pct
+    risk_term = 0.4 * batch.risk_score
+    linear = yield_term + risk_term - esg_compliance_value
+
+    # 2. Systemic cluster risk: same-tier buckets plus a risk window, built in
+    # O(n log n + nnz) without visiting uncorrelated pairs
+    rows, cols, penalty = _sum_pairs(
+        n,
+        (*_group_pairs(batch.tier), diversity_penalty),
+        (*_window_pairs(batch.risk_score, correlation_band), correlation_penalty),
+    )
+    return QUBOModel(
+        "planqk", linear, rows, cols, penalty / n,
+        blocks=((batch.tier, diversity_penalty / max(n, 1)),),
+        windows=((batch.risk_score, correlation_band, correlation_penalty / max(n, 1)),),
+    )
+
+
+def ibm_qubo(batch: SCFTierBatch, region_penalty: float = 4.5, tier_penalty: float = 1.5) -> QUBOModel:
+    """
+    Regional HOBO layer: ESG 'Sovereign Buffer' on the diagonal, penalties for pairs
+    sharing a region (supplier_id prefix before '_') or a tier.
+    """
+    n = len(batch)
+    esg_buffer = (batch.esg_score - 50) * 0.3
+    linear = -batch.yield_pct + (0.15 * batch.risk_score) - esg_buffer
+
+    _, region = np.unique([s.split('_')[0] for s in batch.supplier_ids.tolist()], return_inverse=True)
+    rows, cols, penalty = _sum_pairs(
+        n,
+        (*_group_pairs(region), region_penalty),
+        (*_group_pairs(batch.tier), tier_penalty),
+    )
+    return QUBOModel(
+        "ibm", linear, rows, cols, penalty,
+        blocks=((region, region_penalty), (batch.tier, tier_penalty)),
+    )
+
+
+def kipu_qubo(batch: SCFTierBatch, penalty: float = 800.0) -> QUBOModel:
+    """Mirror of the Kipu-hosted service formulation (ESG-weighted objective, flat penalty)."""
+    n = len(batch)
+    linear = -batch.yield_pct + (0.5 * batch.risk_score) - batch.esg_score / 100.0
+    return QUBOModel("kipu", linear, *_no_pairs(), uniform_coupling=penalty / n if n else 0.0)
+
+
+FORMULATIONS: dict[str, Callable[..., QUBOModel]] = {
+    "dwave": dwave_qubo,
+    "planqk": planqk_qubo,
+    "ibm": ibm_qubo,
+    "kipu": kipu_qubo,
+}
+
+
+class QUBOCompiler:
+    """
+    Compiles tier batches into QUBOModels and keeps a bounded LRU of the results,
+    keyed by (batch content hash, formulation, params). Re-running the same book
+    through another solve (or another provider with the same formulation) skips
+    construction entirely. Models are immutable, so cached instances are shared.
+    """
+
+    def __init__(self, max_entries: int = 32):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[tuple, QUBOModel]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def compile(self, tiers: Union[SCFTierBatch, list[SCFTier]], formulation: str, **params) -> QUBOModel:
+        if formulation not in FORMULATIONS:
+            raise ValueError(f"Unknown QUBO formulation: {formulation}")
+        batch = SCFTierBatch.coerce(tiers)
+        key = (batch.content_hash(), formulation, tuple(sorted(params.items())))
+
+        with self._lock:
+            model = self._entries.get(key)
+            if model is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return model
+            self.misses += 1
+
+        model = FORMULATIONS[formulation](batch, **params)
+        with self._lock:
+            self._entries[key] = model
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return model
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._entries), "max_entries": self.max_entries, "hits": self.hits, "misses": self.misses}
+
+
+# Shared across solver instances (solvers are constructed per request)
+qubo_compiler = QUBOCompiler(max_entries=int(os.getenv("QUBO_CACHE_SIZE", "32")))
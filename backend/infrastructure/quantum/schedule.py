@@ -0,0 +1,216 @@
+"""Annealing Schedules - sweeps, beta range and reads tuned offline, looked up by problem size and density."""
+import json
+import math
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from .qubo import QUBOModel
+from .annealer import annealer_backend, local_sampler
+
+# Lookup table written by scripts/tune_anneal_schedules.py (ANNEAL_SCHEDULES overrides the path)
+SCHEDULES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "anneal_schedules.json")
+# In the lookup, a density difference of 1/DENSITY_WEIGHT counts as much as doubling the variable count
+DENSITY_WEIGHT = 4.0
+
+
+@dataclass(frozen=True)
+class AnnealSchedule:
+    """Annealer parameters for one problem; None keeps the sampler's (or the caller's) own default."""
+    num_sweeps: Optional[int] = None
+    beta_scale: tuple = (1.0, 1.0)       # multipliers on the model's default (hot, cold) betas
+    num_reads: Optional[int] = None
+    source: str = "default"
+
+    def describe(self) -> str:
+        if self.num_sweeps is None and self.num_reads is None:
+            return "Schedule: sampler defaults"
+        hot, cold = self.beta_scale
+        return f"Schedule: {self.num_sweeps} sweeps, beta x({hot:g}, {cold:g}), {self.num_reads} reads ({self.source})"
+
+
+def density(model: QUBOModel) -> float:
+    """Share of the n(n-1)/2 variable pairs that carry a coupling."""
+    n = model.num_variables
+    pairs = n * (n - 1) // 2
+    return model.num_interactions / pairs if pairs else 0.0
+
+
+@dataclass(frozen=True)
+class Trial:
+    """One (sweeps, beta scale, reads) grid point measured on one problem."""
+    num_sweeps: int
+    beta_scale: tuple
+    num_reads: int
+    time_ms: float
+    success: float      # probability that one call with num_reads reads reaches the target energy
+
+    @property
+    def ttt_ms(self) -> float:
+        """Time to target: expected time to reach the target with 99% probability by repeating the call."""
+        if self.success >= 0.99:
+            return self.time_ms
+        if self.success <= 0:
+            return math.inf
+        return self.time_ms * math.log(0.01) / math.log(1 - self.success)
+
+
+def pareto_front(trials: list) -> list:
+    """The trials no other trial beats on both call time and success probability, fastest first."""
+    front, best = [], -1.0
+    for trial in sorted(trials, key=lambda t: (t.time_ms, -t.success)):
+        if trial.success > best:
+            front.append(trial)
+            best = trial.success
+    return front
+
+
+def time_to_target(
+    model: QUBOModel,
+    sweeps: tuple,
+    beta_scales: tuple,
+    reads: tuple,
+    target_gap: float = 1e-3,
+    reference: Optional[float] = None,
+    backend: Optional[str] = None,
+    seed: int = 42,
+) -> list:
+    """
+    Runs every (sweeps, beta scale, reads) combination once on `model` and returns its Trials.
+
+    The target is `reference` (e.g. an exact ground state) or else the best energy any run
+    found, plus `target_gap` of its magnitude. Reads are independent, so a grid point's
+    per-read hit rate is pooled over its runs at every read count; the success probability
+    of a call with r reads is 1 - (1 - rate)^r, and its time is the measured wall time.
+    """
+    backend = backend or annealer_backend()
+    # First call pays one-off costs (imports, worker start-up) that no grid point should carry
+    local_sampler(backend=backend).sample(model, num_reads=2, seed=seed)
+
+    runs = []
+    for num_sweeps in sweeps:
+        for scale in beta_scales:
+            sampler = local_sampler(AnnealSchedule(num_sweeps, tuple(scale)), backend=backend)
+            for r, num_reads in enumerate(reads):
+                start = time.perf_counter()
+                response = sampler.sample(model, num_reads=num_reads, seed=seed + r)
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                energies = np.repeat(response.record.energy, response.record.num_occurrences)
+                runs.append((num_sweeps, tuple(scale), num_reads, elapsed_ms, energies))
+
+    best = min(float(e.min(initial=0.0)) for *_, e in runs) if reference is None else reference
+    threshold = best + target_gap * max(abs(best), 1e-9) + 1e-9
+    rates = {}
+    for num_sweeps, scale, _, _, energies in runs:
+        hits, total = rates.get((num_sweeps, scale), (0, 0))
+        rates[(num_sweeps, scale)] = (hits + int((energies <= threshold).sum()), total + len(energies))
+    trials = []
+    for num_sweeps, scale, num_reads, elapsed_ms, _ in runs:
+        hits, total = rates[(num_sweeps, scale)]
+        success = 1 - (1 - hits / total) ** num_reads if total else 0.0
+        trials.append(Trial(num_sweeps, scale, num_reads, elapsed_ms, success))
+    return trials
+
+
+@dataclass(frozen=True)
+class ScheduleEntry:
+    """Tuned schedule of one benchmark problem, with its measured Pareto front."""
+    backend: str
+    formulation: str
+    num_variables: int
+    density: float
+    schedule: AnnealSchedule
+    ttt_ms: float
+    front: tuple = ()    # (num_sweeps, hot, cold, num_reads, time_ms, success) per front trial
+
+    @classmethod
+    def from_trials(cls, model: QUBOModel, trials: list, backend: str) -> "ScheduleEntry":
+        """The trial with the lowest time to target; it always lies on the Pareto front."""
+        front = pareto_front(trials)
+        best = min(front, key=lambda t: t.ttt_ms)
+        d = density(model)
+        schedule = AnnealSchedule(
+            best.num_sweeps, best.beta_scale, best.num_reads,
+            f"tuned on {model.formulation} n={model.num_variables}, density {d:.2f}",
+        )
+        return cls(
+            backend, model.formulation, model.num_variables, d, schedule, best.ttt_ms,
+            tuple((t.num_sweeps, *t.beta_scale, t.num_reads, round(t.time_ms, 2), round(t.success, 4)) for t in front),
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "backend": self.backend,
+            "formulation": self.formulation,
+            "num_variables": self.num_variables,
+            "density": round(self.density, 6),
+            "num_sweeps": self.schedule.num_sweeps,
+            "beta_scale": list(self.schedule.beta_scale),
+            "num_reads": self.schedule.num_reads,
+            "ttt_ms": round(self.ttt_ms, 2) if math.isfinite(self.ttt_ms) else None,
+            "front": [list(point) for point in self.front],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ScheduleEntry":
+        source = f"tuned on {data['formulation']} n={data['num_variables']}, density {data['density']:.2f}"
+        schedule = AnnealSchedule(data["num_sweeps"], tuple(data["beta_scale"]), data["num_reads"], source)
+        ttt = data.get("ttt_ms")
+        return cls(
+            data["backend"], data["formulation"], data["num_variables"], data["density"], schedule,
+            math.inf if ttt is None else ttt, tuple(tuple(point) for point in data.get("front", ())),
+        )
+
+
+@dataclass(frozen=True)
+class ScheduleTable:
+    """
+    Lookup model from problem shape to annealing schedule: the tuned entry nearest in
+    (log2 variables, DENSITY_WEIGHT * density) among those measured on the same backend.
+    """
+    entries: tuple = ()
+
+    def lookup(self, model: QUBOModel, backend: Optional[str] = None) -> AnnealSchedule:
+        backend = backend or annealer_backend()
+        candidates = [e for e in self.entries if e.backend == backend]
+        if not candidates:
+            return AnnealSchedule()
+        size, d = math.log2(max(model.num_variables, 1)), density(model)
+        nearest = min(
+            candidates,
+            key=lambda e: abs(math.log2(max(e.num_variables, 1)) - size) + DENSITY_WEIGHT * abs(e.density - d),
+        )
+        return nearest.schedule
+
+    def save(self, path: str) -> None:
+        with open(path, "w") as f:
+            json.dump({"entries": [e.to_dict() for e in self.entries]}, f, indent=1)
+            f.write("\n")
+
+    @classmethod
+    def load(cls, path: str) -> "ScheduleTable":
+        """Missing file -> empty table, so every lookup keeps the sampler defaults."""
+        if not os.path.exists(path):
+            return cls()
+        with open(path) as f:
+            return cls(tuple(ScheduleEntry.from_dict(e) for e in json.load(f).get("entries", [])))
+
+
+_tables: dict = {}
+_tables_lock = threading.Lock()
+
+
+def tuned_schedule(model: QUBOModel, backend: Optional[str] = None) -> AnnealSchedule:
+    """Schedule for `model` from the tuned table (ANNEAL_SCHEDULES); ANNEAL_AUTOTUNE=0 keeps the defaults."""
+    if os.getenv("ANNEAL_AUTOTUNE", "1") == "0":
+        return AnnealSchedule()
+    path = os.getenv("ANNEAL_SCHEDULES", SCHEDULES_PATH)
+    with _tables_lock:
+        table = _tables.get(path)
+        if table is None:
+            table = _tables[path] = ScheduleTable.load(path)
+    return table.lookup(model, backend)
@@ -1,6 +1,7 @@
 """Solver Port - Interface for optimization solvers."""
 from abc import ABC, abstractmethod
-from domain.entities import SCFTier, OptimizationResult
+from typing import Union
+from domain.entities import SCFTier, SCFTierBatch, OptimizationResult
 
 
 class SolverPort(ABC):
@@ -9,7 +10,7 @@ class SolverPort(ABC):
     @abstractmethod
     def optimize(
         self,
-        tiers: list[SCFTier],
+        tiers: Union[SCFTierBatch, list[SCFTier]],
         budget: float,
         risk_tolerance: float,
         esg_min: float
@@ -18,7 +19,8 @@ class SolverPort(ABC):
         Optimize allocation across supply chain tiers.
         
         Args:
-            tiers: List of SCF tiers to allocate across
+            tiers: SCFTierBatch (or list of SCF tiers) to allocate across;
+                implementations normalise with SCFTierBatch.coerce()
             budget: Total budget to allocate
             risk_tolerance: Maximum acceptable risk (0-100)
             esg_min: Minimum ESG score threshold
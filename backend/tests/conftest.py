@@ -0,0 +1,27 @@
+"""Shared fixtures for the backend test suite."""
+import numpy as np
+import pytest
+from domain.entities import SCFTierBatch
+
+
+@pytest.fixture
+def make_book():
+    """
+    Factory for random books: make_book(n, seed) spreads n suppliers over `regions`
+    regions and 3 tiers, with risk drawn from [5, max_risk) and yield from [2, 18),
+    both rounded to `decimals` (None keeps them unrounded). Same arguments, same book.
+    """
+    def make(n: int, seed: int, regions: int = 3, max_risk: float = 60.0, decimals=1) -> SCFTierBatch:
+        rng = np.random.default_rng(seed)
+        rounded = (lambda x: x) if decimals is None else (lambda x: np.round(x, decimals))
+        return SCFTierBatch.from_columns(
+            [f"R{rng.integers(0, regions)}_{i}" for i in range(n)],
+            rng.integers(1, 4, n),
+            rounded(rng.uniform(5, max_risk, n)),
+            rounded(rng.uniform(2, 18, n)),
+            np.ones(n),
+            rng.uniform(40, 95, n),
+            np.ones(n),
+        )
+
+    return make
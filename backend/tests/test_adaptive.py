@@ -0,0 +1,95 @@
+"""Unit Tests for adaptive num_reads sampling."""
+import functools
+import pytest
+import numpy as np
+import dimod
+from infrastructure.quantum.qubo import QUBOCompiler
+from infrastructure.quantum.annealer import local_sampler
+from infrastructure.quantum.adaptive import AdaptiveSampler, confidence, describe
+from infrastructure.quantum.dwave_solver import DWaveSolver
+
+
+class _Rounds:
+    """Sampler returning scripted energies, one list per round."""
+    label = "scripted"
+
+    def __init__(self, *rounds):
+        self.rounds = list(rounds)
+        self.calls = []
+
+    def sample(self, model, num_reads, seed=None, initial_state=None):
+        self.calls.append(num_reads)
+        energies = self.rounds.pop(0) if self.rounds else [0.0] * num_reads
+        return dimod.SampleSet.from_samples(
+            (np.zeros((len(energies), 1)), [0]), dimod.BINARY, energy=energies
+        )
+
+
+@pytest.fixture
+def book(make_book):
+    return functools.partial(make_book, seed=3)
+
+
+class TestAdaptiveSampler:
+    """Tests for AdaptiveSampler's stopping rules."""
+
+    def test_confidence_is_share_at_best_energy(self):
+        """GIVEN read energies, WHEN scored, THEN confidence is the % of reads at the minimum."""
+        assert confidence(np.array([-2.0, -2.0, -1.0, 0.0])) == pytest.approx(50.0)
+        assert confidence(np.zeros(0)) == 0.0
+
+    def test_small_model_stops_after_first_round(self, book):
+        """GIVEN a tiny QUBO, WHEN sampled, THEN the first round already reaches the target confidence."""
+        model = QUBOCompiler().compile(book(4), "dwave")
+
+        response = AdaptiveSampler(local_sampler(), first_reads=10).sample(model)
+
+        adaptive = response.info["adaptive"]
+        assert adaptive["stop"] == "confidence"
+        assert adaptive["num_reads"] == 10 and len(adaptive["trace"]) == 1
+
+    def test_reads_double_until_converged(self):
+        """GIVEN a round that finds nothing better, WHEN the best energy has enough hits, THEN sampling stops."""
+        sampler = _Rounds([-1.0, 0, 0, 0, 0], [-3.0, -3.0, 0, 0, 0], [-3.0] + [0.0] * 9)
+
+        response = AdaptiveSampler(sampler, first_reads=5, target_confidence=90).sample(None)
+
+        assert sampler.calls == [5, 5, 10]
+        assert response.info["adaptive"]["stop"] == "converged"
+        assert [energy for _, energy, _ in response.info["adaptive"]["trace"]] == [-1.0, -3.0, -3.0]
+        assert len(response) == 20
+
+    def test_max_reads_is_respected(self):
+        """GIVEN an estimate that keeps improving, WHEN sampled, THEN no more than max_reads are used."""
+        sampler = _Rounds(*[[-r - 1.0] + [0.0] * (reads - 1) for r, reads in enumerate([4, 4, 8, 14])])
+
+        response = AdaptiveSampler(sampler, first_reads=4, max_reads=30, target_confidence=90).sample(None)
+
+        assert sampler.calls == [4, 4, 8, 14]
+        assert response.info["adaptive"]["stop"] == "max reads"
+        assert response.info["adaptive"]["num_reads"] == 30
+
+    def test_time_budget_stops_before_overrunning(self):
+        """GIVEN a zero time budget, WHEN sampled, THEN only the first round runs."""
+        sampler = _Rounds([-1.0, 0.0])
+
+        response = AdaptiveSampler(sampler, first_reads=2, target_confidence=90, time_budget_s=0).sample(None)
+
+        assert sampler.calls == [2]
+        assert response.info["adaptive"]["stop"] == "time budget"
+
+    def test_describe_reports_trace(self):
+        """GIVEN an adaptive SampleSet, WHEN described, THEN reads, rounds and stop reason are logged."""
+        sampler = _Rounds([-1.0, -1.0])
+
+        response = AdaptiveSampler(sampler, first_reads=2).sample(None)
+
+        assert describe(response.info).startswith("Sampling: 2 reads in 1 rounds, stopped on confidence")
+        assert describe({}) == "Sampling: fixed reads"
+
+    def test_solver_logs_sampling(self, book):
+        """GIVEN a book, WHEN the D-Wave solver falls back to simulation, THEN its logs report the sampling rounds."""
+        result = DWaveSolver().optimize(book(20), 1_000_000, 50, 60)
+
+        assert "Sampling:" in result.solver_logs
+        assert 0 < result.confidence_score <= 100
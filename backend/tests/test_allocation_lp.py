@@ -0,0 +1,88 @@
+"""Unit Tests for the structured allocation LP solver, cross-checked against HiGHS."""
+import numpy as np
+import pytest
+from scipy.optimize import linprog
+
+from infrastructure.quantum.allocation_lp import solve_allocation_lp
+
+
+def _book(n, seed):
+    rng = np.random.default_rng(seed)
+    risk = rng.uniform(5, 90, n)
+    esg = rng.uniform(40, 95, n)
+    objective = rng.uniform(2, 18, n) - 0.5 * risk / 100
+    return objective, risk, esg
+
+
+def _highs(objective, risk, esg, risk_tolerance, esg_min):
+    return linprog(
+        -objective,
+        A_ub=np.vstack([risk, -esg]),
+        b_ub=[risk_tolerance, -esg_min],
+        A_eq=np.ones((1, len(objective))),
+        b_eq=[1.0],
+        bounds=(0, None),
+        method="highs-ds",
+    )
+
+
+class TestSolveAllocationLP:
+    """Tests for solve_allocation_lp."""
+
+    @pytest.mark.parametrize("n", [1, 4, 50, 5000])
+    @pytest.mark.parametrize("risk_tolerance,esg_min", [(50, 60), (30, 80), (90, 40)])
+    def test_matches_highs_objective_and_duals(self, n, risk_tolerance, esg_min):
+        """GIVEN a random book, WHEN solved, THEN status, objective and dual prices match HiGHS."""
+        objective, risk, esg = _book(n, seed=n)
+        solution = solve_allocation_lp(objective, risk, esg, risk_tolerance, esg_min)
+        reference = _highs(objective, risk, esg, risk_tolerance, esg_min)
+
+        if reference.status == 2:
+            assert solution.status == "Infeasible"
+            return
+        assert solution.status == "Optimal"
+        assert solution.objective == pytest.approx(-reference.fun, rel=1e-9, abs=1e-9)
+        assert solution.risk_price == pytest.approx(-reference.ineqlin.marginals[0], abs=1e-7)
+        assert solution.esg_price == pytest.approx(-reference.ineqlin.marginals[1], abs=1e-7)
+        assert solution.allocation_price == pytest.approx(-reference.eqlin.marginals[0], abs=1e-7)
+
+    def test_solution_is_a_feasible_vertex(self):
+        """GIVEN a large book, WHEN solved, THEN weights are feasible with at most three nonzeros."""
+        objective, risk, esg = _book(20_000, seed=7)
+        solution = solve_allocation_lp(objective, risk, esg, 40, 70)
+
+        assert solution.weights.sum() == pytest.approx(1.0)
+        assert risk @ solution.weights <= 40 + 1e-7
+        assert esg @ solution.weights >= 70 - 1e-7
+        assert np.count_nonzero(solution.weights) <= 3
+
+    def test_degenerate_ties_terminate(self):
+        """GIVEN duplicated suppliers and tied scores, WHEN solved, THEN the optimum matches HiGHS."""
+        objective = np.array([3.0, 3.0, 3.0, 1.0, 1.0, 2.0])
+        risk = np.array([20.0, 20.0, 50.0, 10.0, 10.0, 30.0])
+        esg = np.array([60.0, 60.0, 70.0, 60.0, 60.0, 70.0])
+        solution = solve_allocation_lp(objective, risk, esg, 30, 65)
+        reference = _highs(objective, risk, esg, 30, 65)
+
+        assert solution.status == "Optimal"
+        assert solution.objective == pytest.approx(-reference.fun)
+
+    def test_infeasible_esg_floor(self):
+        """GIVEN an ESG floor above every supplier, WHEN solved, THEN status is Infeasible with no weights."""
+        objective, risk, esg = _book(10, seed=1)
+        solution = solve_allocation_lp(objective, risk, esg, 50, 99)
+
+        assert solution.status == "Infeasible"
+        assert not solution.weights.any()
+
+    def test_warm_start_matches_cold_solve(self):
+        """GIVEN the basis of a neighbouring point, WHEN re-solved warm, THEN it matches a cold solve in fewer pivots."""
+        objective, risk, esg = _book(2000, seed=3)
+        previous = solve_allocation_lp(objective, risk, esg, 50, 60)
+        warm = solve_allocation_lp(objective, risk, esg, 45, 65, warm_basis=previous.basis)
+        cold = solve_allocation_lp(objective, risk, esg, 45, 65)
+
+        assert warm.status == cold.status == "Optimal"
+        assert warm.objective == pytest.approx(cold.objective, rel=1e-12)
+        assert warm.iterations < cold.iterations
+
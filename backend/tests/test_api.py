@@ -86,6 +86,145 @@ class TestOptimizeEndpoint:
         assert response.status_code == 400
 
 
+class TestCompareEndpoint:
+    """Tests for the cross-provider comparison endpoint."""
+    
+    def test_compare_returns_each_provider(self, client, sample_csv):
+        """GIVEN several providers, WHEN /api/optimize/compare called, THEN each has a status."""
+        response = client.post("/api/optimize/compare", json={
+            "csv_content": sample_csv,
+            "providers": ["dwave", "planqk"],
+            "timeout_s": 60
+        })
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert set(data["providers"]) == {"dwave", "planqk"}
+        assert all(p["status"] in ("OK", "TIMEOUT", "ERROR") for p in data["providers"].values())
+        assert data["best_provider"] in data["provider_comparison"]
+    
+    def test_compare_rejects_non_positive_timeout(self, client, sample_csv):
+        """GIVEN timeout_s <= 0, WHEN compared, THEN returns 400."""
+        response = client.post("/api/optimize/compare", json={
+            "csv_content": sample_csv,
+            "timeout_s": 0
+        })
+        assert response.status_code == 400
+    
+    def test_compare_rejects_unknown_provider(self, client, sample_csv):
+        """GIVEN a provider name with no solver, WHEN compared, THEN returns 400 naming it."""
+        response = client.post("/api/optimize/compare", json={
+            "csv_content": sample_csv,
+            "providers": ["dwave", "qiskit"]
+        })
+        assert response.status_code == 400
+        assert "qiskit" in response.json()["detail"]
+    
+    def test_optimize_rejects_unknown_provider(self, client, sample_csv):
+        """GIVEN an unknown quantum_provider, WHEN optimised, THEN returns 400 instead of running PlanQK."""
+        response = client.post("/api/optimize", json={
+            "csv_content": sample_csv,
+            "quantum_provider": "qiskit"
+        })
+        assert response.status_code == 400
+
+
+class TestPlanQKCallback:
+    """Tests for the PlanQK job webhook."""
+    
+    def test_callback_requires_shared_secret(self, client, monkeypatch):
+        """GIVEN a configured secret, WHEN a callback arrives, THEN only the matching token is accepted."""
+        monkeypatch.setenv("PLANQK_CALLBACK_SECRET", "s3cret")
+        url = "/api/planqk/jobs/job-1/callback"
+        
+        assert client.post(url).status_code == 401
+        assert client.post(url, headers={"X-Callback-Token": "guess"}).status_code == 401
+        assert client.post(url, headers={"X-Callback-Token": "s3cret"}).status_code == 202
+    
+    def test_callback_refused_without_secret(self, client, monkeypatch):
+        """GIVEN no configured secret, WHEN a callback arrives, THEN it is refused."""
+        monkeypatch.delenv("PLANQK_CALLBACK_SECRET", raising=False)
+        
+        assert client.post("/api/planqk/jobs/job-1/callback").status_code == 403
+
+
+class TestReoptimizeEndpoint:
+    """Tests for warm-started re-optimisation of a stored job."""
+    
+    def test_reoptimize_applies_delta_and_reports_speedup(self, client, sample_csv):
+        """GIVEN a finished job and a delta, WHEN re-optimised, THEN the delta is counted and speedups reported."""
+        parent = client.post("/api/optimize", json={
+            "csv_content": sample_csv, "quantum_provider": "dwave"
+        }).json()
+        delta = (
+            "supplier_id,tier,risk_score,yield_pct,volatility,esg_score,trade_volume,action\n"
+            "SUP_002,1,25.0,11.0,18.0,75.0,1800000,\n"
+            "SUP_005,2,20.0,9.0,15.0,80.0,700000,upsert\n"
+            "SUP_004,,,,,,,remove"
+        )
+        
+        response = client.post(f"/api/optimize/{parent['job_id']}/reoptimize", json={
+            "delta_csv": delta, "compare_cold": True
+        })
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["parent_job_id"] == parent["job_id"]
+        assert data["delta"] == {"added": 1, "changed": 1, "removed": 1, "unknown_removed": []}
+        assert data["speedup"]["cold_source"] == "measured"
+        assert data["speedup"]["classical"]["warm_ms"] > 0
+        assert "warm-started" in data["quantum"]["solver_logs"]
+        assert "SUP_004" not in [a["supplier_id"] for a in data["classical"]["allocations"]]
+        assert client.get(f"/api/jobs/{data['job_id']}").status_code == 200
+    
+    def test_reoptimize_unknown_job_returns_404(self, client):
+        """GIVEN an unknown job id, WHEN re-optimised, THEN returns 404."""
+        response = client.post("/api/optimize/nojob/reoptimize", json={"delta_csv": "supplier_id\n"})
+        assert response.status_code == 404
+
+
+class TestFrontierEndpoint:
+    """Tests for the efficient-frontier sweep endpoint."""
+    
+    def test_frontier_returns_plot_columns(self, client, sample_csv):
+        """GIVEN a 3x2 grid, WHEN /api/optimize/frontier called, THEN every column has 6 points."""
+        response = client.post("/api/optimize/frontier", json={
+            "csv_content": sample_csv,
+            "risk_tolerances": [20, 30, 40],
+            "esg_mins": [60, 80]
+        })
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["grid"] == {"risk_tolerance": [20, 30, 40], "esg_min": [60, 80]}
+        assert all(len(column) == 6 for column in data["points"].values())
+        assert data["points"]["esg_min"] == [60, 60, 60, 80, 80, 80]
+        # Loosening the risk cap never lowers the optimum
+        yields = data["points"]["total_yield"][:3]
+        assert yields == sorted(yields)
+    
+    def test_frontier_rejects_empty_grid(self, client, sample_csv):
+        """GIVEN no risk tolerances, WHEN the frontier is requested, THEN returns 400."""
+        response = client.post("/api/optimize/frontier", json={
+            "csv_content": sample_csv,
+            "risk_tolerances": []
+        })
+        assert response.status_code == 400
+
+
+class TestProviderHealthEndpoint:
+    """Tests for the provider health / circuit breaker status endpoint."""
+    
+    def test_lists_every_remote_provider(self, client):
+        """GIVEN the API, WHEN /api/providers/health called, THEN each provider reports its breaker state."""
+        response = client.get("/api/providers/health")
+        
+        assert response.status_code == 200
+        providers = {p["provider"]: p for p in response.json()["providers"]}
+        assert set(providers) == {"planqk", "dwave", "ibm", "cascadeguard"}
+        assert all(p["state"] in ("CLOSED", "OPEN", "HALF_OPEN") for p in providers.values())
+
+
 class TestReportEndpoint:
     """Tests for PDF report endpoint."""
     
@@ -0,0 +1,90 @@
+"""Unit Tests for the pooled, batched CascadeGuard adapter."""
+import json
+
+import httpx
+import pytest
+from domain.entities import SCFTier
+from infrastructure.cascadeguard.adapter import CascadeGuardSCFAdapter
+from infrastructure.cascadeguard.client import CascadeGuardClient, local_dispatch
+
+
+@pytest.fixture
+def tiers():
+    return [
+        SCFTier("SUP_001", 1, 15.0, 8.5, 12.0, 85.0, 2_500_000),
+        SCFTier("SUP_002", 2, 35.0, 12.0, 25.0, 70.0, 950_000),
+    ]
+
+
+class _RecordingService:
+    """CascadeGuard API stand-in that records calls; optionally without /batch or failing first."""
+
+    def __init__(self, batch: bool = True, failures: int = 0):
+        self.batch, self.failures = batch, failures
+        self.paths = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.paths.append(request.url.path)
+        if self.failures:
+            self.failures -= 1
+            return httpx.Response(503)
+        body = json.loads(request.content)
+        if request.url.path.endswith("/batch"):
+            if not self.batch:
+                return httpx.Response(404)
+            return httpx.Response(200, json={"results": [local_dispatch(r) for r in body["requests"]]})
+        return httpx.Response(200, json={"result": local_dispatch(body)})
+
+
+def _adapter(service: _RecordingService, **kwargs) -> CascadeGuardSCFAdapter:
+    client = CascadeGuardClient("https://cg.test/api/optimize", transport=httpx.MockTransport(service), **kwargs)
+    return CascadeGuardSCFAdapter(client=client)
+
+
+class TestCascadeGuardAdapter:
+    """Tests for CascadeGuardSCFAdapter over CascadeGuardClient."""
+
+    def test_local_mode_needs_no_network(self, tiers):
+        """GIVEN local mode, WHEN optimized, THEN the in-process stand-in answers."""
+        result = CascadeGuardSCFAdapter(endpoint_url="https://unreachable.invalid/api/optimize", local=True).optimize(
+            tiers, 1_000_000, 50, 60
+        )
+
+        assert result.solver_type == "cascadeguard-local"
+        assert result.allocations.allocated_amount.tolist() == pytest.approx([2_000_000, 760_000])
+
+    def test_batch_sends_portfolios_in_one_round_trip(self, tiers):
+        """GIVEN five portfolios and a /batch endpoint, WHEN optimized as a batch, THEN one request carries all."""
+        service = _RecordingService()
+        results = _adapter(service).optimize_batch([(tiers, 1_000_000, 50, 60)] * 5)
+
+        assert len(results) == 5
+        assert service.paths == ["/api/optimize/batch"]
+
+    def test_batch_falls_back_to_concurrent_calls_without_batch_endpoint(self, tiers):
+        """GIVEN a service without /batch, WHEN batched, THEN single calls are made and /batch is not retried."""
+        service = _RecordingService(batch=False)
+        adapter = _adapter(service)
+        adapter.optimize_batch([(tiers, 1_000_000, 50, 60)] * 3)
+        adapter.optimize_batch([(tiers, 1_000_000, 50, 60)] * 2)
+
+        assert service.paths.count("/api/optimize/batch") == 1
+        assert service.paths.count("/api/optimize") == 5
+
+    def test_transient_503_is_retried_within_budget(self, tiers):
+        """GIVEN one 503, WHEN optimized, THEN the call is retried and succeeds."""
+        service = _RecordingService(failures=1)
+        result = _adapter(service).optimize(tiers, 1_000_000, 50, 60)
+
+        assert result.solver_type == "cascadeguard-qaoa"
+        assert service.paths == ["/api/optimize", "/api/optimize"]
+
+    def test_exhausted_retry_budget_returns_the_error(self, tiers):
+        """GIVEN an empty retry budget, WHEN the service answers 503, THEN it is not retried."""
+        service = _RecordingService(failures=5)
+        adapter = _adapter(service)
+        adapter.client.budget.tokens = 0.0
+
+        with pytest.raises(httpx.HTTPStatusError):
+            adapter.optimize(tiers, 1_000_000, 50, 60)
+        assert len(service.paths) == 1
@@ -63,3 +63,65 @@ class TestClassicalSolver:
         
         assert len(result.allocations) == 1
         assert result.allocations[0].allocated_amount == pytest.approx(1_000_000, rel=0.01)
+    
+    def test_highs_matches_pulp_reference(self, sample_tiers):
+        """GIVEN the same book, WHEN solved by HiGHS and PuLP/CBC, THEN the allocations agree."""
+        highs = ClassicalSolver("highs").optimize(sample_tiers, 1_000_000, 50, 60)
+        cbc = ClassicalSolver("pulp").optimize(sample_tiers, 1_000_000, 50, 60)
+        
+        assert highs.total_yield == pytest.approx(cbc.total_yield, rel=1e-6)
+        assert highs.allocations.supplier_ids.tolist() == cbc.allocations.supplier_ids.tolist()
+        assert "Backend: HIGHS" in highs.solver_logs
+    
+    def test_infeasible_book_reports_status(self, sample_tiers):
+        """GIVEN an ESG floor no supplier meets, WHEN optimized, THEN the status says Infeasible."""
+        result = ClassicalSolver("highs").optimize(sample_tiers, 1_000_000, 50, 99)
+        
+        assert "Status: Infeasible" in result.solver_logs
+        assert len(result.allocations) == 0
+    
+    def test_unknown_backend_rejected(self):
+        """GIVEN an unknown backend name, WHEN constructed, THEN ValueError is raised."""
+        with pytest.raises(ValueError):
+            ClassicalSolver("gurobi")
+    
+    def test_structured_matches_highs(self, sample_tiers):
+        """GIVEN the same book, WHEN solved by the structured simplex and HiGHS, THEN the allocations agree."""
+        structured = ClassicalSolver("structured").optimize(sample_tiers, 1_000_000, 50, 60)
+        highs = ClassicalSolver("highs").optimize(sample_tiers, 1_000_000, 50, 60)
+        
+        assert structured.total_yield == pytest.approx(highs.total_yield, rel=1e-9)
+        assert structured.allocations.supplier_ids.tolist() == highs.allocations.supplier_ids.tolist()
+        assert "Backend: STRUCTURED" in structured.solver_logs
+        assert "Dual prices:" in structured.solver_logs
+    
+    def test_frontier_matches_point_solves(self, sample_tiers):
+        """GIVEN a warm-started grid sweep, WHEN compared to cold single solves, THEN every point agrees."""
+        solver = ClassicalSolver()
+        frontier = solver.frontier(sample_tiers, 1_000_000, [15, 20, 30, 45], [60, 75, 90])
+        points = frontier["points"]
+        
+        for risk, esg, status, total_yield in zip(
+            points["risk_tolerance"], points["esg_min"], points["status"], points["total_yield"]
+        ):
+            single = solver.optimize(sample_tiers, 1_000_000, risk, esg)
+            assert f"Status: {status}" in single.solver_logs
+            if status == "Optimal":
+                assert total_yield == pytest.approx(single.total_yield, rel=1e-9)
+            else:
+                assert total_yield is None
+    
+    def test_warm_start_after_book_change(self, sample_tiers):
+        """GIVEN a previous basis and a changed book, WHEN re-solved warm, THEN it matches a cold solve."""
+        solver = ClassicalSolver()
+        previous = solver.optimize(sample_tiers, 1_000_000, 30, 70)
+        changed = [sample_tiers[0], SCFTier("SUP_002", 1, 25.0, 11.0, 18.0, 75.0, 1800000), sample_tiers[3],
+                   SCFTier("SUP_005", 2, 20.0, 13.0, 20.0, 80.0, 600000)]
+        
+        warm = solver.optimize(changed, 1_000_000, 30, 70, warm_start=previous.warm_start)
+        cold = solver.optimize(changed, 1_000_000, 30, 70)
+        
+        assert previous.warm_start["basic_suppliers"]
+        assert "warm basis" in warm.solver_logs
+        assert warm.total_yield == pytest.approx(cold.total_yield, rel=1e-9)
+
@@ -0,0 +1,95 @@
+"""Unit Tests for columnar CSV ingestion."""
+import pytest
+from application.csv_ingest import read_scf_frame, read_scf_delta, CSVValidationError
+from application import OptimizeSCFUseCase
+
+
+HEADER = "supplier_id,tier,risk_score,yield_pct,volatility,esg_score,trade_volume"
+
+
+@pytest.fixture
+def sample_csv():
+    """Sample CSV with an extra free-text column and messy header casing."""
+    return """Supplier_ID , Tier,risk_score,yield_pct,volatility,esg_score,trade_volume,description
+SUP_001,1,15.0,8.5,12.0,85.0,2500000,Stable
+SUP_002,2,25.0,10.0,18.0,75.0,1800000,Standard"""
+
+
+class TestReadSCFFrame:
+    """Tests for read_scf_frame."""
+
+    def test_returns_typed_columns(self, sample_csv):
+        """GIVEN valid CSV, WHEN parsed, THEN columns are typed and extras dropped."""
+        df = read_scf_frame(sample_csv)
+
+        assert list(df.columns) == HEADER.split(",")
+        assert df["tier"].dtype == "int64"
+        assert df["risk_score"].dtype == "float64"
+        assert df["supplier_id"].tolist() == ["SUP_001", "SUP_002"]
+
+    def test_reports_bad_rows_per_column(self):
+        """GIVEN bad cells, WHEN parsed, THEN every failing row is reported by CSV line."""
+        csv = f"{HEADER}\nA,1,x,1,1,1,1\nB,1.5,2,1,1,1,\n,2,3,3,3,3,3"
+
+        with pytest.raises(CSVValidationError) as exc:
+            read_scf_frame(csv)
+
+        assert exc.value.errors == {
+            "supplier_id": [4],
+            "tier": [3],
+            "risk_score": [2],
+            "trade_volume": [3],
+        }
+
+    def test_missing_columns_raise_value_error(self):
+        """GIVEN CSV missing columns, WHEN parsed, THEN ValueError names them."""
+        with pytest.raises(ValueError, match="Missing required columns"):
+            read_scf_frame("supplier_id,wrong_column\nSUP_001,value")
+
+
+class TestReadSCFDelta:
+    """Tests for read_scf_delta."""
+
+    def test_splits_upserts_and_removals(self):
+        """GIVEN a delta with an action column, WHEN parsed, THEN removals need only an id."""
+        upserts, removed = read_scf_delta(
+            f"{HEADER},action\n"
+            "SUP_001,1,15.0,8.5,12.0,85.0,2500000,\n"
+            "SUP_002,,,,,,,remove\n"
+            "SUP_003,2,35.0,12.0,25.0,70.0,950000,UPSERT"
+        )
+
+        assert upserts["supplier_id"].tolist() == ["SUP_001", "SUP_003"]
+        assert upserts["tier"].dtype == "int64"
+        assert removed == ["SUP_002"]
+
+    def test_reports_original_line_numbers(self):
+        """GIVEN a bad upsert after a removal, WHEN parsed, THEN the error names its CSV line."""
+        with pytest.raises(CSVValidationError) as exc:
+            read_scf_delta(
+                f"{HEADER},action\n"
+                "SUP_002,,,,,,,remove\n"
+                "SUP_003,2,abc,12.0,25.0,70.0,950000,upsert\n"
+                "SUP_004,2,35.0,12.0,25.0,70.0,950000,rename"
+            )
+        assert exc.value.errors == {"action": [4]}
+
+    def test_plain_book_is_all_upserts(self):
+        """GIVEN a delta without an action column, WHEN parsed, THEN every row is an upsert."""
+        upserts, removed = read_scf_delta(f"{HEADER}\nSUP_001,1,15.0,8.5,12.0,85.0,2500000")
+
+        assert len(upserts) == 1
+        assert removed == []
+
+
+class TestParseCSV:
+    """Tests for OptimizeSCFUseCase.parse_csv on the columnar path."""
+
+    def test_parse_csv_builds_native_entities(self, sample_csv):
+        """GIVEN valid CSV, WHEN parse_csv runs, THEN SCFTier fields are native types."""
+        tiers = OptimizeSCFUseCase().parse_csv(sample_csv)
+
+        assert len(tiers) == 2
+        assert type(tiers[0].tier) is int
+        assert type(tiers[0].trade_volume) is float
+        assert tiers[1].supplier_id == "SUP_002"
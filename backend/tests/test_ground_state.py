@@ -0,0 +1,100 @@
+"""Unit Tests for exact QUBO ground states and optimality-gap reporting."""
+import functools
+import itertools
+
+import pytest
+import numpy as np
+from infrastructure.quantum.qubo import QUBOCompiler
+from infrastructure.quantum.annealer import VectorizedAnnealer
+from infrastructure.quantum import ground_state, IBMSolver
+from infrastructure.quantum.ground_state import GrayCodeEnumerator, energy_reference, gap_report
+
+
+@pytest.fixture
+def book(make_book):
+    return functools.partial(make_book, seed=5, max_risk=40.0)
+
+
+def _brute_force(model):
+    states = np.array(list(itertools.product([0, 1], repeat=model.num_variables)), dtype=float)
+    return model.energies(states).min()
+
+
+class TestGrayCodeEnumerator:
+    """Tests for exhaustive ground-state search."""
+
+    @pytest.mark.parametrize("formulation", ["dwave", "planqk", "ibm", "kipu"])
+    @pytest.mark.parametrize("block_bits,workers", [(16, 1), (3, 1), (4, 4)])
+    def test_matches_brute_force(self, book, formulation, block_bits, workers):
+        """GIVEN a 10-supplier model, WHEN enumerated with any block/chunk split, THEN the energy is the brute-force minimum."""
+        model = QUBOCompiler().compile(book(10), formulation)
+
+        ground = GrayCodeEnumerator(block_bits=block_bits, workers=workers).solve(model)
+
+        assert ground.energy == pytest.approx(_brute_force(model))
+        assert model.energies(ground.state.astype(float))[0] == pytest.approx(ground.energy)
+
+
+class TestEnergyReference:
+    """Tests for energy_reference and gap_report."""
+
+    def test_cardinality_closed_form_is_exact(self, book):
+        """GIVEN a uniform-coupling model, WHEN referenced, THEN the closed form equals brute force."""
+        model = QUBOCompiler().compile(book(12), "dwave")
+
+        reference = energy_reference(model)
+
+        assert reference.exact
+        assert reference.energy == pytest.approx(_brute_force(model))
+
+    def test_ground_state_has_zero_gap(self, book):
+        """GIVEN the exact ground state as a sample, WHEN reported, THEN the gap is 0%."""
+        model = QUBOCompiler().compile(book(12), "planqk")
+        ground = GrayCodeEnumerator().solve(model)
+
+        gap, line = gap_report(model, dict(enumerate(ground.state.tolist())))
+
+        assert gap == pytest.approx(0.0)
+        assert "exact ground state" in line
+
+    def test_large_model_gets_a_valid_lower_bound(self, book):
+        """GIVEN 60 suppliers, WHEN referenced, THEN a bound at or below the annealed energy is reported."""
+        model = QUBOCompiler().compile(book(60), "ibm")
+        states = VectorizedAnnealer().anneal(model, num_reads=20)
+        best = states[model.energies(states).argmin()]
+
+        reference = energy_reference(model)
+        gap, line = gap_report(model, dict(enumerate(best.astype(int).tolist())))
+
+        assert not reference.exact
+        assert reference.energy <= model.energies(best)[0] + 1e-9
+        assert gap >= 0.0
+        assert line.startswith("Optimality gap: <=")
+
+    def test_report_includes_its_cost(self, book):
+        """GIVEN any model, WHEN the gap is reported, THEN the log line says how long the report took."""
+        model = QUBOCompiler().compile(book(12), "planqk")
+
+        _, line = gap_report(model, {})
+
+        assert line.endswith(" ms)") and "computed in" in line
+
+    def test_unknown_reference_is_reported_as_unknown(self, book, monkeypatch):
+        """GIVEN no exact solve and no bound, WHEN a solver finishes, THEN its optimality_gap is None, not a placeholder."""
+        monkeypatch.setattr(ground_state, "BOUND_MAX_INTERACTIONS", -1)
+
+        result = IBMSolver().optimize(book(40, seed=11), 1_000_000, 50, 60)
+
+        assert result.optimality_gap is None
+        assert "Optimality gap: unknown" in result.solver_logs
+
+    def test_gap_is_of_the_returned_allocation(self, book):
+        """GIVEN a solved book, WHEN the gap is reported, THEN it is measured on the suppliers returned, not the first read."""
+        batch = book(14)
+
+        result = IBMSolver().optimize(batch, 1_000_000, 50, 60)
+
+        chosen = set(result.allocations.supplier_ids.tolist())
+        sample = {i: 1 for i, s in enumerate(batch.supplier_ids.tolist()) if s in chosen}
+        gap, _ = gap_report(QUBOCompiler().compile(batch, "ibm"), sample)
+        assert result.optimality_gap == pytest.approx(gap)
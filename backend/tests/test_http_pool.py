@@ -0,0 +1,111 @@
+"""Unit Tests for cached provider tokens and pooled HTTP clients."""
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi.testclient import TestClient
+from infrastructure.http import TokenManager, http_client
+from infrastructure.quantum import planqk_solver
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestTokenManager:
+    """Tests for TokenManager caching and single-flight refresh."""
+
+    def test_token_is_reused_until_refresh_margin(self):
+        """GIVEN a 300s token and 60s margin, WHEN called before and after 240s, THEN it is fetched twice."""
+        clock = _Clock()
+        fetched = []
+        manager = TokenManager(lambda: (fetched.append(1) or f"tok-{len(fetched)}", 300), refresh_margin_s=60, clock=clock)
+
+        assert manager.token() == "tok-1"
+        clock.now = 239.0
+        assert manager.token() == "tok-1"
+        clock.now = 241.0
+        assert manager.token() == "tok-2"
+        assert manager.refreshes == 2
+
+    def test_concurrent_callers_share_one_refresh(self):
+        """GIVEN 16 threads hitting a cold cache, WHEN all ask for a token, THEN fetch runs once."""
+        calls = []
+
+        def slow_fetch():
+            calls.append(threading.get_ident())
+            time.sleep(0.1)
+            return "tok", 3600
+
+        manager = TokenManager(slow_fetch)
+        with ThreadPoolExecutor(16) as pool:
+            tokens = list(pool.map(lambda _: manager.token(), range(16)))
+
+        assert tokens == ["tok"] * 16
+        assert len(calls) == 1
+
+    async def test_async_callers_share_one_refresh(self):
+        """GIVEN event-loop tasks, WHEN they ask concurrently, THEN one fetch serves all of them."""
+        calls = []
+
+        def slow_fetch():
+            calls.append(1)
+            time.sleep(0.05)
+            return "tok", 3600
+
+        manager = TokenManager(slow_fetch)
+        tokens = await asyncio.gather(*[manager.token_async() for _ in range(10)])
+
+        assert tokens == ["tok"] * 10
+        assert len(calls) == 1
+
+    def test_failed_fetch_is_raised_and_retried(self):
+        """GIVEN a failing token endpoint, WHEN called, THEN the error propagates and the next call retries."""
+        outcomes = iter([RuntimeError("503"), ("tok", 3600)])
+
+        def flaky_fetch():
+            outcome = next(outcomes)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        manager = TokenManager(flaky_fetch)
+        with pytest.raises(RuntimeError):
+            manager.token()
+        assert manager.token() == "tok"
+
+
+class TestHttpClientPool:
+    """Tests for per-provider pooled clients."""
+
+    def test_same_client_per_provider(self):
+        """GIVEN repeated lookups, WHEN a provider's client is requested, THEN the pooled instance is reused."""
+        assert http_client("ibm") is http_client("ibm")
+        assert http_client("ibm") is not http_client("planqk")
+
+    def test_shutdown_closes_pooled_clients(self, monkeypatch):
+        """GIVEN pooled sync clients and a hub client, WHEN the app shuts down, THEN both are closed."""
+        from api.main import app
+
+        class _Hub:
+            closed = False
+
+            async def aclose(self):
+                self.closed = True
+
+        hub = _Hub()
+        monkeypatch.setitem(planqk_solver._hub_clients, "https://hub.test/svc", hub)
+        client = http_client("planqk")
+
+        with TestClient(app):
+            pass
+
+        assert client.is_closed and hub.closed
+        assert planqk_solver._hub_clients == {}
+        assert http_client("planqk") is not client
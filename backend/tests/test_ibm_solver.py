@@ -0,0 +1,63 @@
+"""Unit Tests for the IBM solver's recursive (R-QAOA) variable elimination."""
+import functools
+import pytest
+import numpy as np
+from infrastructure.quantum.qubo import QUBOCompiler
+from infrastructure.quantum.ground_state import GrayCodeEnumerator
+from infrastructure.quantum.ibm_solver import IBMSolver, _Elimination
+
+
+@pytest.fixture
+def book(make_book):
+    return functools.partial(make_book, seed=9)
+
+
+def _model(batch):
+    return QUBOCompiler().compile(batch, "ibm")
+
+
+class TestElimination:
+    """Tests for the array-backed elimination model."""
+
+    def test_fixed_couplings_are_absorbed(self, book):
+        """GIVEN variables fixed at 0 and 1, WHEN reduced, THEN reduced energies differ from full ones by a constant."""
+        model = _model(book(20))
+        elimination = _Elimination(model)
+        elimination.fix(np.array([2, 5, 11]), np.array([1, 0, 1], dtype=np.int8))
+        reduced = elimination.reduced()
+
+        states = np.random.default_rng(0).integers(0, 2, (8, reduced.num_variables))
+        full = model.energies(elimination.complete(states))
+        assert np.ptp(full - reduced.energies(states)) == pytest.approx(0.0, abs=1e-9)
+
+
+class TestRecursiveQAOA:
+    """Tests for IBMSolver._recursive_qaoa_solve."""
+
+    def test_small_model_is_solved_exactly(self, book):
+        """GIVEN no more variables than the exact cutoff, WHEN solved, THEN the ground state is returned."""
+        model = _model(book(12))
+
+        states, log = IBMSolver()._recursive_qaoa_solve(model)
+
+        assert model.energies(states[0])[0] == pytest.approx(GrayCodeEnumerator().solve(model).energy)
+        assert log.startswith("0-Stage")
+
+    @pytest.mark.parametrize("steps", [1, 4])
+    def test_recursion_depth_is_configurable(self, book, steps):
+        """GIVEN a 60-variable model, WHEN solved with `steps` stages, THEN every stage's reads come back, best first."""
+        model = _model(book(60))
+
+        states, log = IBMSolver(recursion_steps=steps, exact_variables=10)._recursive_qaoa_solve(model)
+
+        energies = model.energies(states)
+        assert states.shape == (50 * steps + 1, 60)
+        assert (np.diff(energies) >= 0).all()
+        assert log.startswith(f"{steps}-Stage")
+        assert "exact final solve" in log
+
+    def test_steps_from_environment(self, monkeypatch):
+        """GIVEN IBM_RQAOA_STEPS, WHEN the solver is built, THEN it uses that depth."""
+        monkeypatch.setenv("IBM_RQAOA_STEPS", "7")
+
+        assert IBMSolver().recursion_steps == 7
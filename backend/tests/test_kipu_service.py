@@ -0,0 +1,38 @@
+"""Unit Tests keeping the Kipu service's vendored annealer in step with the backend's."""
+import importlib.util
+import os
+
+import pytest
+import numpy as np
+from infrastructure.quantum.qubo import QUBOCompiler
+from infrastructure.quantum.annealer import VectorizedAnnealer
+
+SERVICE_ANNEALER = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "kipu-optimizer-service", "src", "annealer.py",
+)
+
+
+@pytest.fixture(scope="module")
+def service():
+    spec = importlib.util.spec_from_file_location("kipu_service_annealer", SERVICE_ANNEALER)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class TestVendoredCardinalityKernel:
+    """Tests that kipu-optimizer-service/src/annealer.py matches VectorizedAnnealer on the Kipu QUBO."""
+
+    @pytest.mark.parametrize("n,beta_scale", [(30, (1.0, 1.0)), (120, (0.3, 3.0))])
+    def test_same_states_for_same_seed(self, service, make_book, n, beta_scale):
+        """GIVEN a fixed book and seed, WHEN both kernels anneal the Kipu QUBO, THEN every read ends in the same state."""
+        model = QUBOCompiler().compile(make_book(n, seed=4), "kipu")
+
+        states, energies = service.anneal_cardinality(
+            model.linear, model.uniform_coupling, num_reads=20, seed=7, num_sweeps=40, beta_scale=beta_scale
+        )
+        expected = VectorizedAnnealer(num_sweeps=40, beta_scale=beta_scale).anneal(model, num_reads=20, seed=7)
+
+        assert np.array_equal(states, expected)
+        assert energies == pytest.approx(model.energies(expected))
@@ -0,0 +1,93 @@
+"""Unit Tests for the concurrent optimisation use case."""
+import threading
+import time
+
+import pytest
+from domain.entities import SCFTier, OptimizationResult
+from application import OptimizeSCFUseCase
+
+
+@pytest.fixture
+def tiers():
+    return [
+        SCFTier("SUP_001", 1, 15.0, 8.5, 12.0, 85.0, 2_500_000),
+        SCFTier("SUP_002", 1, 25.0, 10.0, 18.0, 75.0, 1_800_000),
+        SCFTier("SUP_003", 2, 35.0, 12.0, 25.0, 70.0, 950_000),
+    ]
+
+
+class _SleepySolver:
+    """Wraps a solver, delaying its answer (or failing) to stand in for a slow provider."""
+
+    def __init__(self, inner, delay_s: float = 0.0, error: Exception = None):
+        self.inner, self.delay_s, self.error = inner, delay_s, error
+
+    def optimize(self, *args) -> OptimizationResult:
+        time.sleep(self.delay_s)
+        if self.error is not None:
+            raise self.error
+        return self.inner.optimize(*args)
+
+
+@pytest.fixture
+def use_case():
+    return OptimizeSCFUseCase()
+
+
+class TestConcurrentOptimization:
+    """Tests for run_optimization / run_comparison fan-out."""
+
+    def test_classical_and_quantum_overlap(self, use_case, tiers):
+        """GIVEN two 0.3s solvers, WHEN run_optimization runs, THEN latency is one delay, not two."""
+        use_case.classical_solver = _SleepySolver(use_case.classical_solver, 0.3)
+        use_case.dwave_solver = _SleepySolver(use_case.dwave_solver, 0.3)
+
+        start = time.monotonic()
+        job = use_case.run_optimization(tiers, quantum_provider="dwave")
+
+        assert time.monotonic() - start < 0.55
+        assert "yield_improvement_pct" in job["comparison"]
+
+    def test_comparison_reports_timeouts_and_errors(self, use_case, tiers):
+        """GIVEN a slow and a failing provider, WHEN compared, THEN both are flagged and the rest ranked."""
+        use_case.planqk_solver = _SleepySolver(use_case.planqk_solver, 2.0)
+        use_case.ibm_solver = _SleepySolver(use_case.ibm_solver, error=RuntimeError("backend offline"))
+
+        start = time.monotonic()
+        job = use_case.run_comparison(tiers, providers=["planqk", "dwave", "ibm"], timeout_s=0.5)
+
+        assert time.monotonic() - start < 1.5
+        assert job["providers"]["planqk"]["status"] == "TIMEOUT"
+        assert job["providers"]["ibm"] == {"status": "ERROR", "error": "backend offline"}
+        assert job["providers"]["dwave"]["status"] == "OK"
+        assert job["best_provider"] == "dwave"
+        assert set(job["provider_comparison"]) == {"dwave"}
+        assert job["quantum"]["total_yield"] == job["providers"]["dwave"]["total_yield"]
+
+    def test_comparison_response_serialises_every_provider(self, use_case, tiers):
+        """GIVEN a comparison job, WHEN serialised, THEN provider allocations become records."""
+        job = use_case.run_comparison(tiers, providers=["dwave", "DWave"], timeout_s=30)
+        response = use_case.to_response(job)
+
+        assert list(response["providers"]) == ["dwave"]
+        assert isinstance(response["providers"]["dwave"]["allocations"], list)
+        assert isinstance(response["quantum"]["allocations"], list)
+
+    def test_comparison_rejects_unknown_provider(self, use_case, tiers):
+        """GIVEN a provider name with no solver, WHEN compared, THEN ValueError is raised before anything runs."""
+        with pytest.raises(ValueError, match="qiskit"):
+            use_case.run_comparison(tiers, providers=["dwave", "qiskit"])
+
+    def test_timed_out_providers_leave_solver_pool(self, use_case, tiers):
+        """GIVEN a comparison provider, WHEN it runs, THEN it is on the provider pool, not the solver pool."""
+        threads = []
+
+        class _Recording:
+            def optimize(self, *args):
+                threads.append(threading.current_thread().name)
+                return use_case.dwave_solver.optimize(*args)
+
+        use_case.dwave_solver = _Recording()
+        use_case.run_comparison(tiers, providers=["dwave"], timeout_s=30)
+
+        assert threads and threads[0].startswith("scf-provider")
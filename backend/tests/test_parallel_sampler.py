@@ -0,0 +1,55 @@
+"""Unit Tests for the multi-process neal sampler."""
+import pickle
+
+import pytest
+import numpy as np
+import dimod
+import neal
+from infrastructure.quantum.qubo import QUBOCompiler
+from infrastructure.quantum.parallel_sampler import ParallelNealSampler, worker_seeds, _executor, _sample_chunk
+
+
+@pytest.fixture
+def model(make_book):
+    """PlanQK QUBO for an 80-supplier book (above the in-process threshold)."""
+    return QUBOCompiler().compile(make_book(80, seed=1, regions=4, max_risk=90.0, decimals=None), "planqk")
+
+
+class TestParallelNealSampler:
+    """Tests for ParallelNealSampler."""
+
+    def test_single_worker_matches_plain_neal(self, model):
+        """GIVEN one worker, WHEN sampled, THEN results equal a plain seeded neal call."""
+        expected = neal.SimulatedAnnealingSampler().sample(model.to_bqm(), num_reads=20, seed=42)
+        result = ParallelNealSampler(workers=1).sample(model, num_reads=20, seed=42)
+
+        assert np.array_equal(result.record.sample, expected.record.sample)
+        assert np.array_equal(result.record.energy, expected.record.energy)
+
+    def test_worker_seeds_are_deterministic(self):
+        """GIVEN the fixed job seed, WHEN worker seeds are derived, THEN they are stable and distinct."""
+        seeds = worker_seeds(42, 4)
+
+        assert seeds == worker_seeds(42, 4)
+        assert len(set(seeds)) == 4
+        assert all(0 <= s < 2 ** 31 for s in seeds)
+
+    def test_pool_merges_all_reads_in_energy_order(self, model):
+        """GIVEN two workers, WHEN sampled, THEN all reads merge and equal the serial per-seed run."""
+        result = ParallelNealSampler(workers=2).sample(model, num_reads=10, seed=42)
+
+        payload = pickle.dumps(model.to_bqm())
+        serial = dimod.concatenate([_sample_chunk(payload, 5, s) for s in worker_seeds(42, 2)])
+        energies = [d.energy for d in result.data()]
+
+        assert len(result) == 10
+        assert energies == sorted(energies)
+        assert np.array_equal(result.record.sample, serial.record.sample)
+        assert result.first.energy == pytest.approx(min(serial.record.energy))
+
+    def test_pool_sized_per_worker_count(self):
+        """GIVEN samplers with different worker counts, WHEN pools are taken, THEN each gets its own size."""
+        two, three = _executor(2), _executor(3)
+
+        assert two is _executor(2)
+        assert (two._max_workers, three._max_workers) == (2, 3)
@@ -0,0 +1,129 @@
+"""Unit Tests for the asyncio PlanQK service client."""
+import asyncio
+import random
+import threading
+
+import httpx
+import pytest
+from infrastructure.http.retry import Backoff
+from infrastructure.quantum.planqk_client import PlanQKAsyncClient, PlanQKJobError
+
+
+class _FakeHub:
+    """In-memory PlanQK service API: a job turns SUCCEEDED after `polls_until_done` status reads."""
+
+    def __init__(self, polls_until_done: int = 3):
+        self.polls_until_done = polls_until_done
+        self.calls = []
+        self.threads = []    # live thread count at each request
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.calls.append((request.method, request.url.path))
+        self.threads.append(threading.active_count())
+        path = request.url.path.rstrip("/")
+        if request.method == "POST":
+            return httpx.Response(201, json={"id": "job-1", "status": "PENDING"})
+        if request.method == "PUT" and path.endswith("/cancel"):
+            return httpx.Response(204)
+        if path.endswith("/result"):
+            return httpx.Response(200, json={"sample": {"0": 1, "1": 0}})
+        polls = sum(1 for m, p in self.calls if m == "GET" and p.rstrip("/").endswith("job-1"))
+        return httpx.Response(200, json={"status": "SUCCEEDED" if polls >= self.polls_until_done else "RUNNING"})
+
+
+def _client(hub: _FakeHub, **kwargs) -> PlanQKAsyncClient:
+    return PlanQKAsyncClient("https://hub.test/svc", transport=httpx.MockTransport(hub), **kwargs)
+
+
+class TestBackoff:
+    """Tests for jittered exponential poll delays."""
+
+    def test_delays_grow_to_cap_within_jitter(self):
+        """GIVEN base 0.5, cap 4, jitter 0.5, WHEN delays are drawn, THEN each lies in [nominal/2, nominal]."""
+        backoff = Backoff(0.5, 4.0, jitter=0.5, rng=random.Random(7))
+        nominal = [0.5, 1.0, 2.0, 4.0, 4.0]
+
+        for expected in nominal:
+            assert expected / 2 <= backoff.next() <= expected
+
+
+class TestPlanQKAsyncClient:
+    """Tests for PlanQKAsyncClient polling, callbacks and deadlines."""
+
+    async def test_run_polls_until_succeeded_and_reports_status_changes(self):
+        """GIVEN a job finishing on the 3rd poll, WHEN run, THEN the result is returned and each status change is reported once."""
+        hub = _FakeHub(polls_until_done=3)
+        seen = []
+        client = _client(hub, poll_base_s=0.01, poll_cap_s=0.02)
+
+        job_id, result = await client.run({"tiers": []}, {}, on_status=lambda job, status: seen.append(status))
+        await client.aclose()
+
+        assert job_id == "job-1"
+        assert result["sample"] == {"0": 1, "1": 0}
+        assert seen == ["RUNNING", "SUCCEEDED"]
+
+    async def test_deadline_raises_and_cancels_job(self):
+        """GIVEN a job that never finishes, WHEN the deadline passes, THEN PlanQKJobError is raised and the job cancelled."""
+        hub = _FakeHub(polls_until_done=10_000)
+        client = _client(hub, poll_base_s=0.01, poll_cap_s=0.02, deadline_s=0.1)
+
+        with pytest.raises(PlanQKJobError, match="timed out"):
+            await client.run({}, {})
+        await client.aclose()
+
+        assert ("PUT", "/svc/job-1/cancel") in hub.calls
+
+    async def test_notify_ends_the_current_wait(self):
+        """GIVEN a long poll interval, WHEN the job's webhook calls notify, THEN the next poll happens at once."""
+        hub = _FakeHub(polls_until_done=2)
+        client = _client(hub, poll_base_s=30.0, poll_cap_s=30.0, jitter=0.0)
+
+        task = asyncio.ensure_future(client.run({}, {}))
+        await asyncio.sleep(0.05)
+        client.notify("job-1")
+        job_id, _ = await asyncio.wait_for(task, timeout=2.0)
+        await client.aclose()
+
+        assert job_id == "job-1"
+
+    async def test_unauthorized_drops_token_and_retries_once(self):
+        """GIVEN a hub rejecting the first token, WHEN a job is submitted, THEN the token is dropped and the request resent."""
+        hub = _FakeHub(polls_until_done=1)
+        tokens = iter(["stale", "fresh"])
+        token = {"value": next(tokens)}
+        invalidated = []
+
+        def handler(request):
+            if request.headers["Authorization"] == "Bearer stale":
+                return httpx.Response(401)
+            return hub(request)
+
+        async def headers():
+            return {"Authorization": f"Bearer {token['value']}"}
+
+        def drop():
+            invalidated.append(token["value"])
+            token["value"] = next(tokens)
+
+        client = PlanQKAsyncClient(
+            "https://hub.test/svc", headers=headers, on_unauthorized=drop, transport=httpx.MockTransport(handler),
+            poll_base_s=0.01,
+        )
+        job_id, _ = await client.run({}, {})
+        await client.aclose()
+
+        assert job_id == "job-1"
+        assert invalidated == ["stale"]
+
+    async def test_many_jobs_in_flight_on_one_loop(self):
+        """GIVEN 50 concurrent jobs, WHEN run on one event loop, THEN all complete without extra threads."""
+        hub = _FakeHub(polls_until_done=2)
+        client = _client(hub, poll_base_s=0.01, poll_cap_s=0.01)
+        threads_before = threading.active_count()
+
+        results = await asyncio.gather(*[client.run({}, {}) for _ in range(50)])
+        await client.aclose()
+
+        assert len(results) == 50
+        assert max(hub.threads) <= threads_before
@@ -0,0 +1,148 @@
+"""Unit Tests for hedged PlanQK solves (hub vs Berlin sandbox)."""
+import asyncio
+import threading
+import time
+
+import pytest
+from domain.entities import SCFTier
+from infrastructure.http import ProviderHealth
+from infrastructure.http.health import OPEN
+from infrastructure.quantum import PlanQKSolver, planqk_solver
+
+
+@pytest.fixture
+def tiers():
+    return [
+        SCFTier("SUP_001", 1, 15.0, 8.5, 12.0, 85.0, 2_500_000),
+        SCFTier("SUP_002", 2, 35.0, 12.0, 25.0, 70.0, 950_000),
+        SCFTier("SUP_003", 3, 45.0, 15.0, 32.0, 65.0, 450_000),
+    ]
+
+
+class _ScriptedHub(PlanQKSolver):
+    """PlanQK solver whose hub call answers after `delay_s` with a fixed sample (or an error)."""
+
+    def __init__(self, delay_s: float, sample=None, **kwargs):
+        super().__init__(hedge=True, **kwargs)
+        self.delay_s, self.sample = delay_s, sample
+        self.cancelled = threading.Event()
+
+    async def _planqk_solve_async(self, batch, budget, risk_tolerance, esg_min, on_status=None):
+        try:
+            await asyncio.sleep(self.delay_s)
+        except asyncio.CancelledError:
+            self.cancelled.set()
+            raise
+        if self.sample is None:
+            return None, "Job hub-1 FAILED"
+        return self.sample, "Sovereign Quantum (Kipu Hub - Job hub-1)"
+
+
+class TestHedgedPlanQK:
+    """Tests for PlanQKSolver hedged mode."""
+
+    def test_remote_within_sla_wins(self, tiers):
+        """GIVEN a hub answering inside the SLA, WHEN optimized, THEN the hub sample is used."""
+        solver = _ScriptedHub(0.2, sample={0: 0, 1: 1, 2: 0}, hedge_sla_s=2.0)
+        result = solver.optimize(tiers, 1_000_000, 50, 60)
+
+        assert result.solver_type == "Sovereign Quantum (Kipu Hub)"
+        assert result.allocations.supplier_ids.tolist() == ["SUP_002"]
+        assert "Hedge: remote won" in result.solver_logs
+
+    def test_slow_remote_loses_to_sandbox_at_sla(self, tiers):
+        """GIVEN a hub slower than the SLA, WHEN optimized, THEN the sandbox answers at the SLA and the hub job is cancelled."""
+        solver = _ScriptedHub(10.0, sample={0: 1, 1: 1, 2: 1}, hedge_sla_s=0.3)
+
+        start = time.monotonic()
+        result = solver.optimize(tiers, 1_000_000, 50, 60)
+
+        assert time.monotonic() - start < 2.0
+        assert result.solver_type == "Sandbox (EU Fallback)"
+        assert "Hedge: local won" in result.solver_logs
+        assert "remote still running, ignored" in result.solver_logs
+        assert solver.cancelled.wait(1.0)
+
+    def test_failed_remote_returns_sandbox_without_waiting_for_sla(self, tiers):
+        """GIVEN a hub job that fails fast, WHEN optimized, THEN the sandbox result is returned before the SLA."""
+        solver = _ScriptedHub(0.05, sample=None, hedge_sla_s=5.0)
+
+        start = time.monotonic()
+        result = solver.optimize(tiers, 1_000_000, 50, 60)
+
+        assert time.monotonic() - start < 2.0
+        assert "PlanQK API Failed: Job hub-1 FAILED" in result.solver_logs
+        assert "Hedge: local won" in result.solver_logs
+
+    def test_concurrent_calls_keep_their_own_winner(self, tiers):
+        """GIVEN one solver shared by a hub-won and a sandbox-won call, WHEN run together, THEN each reports its own winner."""
+        solver = _ScriptedHub(0.0, sample={0: 0, 1: 1, 2: 0}, hedge_sla_s=0.3)
+        delays = {1_000_000: 0.6, 2_000_000: 0.05}
+
+        async def by_budget(batch, budget, risk_tolerance, esg_min, on_status=None):
+            await asyncio.sleep(delays[budget])
+            return solver.sample, "Sovereign Quantum (Kipu Hub - Job hub-1)"
+
+        solver._planqk_solve_async = by_budget
+        results = {}
+        threads = [
+            threading.Thread(target=lambda b=b: results.setdefault(b, solver.optimize(tiers, b, 50, 60)))
+            for b in delays
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert results[1_000_000].solver_type == "Sandbox (EU Fallback)"
+        assert results[2_000_000].solver_type == "Sovereign Quantum (Kipu Hub)"
+
+    async def test_async_solves_hold_no_thread_while_waiting(self, tiers):
+        """GIVEN more slow hub jobs than hedge threads, WHEN awaited together, THEN they wait concurrently."""
+        solver = _ScriptedHub(0.3, sample={0: 0, 1: 1, 2: 0})
+        solver.hedge = False
+
+        start = time.monotonic()
+        results = await asyncio.gather(*[solver.optimize_async(tiers, 1_000_000, 50, 60) for _ in range(24)])
+
+        assert time.monotonic() - start < 0.8
+        assert all(r.solver_type == "Sovereign Quantum (Kipu Hub)" for r in results)
+
+    def test_hanging_hub_opens_breaker(self, tiers, monkeypatch):
+        """GIVEN a hub that never answers, WHEN the hedge keeps cancelling it, THEN the breaker opens."""
+        health = ProviderHealth("planqk", consecutive_failures=3, slow_call_s=20.0)
+        monkeypatch.setattr(planqk_solver, "provider_health", lambda name: health)
+
+        class _HangingHub(_ScriptedHub):
+            async def _planqk_solve_async(self, batch, budget, risk_tolerance, esg_min, on_status=None):
+                with health.guard():
+                    await asyncio.sleep(60)
+
+        solver = _HangingHub(0.0, hedge_sla_s=0.05)
+        for _ in range(3):
+            assert solver.optimize(tiers, 1_000_000, 50, 60).solver_type == "Sandbox (EU Fallback)"
+
+        assert health.state == OPEN
+        assert health.snapshot()["consecutive_failures"] == 3
+
+    def test_failing_token_endpoint_opens_breaker(self, tiers, monkeypatch):
+        """GIVEN a token endpoint that keeps failing, WHEN solved without hedging, THEN the breaker opens and stops fetching."""
+        health = ProviderHealth("planqk", consecutive_failures=3)
+        monkeypatch.setattr(planqk_solver, "provider_health", lambda name: health)
+        monkeypatch.setenv("PLANQK_SERVICE_URL", "https://hub.invalid/token-breaker")
+        monkeypatch.setenv("PLANQK_ACCESS_KEY", "token-breaker")
+        monkeypatch.setenv("PLANQK_SECRET_KEY", "secret")
+        monkeypatch.delenv("PLANQK_PERSONAL_ACCESS_TOKEN", raising=False)
+        fetches = []
+
+        def unreachable(self):
+            fetches.append(1)
+            raise ConnectionError("gateway unreachable")
+
+        monkeypatch.setattr(PlanQKSolver, "_fetch_token", unreachable)
+        solver = PlanQKSolver(hedge=False)
+        for _ in range(4):
+            assert solver.optimize(tiers, 1_000_000, 50, 60).solver_type == "Sandbox (EU Fallback)"
+
+        assert health.state == OPEN
+        assert len(fetches) == 3
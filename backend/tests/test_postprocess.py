@@ -0,0 +1,75 @@
+"""Unit Tests for constraint-aware post-processing of solver sample sets."""
+import pytest
+import numpy as np
+import dimod
+from domain.entities import SCFTier, SCFTierBatch
+from infrastructure.quantum.allocation_lp import solve_allocation_lp
+from infrastructure.quantum.classical_solver import ClassicalSolver
+from infrastructure.quantum.postprocess import postprocess, sample_states
+from infrastructure.quantum.dwave_solver import DWaveSolver
+
+
+@pytest.fixture
+def batch():
+    """Two safe low-yield suppliers, two risky high-yield ones."""
+    return SCFTierBatch.from_tiers([
+        SCFTier("EU_001", 1, 10.0, 5.0, 5.0, 90.0, 1000000),
+        SCFTier("EU_002", 1, 20.0, 7.0, 5.0, 80.0, 1000000),
+        SCFTier("ASIA_003", 2, 70.0, 15.0, 20.0, 50.0, 1000000),
+        SCFTier("ASIA_004", 3, 80.0, 18.0, 25.0, 40.0, 1000000),
+    ])
+
+
+class TestPostprocess:
+    """Tests for postprocess and sample_states."""
+
+    def test_sample_states_orders_by_energy(self):
+        """GIVEN a SampleSet, WHEN converted, THEN rows follow variable order with the lowest energy first."""
+        response = dimod.SampleSet.from_samples(
+            ([[1, 0, 1], [0, 1, 0]], [2, 0, 1]), dimod.BINARY, energy=[3.0, -1.0]
+        )
+
+        X = sample_states(response, 3)
+
+        assert X.tolist() == [[1, 0, 0], [0, 1, 1]]
+
+    def test_best_feasible_sample_beats_first(self, batch):
+        """GIVEN a risky lowest-energy sample, WHEN post-processed, THEN the best feasible sample is used."""
+        samples = np.array([[0, 0, 1, 1], [1, 0, 0, 0], [1, 1, 0, 0], [1, 1, 0, 0]])
+
+        choice = postprocess(batch, samples, risk_tolerance=40, esg_min=70)
+
+        assert choice.feasible and not choice.resized
+        assert choice.indices.tolist() == [0, 1]
+        assert choice.weights.tolist() == [0.5, 0.5]
+        assert choice.distinct == 3 and choice.num_feasible == 2
+
+    def test_nothing_feasible_keeps_lowest_energy_sample(self, batch):
+        """GIVEN only infeasible samples, WHEN post-processed, THEN the first sample is kept at equal weights."""
+        samples = np.array([[0, 0, 1, 1], [0, 0, 1, 0]])
+
+        choice = postprocess(batch, samples, risk_tolerance=40, esg_min=70)
+
+        assert not choice.feasible
+        assert choice.indices.tolist() == [2, 3]
+        assert "lowest-energy sample kept" in choice.describe(40, 70)
+
+    def test_resizing_matches_lp_on_the_subset(self, batch):
+        """GIVEN top_k, WHEN an infeasible equal-weight subset can be re-weighted, THEN the LP's allocation wins."""
+        samples = np.array([[1, 1, 1, 1]])
+        objective = ClassicalSolver._objective(batch)
+
+        choice = postprocess(batch, samples, risk_tolerance=40, esg_min=70, top_k=4)
+
+        lp = solve_allocation_lp(objective, batch.risk_score, batch.esg_score, 40, 70)
+        assert choice.feasible and choice.resized
+        assert choice.weights @ objective[choice.indices] == pytest.approx(lp.objective)
+        assert choice.risk <= 40 + 1e-9 and choice.esg >= 70 - 1e-9
+
+    def test_solver_logs_post_processing(self, batch):
+        """GIVEN a book, WHEN the D-Wave solver runs, THEN post-processing is logged and the budget fully allocated."""
+        result = DWaveSolver().optimize(batch, 1_000_000, 40, 70)
+
+        assert "Post-processing:" in result.solver_logs
+        weights = result.allocations.allocated_amount / 1_000_000
+        assert weights.sum() == pytest.approx(1.0)
@@ -0,0 +1,78 @@
+"""Unit Tests for the QUBO presolve (persistency fixing and duplicate capping)."""
+import pytest
+import numpy as np
+from domain.entities import SCFTierBatch
+from infrastructure.quantum.qubo import QUBOCompiler
+from infrastructure.quantum.ground_state import GrayCodeEnumerator
+from infrastructure.quantum.presolve import presolve
+from infrastructure.quantum.dwave_solver import DWaveSolver
+
+
+def _book(n, seed, distinct):
+    """n suppliers drawn from `distinct` profiles, so most rows are exact duplicates."""
+    rng = np.random.default_rng(seed)
+    profile = rng.integers(0, distinct, n)
+    return SCFTierBatch.from_columns(
+        [f"R{r}_{i}" for i, r in enumerate(rng.integers(0, 3, distinct)[profile])],
+        rng.integers(1, 4, distinct)[profile],
+        np.round(rng.uniform(5, 60, distinct), 0)[profile],
+        np.round(rng.uniform(2, 18, distinct), 1)[profile],
+        np.ones(n),
+        np.round(rng.uniform(40, 95, distinct), 0)[profile],
+        np.ones(n),
+    )
+
+
+class TestPresolve:
+    """Tests for presolve."""
+
+    @pytest.mark.parametrize("formulation", ["dwave", "planqk", "ibm", "kipu"])
+    @pytest.mark.parametrize("seed", range(5))
+    def test_core_optimum_expands_to_full_optimum(self, formulation, seed):
+        """GIVEN a book with duplicates, WHEN presolved, THEN the core's ground state expands to a full ground state."""
+        model = QUBOCompiler().compile(_book(14, seed, distinct=6), formulation)
+        presolved = presolve(model)
+
+        core = GrayCodeEnumerator().solve(presolved.core)
+        sample = presolved.expand(dict(enumerate(core.state.tolist())))
+        state = np.array([sample[i] for i in range(model.num_variables)])
+
+        full = GrayCodeEnumerator().solve(model).energy
+        assert model.energies(state)[0] == pytest.approx(full)
+        assert core.energy + presolved.offset == pytest.approx(full)
+
+    def test_duplicates_are_capped_and_hints_kept(self):
+        """GIVEN 400 suppliers from 40 profiles, WHEN presolved, THEN duplicate copies are fixed and the core keeps its hints."""
+        model = QUBOCompiler().compile(_book(400, 1, distinct=40), "planqk")
+
+        presolved = presolve(model)
+
+        assert presolved.fixed_by["duplicate capping"] > 0
+        assert presolved.core.num_variables < model.num_variables
+        assert len(presolved.core.blocks) == len(model.blocks)
+        assert len(presolved.core.windows[0][0]) == presolved.core.num_variables
+
+    def test_restrict_keeps_free_variables(self):
+        """GIVEN a full warm-start state, WHEN restricted, THEN it holds the core variables in order."""
+        model = QUBOCompiler().compile(_book(50, 2, distinct=10), "ibm")
+        presolved = presolve(model)
+        state = np.arange(model.num_variables) % 2
+
+        assert presolved.restrict(state).tolist() == state[presolved.free].tolist()
+        assert presolved.restrict(None) is None
+
+    def test_can_be_disabled(self, monkeypatch):
+        """GIVEN QUBO_PRESOLVE=0, WHEN presolved, THEN the model is sampled as is."""
+        monkeypatch.setenv("QUBO_PRESOLVE", "0")
+        model = QUBOCompiler().compile(_book(30, 3, distinct=5), "dwave")
+
+        presolved = presolve(model)
+
+        assert presolved.core is model
+        assert presolved.num_fixed == 0
+
+    def test_solver_logs_presolve(self):
+        """GIVEN a book, WHEN the D-Wave solver runs, THEN its logs report the presolve."""
+        result = DWaveSolver().optimize(_book(60, 4, distinct=12), 1_000_000, 50, 60)
+
+        assert "Presolve: 60 ->" in result.solver_logs
@@ -0,0 +1,100 @@
+"""Unit Tests for provider health tracking and the circuit breaker."""
+import asyncio
+
+import pytest
+from infrastructure.http.health import ProviderHealth, CircuitOpenError, CLOSED, OPEN, HALF_OPEN
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return _Clock()
+
+
+@pytest.fixture
+def health(clock):
+    return ProviderHealth("hub", consecutive_failures=3, cooldown_s=30, slow_call_s=5, clock=clock)
+
+
+class TestProviderHealth:
+    """Tests for ProviderHealth."""
+
+    def test_consecutive_failures_open_the_breaker(self, health):
+        """GIVEN three failed calls, WHEN a fourth is attempted, THEN it is rejected without running."""
+        for _ in range(3):
+            assert health.allow()
+            health.record(False, 0.1)
+
+        assert health.state == OPEN
+        with pytest.raises(CircuitOpenError):
+            with health.guard():
+                pytest.fail("remote call must not run while OPEN")
+        assert health.snapshot()["rejected"] == 1
+
+    def test_slow_calls_count_as_errors(self, health):
+        """GIVEN calls slower than slow_call_s, WHEN recorded, THEN they trip the breaker like errors."""
+        for _ in range(3):
+            health.record(True, 6.0)
+
+        assert health.state == OPEN
+        assert health.snapshot()["ewma_latency_ms"] == pytest.approx(6000.0)
+
+    def test_half_open_allows_one_probe_then_closes_on_success(self, health, clock):
+        """GIVEN an open breaker past its cooldown, WHEN probed, THEN one call goes out and success closes it."""
+        for _ in range(3):
+            health.record(False, 0.1)
+        clock.now = 31.0
+
+        assert health.allow()
+        assert health.state == HALF_OPEN
+        assert not health.allow()
+        health.record(True, 0.2)
+
+        assert health.state == CLOSED
+        assert health.error_rate == 0.0
+
+    def test_failed_probe_reopens_for_another_cooldown(self, health, clock):
+        """GIVEN a half-open breaker, WHEN the probe fails, THEN it re-opens from the probe time."""
+        for _ in range(3):
+            health.record(False, 0.1)
+        clock.now = 31.0
+        with pytest.raises(RuntimeError):
+            with health.guard():
+                raise RuntimeError("still down")
+
+        assert health.state == OPEN
+        assert health.snapshot()["retry_in_s"] == pytest.approx(30.0)
+
+    async def test_cancelled_probe_frees_the_slot(self, health, clock):
+        """GIVEN a half-open probe cancelled mid-flight, WHEN finished, THEN another probe may go out."""
+        for _ in range(3):
+            health.record(False, 0.1)
+        clock.now = 31.0
+
+        async def probe():
+            with health.guard():
+                await asyncio.sleep(10)
+
+        task = asyncio.ensure_future(probe())
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        assert health.state == HALF_OPEN
+        assert health.allow()
+
+    def test_error_rate_trips_after_min_calls(self, clock):
+        """GIVEN alternating failures, WHEN the EWMA error rate crosses the threshold, THEN the breaker opens."""
+        health = ProviderHealth("hub", alpha=0.5, error_threshold=0.6, min_calls=4, consecutive_failures=99, clock=clock)
+        for ok in (True, False, True, False, False):
+            health.record(ok, 0.1)
+
+        assert health.state == OPEN
@@ -0,0 +1,87 @@
+"""Unit Tests for the shared QUBO compilation layer."""
+import pytest
+import numpy as np
+from domain.entities import SCFTier, SCFTierBatch
+from infrastructure.quantum.qubo import QUBOCompiler
+
+
+@pytest.fixture
+def sample_tiers():
+    """Create sample SCF tiers across two regions and tiers."""
+    return [
+        SCFTier("EU_001", 1, 15.0, 8.5, 12.0, 85.0, 2500000),
+        SCFTier("EU_002", 1, 18.0, 10.0, 18.0, 75.0, 1800000),
+        SCFTier("ASIA_003", 2, 35.0, 12.0, 25.0, 70.0, 950000),
+        SCFTier("ASIA_004", 3, 45.0, 15.0, 32.0, 65.0, 450000),
+    ]
+
+
+@pytest.fixture
+def compiler():
+    return QUBOCompiler(max_entries=2)
+
+
+class TestQUBOCompiler:
+    """Tests for QUBOCompiler formulations and caching."""
+
+    def test_dwave_matches_dict_formulation(self, compiler, sample_tiers):
+        """GIVEN tiers, WHEN compiled for dwave, THEN dict form equals the original double loop."""
+        Q = compiler.compile(sample_tiers, "dwave").to_dict()
+
+        n = len(sample_tiers)
+        expected = {(i, i): -t.yield_pct + 0.5 * t.risk_score for i, t in enumerate(sample_tiers)}
+        expected.update({(i, j): 500 / n for i in range(n) for j in range(i + 1, n)})
+        assert Q == expected
+
+    def test_ibm_couplings_are_sparse(self, compiler, sample_tiers):
+        """GIVEN two regions, WHEN compiled for ibm, THEN only correlated pairs are stored."""
+        model = compiler.compile(sample_tiers, "ibm")
+
+        pairs = dict(zip(zip(model.rows.tolist(), model.cols.tolist()), model.values.tolist()))
+        assert pairs == {(0, 1): 6.0, (2, 3): 4.5}
+
+    def test_bucketed_couplings_match_brute_force(self, compiler):
+        """GIVEN a random book, WHEN planqk/ibm are compiled, THEN couplings equal the all-pairs check."""
+        rng = np.random.default_rng(7)
+        n = 120
+        ids = [f"R{rng.integers(0, 5)}_{i}" for i in range(n)]
+        tier = rng.integers(1, 5, n)
+        risk = np.round(rng.uniform(0, 60, n), 1)
+        batch = SCFTierBatch.from_columns(ids, tier, risk, np.full(n, 8.0), np.ones(n), np.full(n, 70.0), np.ones(n))
+
+        planqk, ibm = {}, {}
+        for i in range(n):
+            for j in range(i + 1, n):
+                p = 500 * (tier[i] == tier[j]) + 1200 * (abs(risk[i] - risk[j]) < 5)
+                if p:
+                    planqk[(i, j)] = p / n
+                p = 4.5 * (ids[i].split('_')[0] == ids[j].split('_')[0]) + 1.5 * (tier[i] == tier[j])
+                if p:
+                    ibm[(i, j)] = p
+
+        for formulation, expected in (("planqk", planqk), ("ibm", ibm)):
+            model = compiler.compile(batch, formulation)
+            pairs = dict(zip(zip(model.rows.tolist(), model.cols.tolist()), model.values.tolist()))
+            assert pairs == expected
+
+    def test_energies_match_bqm(self, compiler, sample_tiers):
+        """GIVEN a compiled model, WHEN energies are evaluated in bulk, THEN they match dimod."""
+        model = compiler.compile(sample_tiers, "planqk")
+        bqm = model.to_bqm()
+        states = np.array([[1, 1, 0, 0], [0, 1, 1, 1], [1, 1, 1, 1]])
+
+        expected = [bqm.energy(dict(enumerate(s.tolist()))) for s in states]
+        assert model.energies(states) == pytest.approx(expected)
+
+    def test_cache_keys_on_content_and_params(self, compiler, sample_tiers):
+        """GIVEN repeated compiles, WHEN content and params match, THEN the cached model is reused."""
+        first = compiler.compile(sample_tiers, "dwave")
+
+        assert compiler.compile(SCFTierBatch.from_tiers(sample_tiers), "dwave") is first
+        assert compiler.compile(sample_tiers, "dwave", penalty=250.0) is not first
+        assert compiler.stats()["hits"] == 1
+
+    def test_unknown_formulation_raises(self, compiler, sample_tiers):
+        """GIVEN an unknown formulation, WHEN compiled, THEN ValueError is raised."""
+        with pytest.raises(ValueError, match="Unknown QUBO formulation"):
+            compiler.compile(sample_tiers, "annealer-x")
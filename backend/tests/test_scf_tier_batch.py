@@ -0,0 +1,82 @@
+"""Unit Tests for columnar SCFTierBatch / AllocationBatch."""
+import pytest
+import numpy as np
+from domain.entities import SCFTier, SCFTierBatch, AllocationBatch, OptimizationResult, Allocation
+
+
+@pytest.fixture
+def sample_tiers():
+    """Create sample SCF tiers for testing."""
+    return [
+        SCFTier("SUP_001", 1, 15.0, 8.5, 12.0, 85.0, 2500000),
+        SCFTier("SUP_002", 1, 25.0, 10.0, 18.0, 75.0, 1800000),
+        SCFTier("SUP_003", 2, 35.0, 12.0, 25.0, 70.0, 950000),
+    ]
+
+
+class TestSCFTierBatch:
+    """Tests for SCFTierBatch."""
+
+    def test_round_trip_preserves_tiers(self, sample_tiers):
+        """GIVEN tiers, WHEN converted to a batch and back, THEN entities are equal."""
+        batch = SCFTierBatch.from_tiers(sample_tiers)
+
+        assert len(batch) == 3
+        assert batch.to_tiers() == sample_tiers
+        assert batch[1] == sample_tiers[1]
+
+    def test_columns_are_typed_arrays(self, sample_tiers):
+        """GIVEN a batch, WHEN inspected, THEN each field is a numpy column."""
+        batch = SCFTierBatch.from_tiers(sample_tiers)
+
+        assert batch.tier.dtype == np.int32
+        assert batch.risk_score.dtype == np.float64
+        assert batch.nbytes / len(batch) < 64
+
+    def test_content_hash_tracks_values(self, sample_tiers):
+        """GIVEN two batches, WHEN one value differs, THEN hashes differ."""
+        a = SCFTierBatch.from_tiers(sample_tiers)
+        b = SCFTierBatch.from_tiers(sample_tiers[:2] + [SCFTier("SUP_003", 2, 36.0, 12.0, 25.0, 70.0, 950000)])
+
+        assert a.content_hash() == SCFTierBatch.from_tiers(sample_tiers).content_hash()
+        assert a.content_hash() != b.content_hash()
+
+    def test_apply_delta_matches_by_supplier_id(self, sample_tiers):
+        """GIVEN a delta that changes, adds and removes suppliers, WHEN applied, THEN rows update in place."""
+        batch = SCFTierBatch.from_tiers(sample_tiers)
+        upserts = SCFTierBatch.from_tiers([
+            SCFTier("SUP_004", 3, 45.0, 15.0, 32.0, 65.0, 450000),
+            SCFTier("SUP_002", 1, 20.0, 11.0, 18.0, 75.0, 1800000),
+        ])
+
+        updated = batch.apply_delta(upserts, ["SUP_001"])
+
+        assert updated.supplier_ids.tolist() == ["SUP_002", "SUP_003", "SUP_004"]
+        assert updated.yield_pct.tolist() == [11.0, 12.0, 15.0]
+        assert updated.tier.dtype == np.int32
+
+
+class TestAllocationBatch:
+    """Tests for AllocationBatch."""
+
+    def test_equal_weight_allocation(self, sample_tiers):
+        """GIVEN two selected suppliers, WHEN equally weighted, THEN budget splits in half."""
+        batch = SCFTierBatch.from_tiers(sample_tiers)
+        allocs = AllocationBatch.equal_weight(batch, [0, 2], 1_000_000)
+
+        assert allocs.supplier_ids.tolist() == ["SUP_001", "SUP_003"]
+        assert allocs.allocated_amount.tolist() == [500_000, 500_000]
+        assert allocs.total_yield == pytest.approx(500_000 * (8.5 + 12.0) / 100)
+        assert allocs.total_risk == pytest.approx(0.5 * 15.0 + 0.5 * 35.0)
+
+    def test_optimization_result_accepts_allocation_list(self):
+        """GIVEN a list of Allocation, WHEN building a result, THEN it is stored columnar."""
+        result = OptimizationResult(
+            allocations=[Allocation("SUP_001", 100.0, 8.0, 1.5)],
+            total_yield=8.0, total_risk=1.5, solver_type="classical", solve_time_ms=1.0
+        )
+
+        assert isinstance(result.allocations, AllocationBatch)
+        assert result.allocations.to_records() == [
+            {"supplier_id": "SUP_001", "allocated_amount": 100.0, "expected_return": 8.0, "risk_contribution": 1.5}
+        ]
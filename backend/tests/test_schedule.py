@@ -0,0 +1,123 @@
+"""Unit Tests for tuned annealing schedules (time-to-target, Pareto front, lookup table)."""
+import functools
+import math
+import pytest
+from infrastructure.quantum.qubo import QUBOCompiler
+from infrastructure.quantum.annealer import VectorizedAnnealer, local_sampler
+from infrastructure.quantum.ground_state import energy_reference
+from infrastructure.quantum.schedule import (
+    AnnealSchedule, ScheduleEntry, ScheduleTable, Trial, density, pareto_front, time_to_target, tuned_schedule,
+)
+from infrastructure.quantum.dwave_solver import DWaveSolver
+
+
+@pytest.fixture
+def book(make_book):
+    return functools.partial(make_book, seed=5)
+
+
+def _model(batch, formulation="ibm"):
+    return QUBOCompiler().compile(batch, formulation)
+
+
+def _entry(n, d, sweeps, backend="vectorized"):
+    return ScheduleEntry(backend, "ibm", n, d, AnnealSchedule(sweeps, (1.0, 1.0), 10, f"n={n}"), 1.0)
+
+
+class TestTrials:
+    """Tests for Trial and pareto_front."""
+
+    def test_time_to_target(self):
+        """GIVEN per-call success probabilities, WHEN scored, THEN TTT is the time to 99% success."""
+        assert Trial(10, (1, 1), 10, 5.0, 0.995).ttt_ms == 5.0
+        assert Trial(10, (1, 1), 10, 5.0, 0.9).ttt_ms == pytest.approx(10.0)
+        assert math.isinf(Trial(10, (1, 1), 10, 5.0, 0.0).ttt_ms)
+
+    def test_pareto_front_drops_dominated_trials(self):
+        """GIVEN a slower, less reliable trial, WHEN the front is built, THEN it is left out."""
+        fast = Trial(10, (1, 1), 10, 1.0, 0.5)
+        slow_bad = Trial(50, (1, 1), 10, 4.0, 0.4)
+        slow_good = Trial(100, (1, 1), 10, 8.0, 1.0)
+
+        assert pareto_front([slow_bad, slow_good, fast]) == [fast, slow_good]
+
+    def test_time_to_target_against_exact_reference(self, book):
+        """GIVEN a small model and its exact ground state, WHEN the grid runs, THEN every point is measured."""
+        model = _model(book(14))
+        reference = energy_reference(model)
+
+        trials = time_to_target(model, (10, 50), ((1.0, 1.0), (0.3, 1.0)), (5, 20), reference=reference.energy)
+
+        assert len(trials) == 8
+        assert all(t.time_ms > 0 and 0 <= t.success <= 1 for t in trials)
+        entry = ScheduleEntry.from_trials(model, trials, "vectorized")
+        assert entry.ttt_ms == min(t.ttt_ms for t in pareto_front(trials))
+        assert entry.density == pytest.approx(density(model))
+
+
+class TestScheduleTable:
+    """Tests for ScheduleTable and tuned_schedule."""
+
+    def test_lookup_nearest_size_and_density(self, book):
+        """GIVEN entries of different sizes and densities, WHEN looked up, THEN the nearest on the same backend wins."""
+        model = _model(book(60))
+        d = density(model)
+        table = ScheduleTable((
+            _entry(16, d, 10), _entry(512, d, 200), _entry(64, 0.0, 50), _entry(64, d, 999, backend="neal"),
+        ))
+
+        assert table.lookup(model, "vectorized").num_sweeps == 10
+        assert table.lookup(_model(book(400)), "vectorized").num_sweeps == 200
+        assert table.lookup(model, "neal").num_sweeps == 999
+        assert table.lookup(model, "unknown") == AnnealSchedule()
+
+    def test_round_trip(self, tmp_path):
+        """GIVEN a saved table, WHEN loaded, THEN its schedules come back."""
+        path = str(tmp_path / "schedules.json")
+        ScheduleTable((_entry(16, 0.5, 10), _entry(512, 0.5, 200))).save(path)
+
+        table = ScheduleTable.load(path)
+
+        assert [e.schedule.num_sweeps for e in table.entries] == [10, 200]
+        assert ScheduleTable.load(str(tmp_path / "missing.json")).entries == ()
+
+    def test_tuned_schedule_from_environment(self, book, tmp_path, monkeypatch):
+        """GIVEN ANNEAL_SCHEDULES, WHEN a schedule is requested, THEN it comes from that table unless disabled."""
+        path = str(tmp_path / "schedules.json")
+        ScheduleTable((_entry(16, 0.5, 33),)).save(path)
+        monkeypatch.setenv("ANNEAL_SCHEDULES", path)
+
+        assert tuned_schedule(_model(book(20)), "vectorized").num_sweeps == 33
+        monkeypatch.setenv("ANNEAL_AUTOTUNE", "0")
+        assert tuned_schedule(_model(book(20)), "vectorized") == AnnealSchedule()
+
+
+class TestScheduledSamplers:
+    """Tests for samplers built from a schedule."""
+
+    def test_local_sampler_takes_sweeps_and_beta_scale(self, book):
+        """GIVEN a schedule, WHEN a sampler is built, THEN its beta range is the default one scaled."""
+        model = _model(book(30))
+        default = VectorizedAnnealer()
+        tuned = local_sampler(AnnealSchedule(40, (0.5, 2.0)), backend="vectorized")
+
+        betas = tuned._schedule(model, tuned._kernels(model))
+        base = default._schedule(model, default._kernels(model))
+        assert len(betas) == 40
+        assert betas[0] == pytest.approx(base[0] * 0.5)
+        assert betas[-1] == pytest.approx(base[-1] * 2.0)
+
+    def test_neal_sampler_takes_schedule(self, book):
+        """GIVEN a neal schedule, WHEN sampled, THEN the reads come back at the requested count."""
+        model = _model(book(20))
+        sampler = local_sampler(AnnealSchedule(50, (1.0, 0.5)), backend="neal")
+
+        response = sampler.sample(model, num_reads=8, seed=1)
+
+        assert sampler.num_sweeps == 50 and len(response) == 8
+
+    def test_solver_logs_schedule(self, book):
+        """GIVEN a book, WHEN the D-Wave solver falls back to simulation, THEN its logs report the schedule."""
+        result = DWaveSolver().optimize(book(20), 1_000_000, 50, 60)
+
+        assert "Schedule:" in result.solver_logs
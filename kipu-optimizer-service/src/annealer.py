@@ -0,0 +1,104 @@
+"""
+Vectorised simulated annealing for diagonal + cardinality QUBOs.
+
+The service QUBO is  E(x) = linear . x + c * k(k-1)/2  with k = sum(x): a flat penalty on
+every pair. A flip's energy delta only needs the running count k, so all reads anneal
+together as one (num_reads, n) array without ever building the n^2 couplings.
+
+Vendored on purpose: the service is built and deployed to PlanQK from this directory
+alone, so it cannot import the backend. The kernel is a copy of the cardinality path of
+the backend's infrastructure/quantum/annealer.py (same RNG draws, schedule and descent)
+and backend/tests/test_kipu_service.py checks that both return the same states for a
+fixed book and seed; change them together. Its schedule table is separate too:
+scripts/tune_anneal_schedules.py writes it from the full Kipu models the service
+anneals, while the backend's table is tuned on presolved cores.
+"""
+import json
+import os
+from functools import lru_cache
+
+import numpy as np
+
+# Sweeps / beta scaling / reads per problem size, written by scripts/tune_anneal_schedules.py
+SCHEDULES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "anneal_schedules.json")
+
+
+def energies(linear: np.ndarray, coupling: float, X: np.ndarray) -> np.ndarray:
+    k = X.sum(axis=1)
+    return X @ linear + coupling * k * (k - 1) / 2
+
+
+@lru_cache(maxsize=1)
+def _schedules() -> tuple:
+    if not os.path.exists(SCHEDULES_PATH):
+        return ()
+    with open(SCHEDULES_PATH) as f:
+        return tuple(json.load(f).get("entries", []))
+
+
+def tuned_schedule(n: int) -> dict:
+    """
+    anneal_cardinality keyword arguments tuned offline for the nearest benchmarked size
+    (in log2 n); the service QUBO is always fully coupled, so size is the only key.
+    Empty (the defaults) without a table.
+    """
+    entries = _schedules()
+    if not entries or n < 1:
+        return {}
+    nearest = min(entries, key=lambda e: abs(np.log2(max(e["num_variables"], 1)) - np.log2(n)))
+    return {
+        "num_sweeps": nearest["num_sweeps"],
+        "beta_scale": tuple(nearest["beta_scale"]),
+        "num_reads": nearest["num_reads"],
+    }
+
+
+def anneal_cardinality(
+    linear: np.ndarray,
+    coupling: float,
+    num_reads: int = 50,
+    seed: int = 42,
+    num_sweeps: int = 100,
+    max_chunks: int = 16,
+    beta_scale: tuple = (1.0, 1.0),
+) -> tuple[np.ndarray, np.ndarray]:
+    """Returns (states, energies) for all reads; states is (num_reads, n) of 0/1."""
+    rng = np.random.default_rng(seed)
+    n = len(linear)
+    X = rng.integers(0, 2, size=(num_reads, n)).astype(np.float64)
+    if n == 0:
+        return X, np.zeros(num_reads)
+
+    # neal-style geometric schedule: hot = ln2 / max delta, cold = ln100 / min delta
+    magnitudes = np.abs(np.append(linear, coupling))
+    magnitudes = magnitudes[magnitudes > 0]
+    max_delta = float(np.max(np.abs(linear)) + abs(coupling) * (n - 1)) or 1.0
+    min_delta = float(magnitudes.min()) if len(magnitudes) else 1.0
+    hot, cold = np.log(2) / max_delta * beta_scale[0], np.log(100) / min_delta * beta_scale[1]
+    betas = np.geomspace(hot, max(cold, hot), num_sweeps)
+
+    k = X.sum(axis=1)
+    slices = np.array_split(rng.permutation(n), min(n, max_chunks))
+    for beta in betas:
+        for idx in slices:
+            x = X[:, idx]
+            delta = (1 - 2 * x) * (linear[idx] + coupling * (k[:, None] - x))
+            accept = beta * delta < rng.standard_exponential(delta.shape)
+            step = np.where(accept, 1 - 2 * x, 0.0)
+            X[:, idx] = x + step
+            k += step.sum(axis=1)
+
+    # Greedy single-flip descent so every read ends on a local minimum
+    reads = np.arange(num_reads)
+    for _ in range(n):
+        delta = (1 - 2 * X) * (linear + coupling * (k[:, None] - X))
+        best = delta.argmin(axis=1)
+        improving = delta[reads, best] < -1e-12
+        if not improving.any():
+            break
+        rows, cols = reads[improving], best[improving]
+        flip = 1 - 2 * X[rows, cols]
+        X[rows, cols] += flip
+        k[rows] += flip
+
+    return X, energies(linear, coupling, X)
@@ -2,7 +2,8 @@ import time
 from typing import Dict, Any, List
 from pydantic import BaseModel, Field
 import numpy as np
-import neal
+
+from .annealer import anneal_cardinality, tuned_schedule
 
 class SCFTierInput(BaseModel):
     supplier_id: str
@@ -26,31 +27,30 @@ class CalculationResult(BaseModel):
 def run(data: InputData, params: InputParams) -> CalculationResult:
     """
     Kipu-Native SCF Optimization.
-    Using Simulated Annealing (Neal) inside the Kipu Managed Service as a first step.
+    Using Simulated Annealing (vectorised, see annealer.py) inside the Kipu Managed Service as a first step.
     Can be upgraded to real QPU via Planqk Quantum Provider.
     """
     start_time = time.time()
     
-    # 1. Build QUBO
+    # 1. Build QUBO as arrays
     tiers = data.tiers
     n = len(tiers)
-    Q = {}
-    
-    for i, tier in enumerate(tiers):
-        # ESG-weighted objective
-        esg_bonus = tier.esg_score / 100.0
-        Q[(i, i)] = -tier.yield_pct + (0.5 * tier.risk_score) - esg_bonus
-    
-    # Penalty for over-concentration
+    yield_pct = np.array([t.yield_pct for t in tiers], dtype=np.float64)
+    risk_score = np.array([t.risk_score for t in tiers], dtype=np.float64)
+    esg_score = np.array([t.esg_score for t in tiers], dtype=np.float64)
+
+    # ESG-weighted objective
+    linear = -yield_pct + (0.5 * risk_score) - esg_score / 100.0
+
+    # Penalty for over-concentration (same coupling on every pair = a cardinality term)
     penalty = 800
-    for i in range(n):
-        for j in range(i + 1, n):
-            Q[(i, j)] = penalty / n
-            
-    # 2. Solve using Neal (Simulated Annealing)
-    sampler = neal.SimulatedAnnealingSampler()
-    response = sampler.sample_qubo(Q, num_reads=50, seed=42)
-    sample = response.first.sample
+    coupling = penalty / n if n else 0.0
+
+    # 2. Solve with the vectorised annealer (all reads in one array, no n^2 couplings),
+    # with the sweeps / beta range / reads tuned for this problem size
+    schedule = {"num_reads": 50, **tuned_schedule(n)}
+    states, energies = anneal_cardinality(linear, coupling, seed=42, **schedule)
+    sample = dict(enumerate(states[int(np.argmin(energies))].astype(int).tolist()))
     
     # 3. Format Result
     selected_suppliers = [tiers[i].supplier_id for i, v in sample.items() if v == 1]
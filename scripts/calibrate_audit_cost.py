@@ -0,0 +1,72 @@
+import json
+import os
+import sys
+import time
+
+import networkx as nx
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from domain.topological_core import SupplyChainContagionAuditor
+from governance.complexity_governor import AuditCostModel, ComplexityGovernor, TenantBudget
+
+BENCHMARK_DIR = "dashboard/public"
+BENCHMARKS = ["red_sea_mesh", "bmw_digital_twin_v1", "hardened_proxy_auto", "real_world_proxy_auto"]
+
+
+def load_benchmark(name):
+    with open(os.path.join(BENCHMARK_DIR, f"{name}.json"), "r") as f:
+        data = json.load(f)
+    suppliers = [
+        {"id": str(n.get("id")), "tier": str(n.get("tier", "4")), "spend": float(n.get("spend", 0.0))}
+        for n in data["nodes"]
+    ]
+    dependencies = [(str(u), str(v)) for u, v in data["edges"]]
+    return suppliers, dependencies
+
+
+def calibrate():
+    """
+    Times the Flow Sentinel audit on every benchmark graph with an unlimited budget
+    and fits AuditCostModel's per-max-flow cost curve to the measurements.
+    """
+    governor = ComplexityGovernor(default_budget=TenantBudget(cpu_ms=float("inf"), memory_mb=float("inf")))
+    auditor = SupplyChainContagionAuditor(governor=governor)
+
+    calls = []
+    original = nx.maximum_flow_value
+
+    def counted_max_flow(*args, **kwargs):
+        calls.append(1)
+        return original(*args, **kwargs)
+
+    nx.maximum_flow_value = counted_max_flow
+    samples = []
+    try:
+        for name in BENCHMARKS:
+            suppliers, dependencies = load_benchmark(name)
+            edges = [{"source": u, "target": v} for u, v in dependencies]
+            depth = AuditCostModel.graph_depth(suppliers, edges)
+
+            calls.clear()
+            start = time.perf_counter()
+            result = auditor.audit_contagion_risk(
+                suppliers, sum(s["spend"] for s in suppliers), "bafin_standard", dependencies,
+                run_adversarial_test=True
+            )
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            per_call = elapsed_ms / max(len(calls), 1)
+            samples.append((len(suppliers), len(dependencies), depth, per_call))
+            print(f"{name}: n={len(suppliers)} e={len(dependencies)} depth={depth} "
+                  f"max-flow calls={len(calls)} total={elapsed_ms:.0f}ms per-call={per_call:.2f}ms "
+                  f"status={result.get('status')}")
+    finally:
+        nx.maximum_flow_value = original
+
+    model = AuditCostModel.fit(samples)
+    print(f"\nFitted: ms_coef={model.ms_coef:.5f} ms_alpha={model.ms_alpha:.3f}")
+    return model
+
+
+if __name__ == "__main__":
+    calibrate()
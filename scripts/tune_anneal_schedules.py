@@ -0,0 +1,110 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend")
+sys.path.insert(0, BACKEND_DIR)
+
+from domain.entities import SCFTierBatch
+from infrastructure.quantum.qubo import QUBOCompiler
+from infrastructure.quantum.presolve import presolve
+from infrastructure.quantum.ground_state import energy_reference
+from infrastructure.quantum.schedule import SCHEDULES_PATH, ScheduleEntry, ScheduleTable, time_to_target
+
+KIPU_SERVICE_PATH = os.path.join(os.path.dirname(BACKEND_DIR), "kipu-optimizer-service", "src", "anneal_schedules.json")
+SIZES = (20, 100, 500, 2000)
+FORMULATIONS = ("dwave", "planqk", "ibm", "kipu")
+# Distinct suppliers vs. books drawn from a few profiles (many exact duplicates)
+STRUCTURES = {"distinct": 1.0, "duplicated": 0.2}
+GRIDS = {
+    "vectorized": {"sweeps": (10, 25, 50, 100, 200), "reads": (10, 25, 50, 100)},
+    "neal": {"sweeps": (100, 250, 500, 1000, 2000), "reads": (10, 25, 50, 100)},
+}
+BETA_SCALES = ((1.0, 1.0), (0.3, 1.0), (1.0, 0.3), (1.0, 3.0))
+
+
+def portfolio(n, seed, profiles=1.0):
+    """Synthetic book of n suppliers; with profiles < 1 only that share of them are distinct."""
+    rng = np.random.default_rng(seed)
+    k = max(1, int(n * profiles))
+    base = rng.integers(0, k, n) if k < n else np.arange(n)
+    region = rng.integers(0, 3, k)[base]
+    return SCFTierBatch.from_columns(
+        [f"R{r}_{i}" for i, r in enumerate(region)],
+        rng.integers(1, 4, k)[base],
+        np.round(rng.uniform(5, 60, k), 1)[base],
+        np.round(rng.uniform(2, 18, k), 1)[base],
+        np.ones(n),
+        np.round(rng.uniform(40, 95, k), 0)[base],
+        np.ones(n),
+    )
+
+
+def tune_model(model, backend, target_gap):
+    """Grid-benchmarks one model and returns its ScheduleEntry (None when there is nothing to anneal)."""
+    if model.num_variables < 2:
+        return None
+    reference = energy_reference(model)
+    grid = GRIDS[backend]
+    trials = time_to_target(
+        model, grid["sweeps"], BETA_SCALES, grid["reads"], target_gap,
+        reference=reference.energy if reference.exact else None, backend=backend,
+    )
+    return ScheduleEntry.from_trials(model, trials, backend)
+
+
+def tune(backends, sizes, target_gap, seed=7):
+    """
+    Records time-to-target for every (sweeps, beta scale, reads) grid point on generated
+    portfolios of each size, structure and formulation, and writes the lookup table the
+    solvers read at runtime (infrastructure/quantum/anneal_schedules.json). The solvers
+    sample the presolved core, so that is what gets tuned; the Kipu service anneals its
+    full model without presolve and gets its own table from the full kipu models.
+    Entries of backends not tuned in this run are kept.
+    """
+    compiler = QUBOCompiler()
+    entries = [e for e in ScheduleTable.load(SCHEDULES_PATH).entries if e.backend not in backends]
+    service = []
+    for backend in backends:
+        for n in sizes:
+            for structure, profiles in STRUCTURES.items():
+                batch = portfolio(n, seed + n, profiles)
+                for formulation in FORMULATIONS:
+                    model = compiler.compile(batch, formulation)
+                    start = time.perf_counter()
+                    entry = tune_model(presolve(model).core, backend, target_gap)
+                    if entry is not None:
+                        entries.append(entry)
+                        print(f"{backend} {formulation} {structure} n={n}: core={entry.num_variables} "
+                              f"density={entry.density:.3f} -> {entry.schedule.num_sweeps} sweeps, "
+                              f"beta x{entry.schedule.beta_scale}, {entry.schedule.num_reads} reads, "
+                              f"TTT {entry.ttt_ms:.1f}ms (front {len(entry.front)}, "
+                              f"{time.perf_counter() - start:.1f}s)")
+                    if formulation == "kipu" and backend == "vectorized" and structure == "distinct":
+                        full = tune_model(model, backend, target_gap)
+                        if full is not None:
+                            service.append(full)
+
+    ScheduleTable(tuple(entries)).save(SCHEDULES_PATH)
+    print(f"\nWrote {len(entries)} schedules to {SCHEDULES_PATH}")
+    if service:
+        with open(KIPU_SERVICE_PATH, "w") as f:
+            json.dump({"entries": [
+                {k: v for k, v in e.to_dict().items() if k in ("num_variables", "num_sweeps", "beta_scale", "num_reads")}
+                for e in service
+            ]}, f, indent=1)
+            f.write("\n")
+        print(f"Wrote {len(service)} schedules to {KIPU_SERVICE_PATH}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tune annealing schedules by time-to-target on generated portfolios.")
+    parser.add_argument("--backends", nargs="+", default=["vectorized", "neal"], choices=sorted(GRIDS))
+    parser.add_argument("--sizes", nargs="+", type=int, default=list(SIZES))
+    parser.add_argument("--target-gap", type=float, default=1e-3, help="relative energy gap that counts as a hit")
+    args = parser.parse_args()
+    tune(args.backends, args.sizes, args.target_gap)
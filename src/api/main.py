@@ -18,6 +18,9 @@ class OptimizationRequest(BaseModel):
     weather_factor: float # 0.0 - 1.0
     is_stress_event: bool
 
+class BatchOptimizationRequest(BaseModel):
+    requests: List[OptimizationRequest]
+
 @app.get("/api/health")
 async def health():
     return {"status": "healthy", "engine": "R-QAOA v2.1"}
@@ -39,6 +42,24 @@ async def optimize(request: OptimizationRequest):
         "result": result
     }
 
+@app.post("/api/optimize/batch")
+async def optimize_batch(request: BatchOptimizationRequest):
+    # Several scenarios per round trip; results keep request order
+    results = [
+        optimizer.optimize(
+            nodes=[n.dict() for n in r.nodes],
+            demand=r.total_demand_mw,
+            weather_factor=r.weather_factor,
+            is_stress=r.is_stress_event
+        )
+        for r in request.requests
+    ]
+    
+    return {
+        "status": "success",
+        "results": results
+    }
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8080)
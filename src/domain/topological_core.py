@@ -3,7 +3,7 @@ import networkx as nx
 import math
 from typing import List, Dict, Tuple, Optional
 from scipy.sparse.linalg import eigsh
-from governance.complexity_governor import ComplexityGovernor
+from governance.complexity_governor import ComplexityGovernor, APPROXIMATE
 
 class SupplyChainContagionAuditor:
     """
@@ -18,28 +18,29 @@ class SupplyChainContagionAuditor:
         "aggressive": {"pd_floor": 0.04, "lgd_floor": 0.35, "recovery_alpha": 0.6},
     }
 
-    
-    
-    
-    def audit_contagion_risk(self, suppliers: List[Dict], total_exposure: float, policy_tier: str = "bafin_standard", dependencies: List[Tuple[str, str]] = None, run_adversarial_test: bool = False):
+    def __init__(self, governor: Optional[ComplexityGovernor] = None):
+        self.governor = governor or ComplexityGovernor(inflation_cap_multiplier=1.5)
+
+    def audit_contagion_risk(self, suppliers: List[Dict], total_exposure: float, policy_tier: str = "bafin_standard", dependencies: List[Tuple[str, str]] = None, run_adversarial_test: bool = False, tenant: Optional[str] = None):
         policy = self.POLICIES.get(policy_tier, self.POLICIES["bafin_standard"])
         G = nx.DiGraph()
+        cost_estimate = None
 
         # [HARDENING v37.0] GOVERNANCE THEATER CHECK (ComplexityGovernor)
         # Before even building the graph, check for "Grok Vectors" (Data Gaming).
         if run_adversarial_test:
-            governor = ComplexityGovernor(inflation_cap_multiplier=1.5)
             # Use raw data for governance check
             nodes = suppliers
             edges = [{"source": u, "target": v} for u, v in (dependencies or [])]
             
-            passed, reasons = governor.validate_graph(nodes, edges, total_exposure)
+            passed, reasons, cost_estimate = self.governor.assess(nodes, edges, total_exposure, tenant)
             if not passed:
                 # IMMEDIATE FAIL - Do not burn CPU on max-flow for known fraud.
                 return {
                     "status": "FAILED_GOVERNANCE_CHECK", 
                     "resilience": 0.0, 
-                    "description": f"Governance Veto: {reasons[0]}"
+                    "description": f"Governance Veto: {reasons[0]}",
+                    "cost_estimate": cost_estimate.to_dict()
                 }
         
         # Build Graph
@@ -157,12 +158,23 @@ class SupplyChainContagionAuditor:
             # Simulation (N-1 / N-2)
             # BUG FIX v36.0: Pass dynamic buyer_id
             # BUG FIX v36.1: Unpack Tuple (flow, drop)
-            _, drop_percent = self._simulate_flow_shock(G, buyer_id, base_flow)
+            # [v38.0] Cost-Model Admission: N-2 candidate cap comes from the tenant budget.
+            approximate = cost_estimate.decision == APPROXIMATE
+            _, drop_percent = self._simulate_flow_shock(
+                G, buyer_id, base_flow,
+                max_candidates=cost_estimate.max_candidates,
+                approximate=approximate
+            )
             
-            if drop_percent == -1.0: # >50 Criticals
-                 return {"status": "FAILED_COMPLEXITY_CAP", "resilience": 0.0}
+            if drop_percent == -1.0: # Criticals exceed the admitted budget
+                 return {"status": "FAILED_COMPLEXITY_CAP", "resilience": 0.0, "cost_estimate": cost_estimate.to_dict()}
                  
-            return {"status": "PASSED" if (1-drop_percent)>0.8 else "FAILED", "resilience": 1-drop_percent}
+            return {
+                "status": "PASSED" if (1-drop_percent)>0.8 else "FAILED",
+                "resilience": 1-drop_percent,
+                "mode": cost_estimate.decision,
+                "cost_estimate": cost_estimate.to_dict()
+            }
         else:
             injected_flow, flow_drop_percent, resilience_score, test_status = base_flow, 0.0, 0.0, "NOT_RUN"
 
@@ -226,13 +238,16 @@ class SupplyChainContagionAuditor:
             
         return G_split
 
-    def _simulate_flow_shock(self, G: nx.DiGraph, target: str, base_flow: float) -> Tuple[float, float]:
+    def _simulate_flow_shock(self, G: nx.DiGraph, target: str, base_flow: float, max_candidates: int = 50, approximate: bool = False) -> Tuple[float, float]:
         """
         Adversarial Injection v33.5 (Flow Sentinel).
         [HARDENING v33.5]: Complexity Cap against Flooding.
-        If > 50 nodes are critical (drop > 0.5%), we ABORT and FAIL.
+        If > max_candidates nodes are critical (drop > 0.5%), we ABORT and FAIL.
         This forces the graph to be concise, defeating "Flood/Decoy" attacks.
         Then we run EXHAUSTIVE N-2 on the survivors.
+        [v38.0] max_candidates is set by the ComplexityGovernor cost model. In
+        approximate mode the N-2 sweep is restricted to the top max_candidates
+        nodes by N-1 drop instead of aborting.
         """
         nodes = [n for n in G.nodes() if n != target]
         
@@ -259,9 +274,13 @@ class SupplyChainContagionAuditor:
                 impact_map[node_to_remove] = drop
                 
         # [HARDENING v33.5] Complexity Cap
-        # If attacker saturates the network with > 50 critical nodes to hide the N-2 pair, we FAIL.
-        if len(impact_map) > 50:
-            return 0.0, -1.0 # Signal Panic/Fail
+        # If attacker saturates the network with > max_candidates critical nodes to hide the N-2 pair, we FAIL.
+        if len(impact_map) > max_candidates:
+            if not approximate:
+                return 0.0, -1.0 # Signal Panic/Fail
+            # Approximate Mode: keep the strongest N-1 chokepoints only
+            strongest = sorted(impact_map.items(), key=lambda kv: kv[1], reverse=True)[:max_candidates]
+            impact_map = dict(strongest)
         
         # 2. N-2 Analysis (Exhaustive on Criticals)
         # Since N <= 50, N*(N-1)/2 <= 1225 combinations. Fast.
@@ -279,7 +298,9 @@ class SupplyChainContagionAuditor:
                 key=lambda x: G.nodes[x].get('capacity', 0.0),
                 reverse=True
             )
-            critical_candidates = list(set(critical_candidates + sorted_by_cap[:20]))
+            critical_candidates = list(dict.fromkeys(critical_candidates + sorted_by_cap[:20]))
+            if approximate:
+                critical_candidates = critical_candidates[:max_candidates]
 
         # N-2 STRESS TEST (Pairs)
         max_drop_n2 = 0.0
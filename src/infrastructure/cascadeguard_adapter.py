@@ -1,30 +1,73 @@
-import requests
-from typing import List, Dict
+import asyncio
+import logging
 import os
+from typing import List, Dict, Optional
+
+from .cascadeguard_client import CascadeGuardClient, cascadeguard_client, io_loop, local_dispatch
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["CascadeGuardAdapter", "local_dispatch"]
+
 
 class CascadeGuardAdapter:
-    """Infrastructure Adapter to call the external R-QAOA Microservice."""
-    
-    def __init__(self, endpoint_url: str = None):
+    """
+    Infrastructure Adapter to call the external R-QAOA Microservice.
+
+    Calls go through the CascadeGuardClient shared per endpoint (see
+    cascadeguard_client.py), which runs on its own io loop, so sync and async callers
+    reuse one connection pool and one retry budget.
+    `local=True` (or CASCADE_GUARD_MODE=local) answers in-process from local_dispatch, for tests.
+    """
+
+    def __init__(self, endpoint_url: str = None, local: Optional[bool] = None, client: Optional[CascadeGuardClient] = None):
         self.endpoint_url = endpoint_url or os.getenv(
-            "CASCADE_GUARD_URL", 
+            "CASCADE_GUARD_URL",
             "https://cascade-guard-optimizer-production.up.railway.app/api/optimize"
         )
+        self.client = client or cascadeguard_client(self.endpoint_url, local=local)
 
-    def get_resilient_dispatch(self, nodes: List[Dict], demand: float, weather_factor: float, is_stress: bool):
-        payload = {
+    @staticmethod
+    def _payload(nodes: List[Dict], demand: float, weather_factor: float, is_stress: bool) -> Dict:
+        return {
             "nodes": nodes,
             "total_demand_mw": demand,
             "weather_factor": weather_factor,
             "is_stress_event": is_stress
         }
-        
+
+    @staticmethod
+    async def _on_io_loop(coro):
+        """The client's connection pool belongs to the io loop, so its calls run there."""
+        return await asyncio.wrap_future(io_loop.submit(coro))
+
+    async def get_resilient_dispatch_async(self, nodes: List[Dict], demand: float, weather_factor: float, is_stress: bool):
         try:
-            response = requests.post(self.endpoint_url, json=payload, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-            return data["result"]
+            return await self._on_io_loop(self.client.dispatch(self._payload(nodes, demand, weather_factor, is_stress)))
         except Exception as e:
-            print(f"⚠️ CascadeGuard Microservice Failure: {e}")
-            # Fallback to local safety logic if needed, or raise
+            logger.warning("CascadeGuard microservice failure: %s", e)
             raise
+
+    async def get_resilient_dispatch_batch(self, scenarios: List[Dict]) -> List[Dict]:
+        """
+        Dispatch many scenarios (dicts with nodes, demand, weather_factor, is_stress);
+        results come back in input order.
+        """
+        payloads = [self._payload(s["nodes"], s["demand"], s["weather_factor"], s["is_stress"]) for s in scenarios]
+        try:
+            return await self._on_io_loop(self.client.dispatch_many(payloads))
+        except Exception as e:
+            logger.warning("CascadeGuard microservice batch failure: %s", e)
+            raise
+
+    def get_resilient_dispatch(self, nodes: List[Dict], demand: float, weather_factor: float, is_stress: bool):
+        """Synchronous entry point for non-async callers."""
+        try:
+            return self.client.dispatch_sync(self._payload(nodes, demand, weather_factor, is_stress))
+        except Exception as e:
+            logger.warning("CascadeGuard microservice failure: %s", e)
+            raise
+
+    async def aclose(self) -> None:
+        """Closes the shared client's connection pool."""
+        await self._on_io_loop(self.client.aclose())
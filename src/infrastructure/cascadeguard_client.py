@@ -0,0 +1,195 @@
+"""CascadeGuard Client - pooled async transport, retry budget and batching for the R-QAOA service."""
+import asyncio
+import json
+import os
+import random
+import threading
+from concurrent.futures import Future
+from typing import Coroutine, Dict, List, Optional
+
+import httpx
+
+_RETRYABLE_STATUS = (502, 503, 504)
+
+
+def local_dispatch(request: Dict) -> Dict:
+    """
+    Deterministic stand-in for the service's R-QAOA dispatch (no network, no quantum).
+    Capacity is derated by weather exposure (doubled under a stress event) and nodes are
+    dispatched in order of least weather dependency until demand is covered.
+    """
+    stress = 2.0 if request.get("is_stress_event") else 1.0
+    factor = float(request.get("weather_factor", 0.0)) * stress
+    remaining = float(request.get("total_demand_mw", 0.0))
+    dispatch = {}
+    for node in sorted(request.get("nodes", []), key=lambda n: (n["weather_dependency"], n["id"])):
+        available = max(0.0, node["capacity_mw"] * (1 - min(1.0, node["weather_dependency"] * factor)))
+        dispatch[node["id"]] = min(available, max(remaining, 0.0))
+        remaining -= dispatch[node["id"]]
+    return {
+        "engine": "local-stand-in",
+        "dispatch_mw": dispatch,
+        "served_mw": sum(dispatch.values()),
+        "unserved_mw": max(remaining, 0.0),
+    }
+
+
+def _local_handler(request: httpx.Request) -> httpx.Response:
+    body = json.loads(request.content or b"{}")
+    if request.url.path.rstrip("/").endswith("/batch"):
+        return httpx.Response(200, json={"status": "success", "results": [local_dispatch(r) for r in body["requests"]]})
+    return httpx.Response(200, json={"status": "success", "result": local_dispatch(body)})
+
+
+class RetryBudget:
+    """
+    Caps retries at a fraction of traffic: every first attempt deposits `ratio` tokens
+    (up to `max_tokens`), every retry spends one.
+    """
+
+    def __init__(self, ratio: float = 0.2, max_tokens: float = 10.0):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self.tokens = max_tokens
+        self._lock = threading.Lock()
+
+    def deposit(self) -> None:
+        with self._lock:
+            self.tokens = min(self.max_tokens, self.tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        with self._lock:
+            if self.tokens >= 1.0:
+                self.tokens -= 1.0
+                return True
+            return False
+
+
+class _IOLoop:
+    """A daemon thread running the event loop that owns every client's connection pool."""
+
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+
+    def submit(self, coro: Coroutine) -> Future:
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, name="cascadeguard-io", daemon=True).start()
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+
+io_loop = _IOLoop()
+
+
+class CascadeGuardClient:
+    """
+    Async client for the CascadeGuard service (POST {endpoint}, POST {endpoint}/batch).
+
+    One pooled httpx.AsyncClient, owned by the module's io_loop, carries every call, so
+    sync and async callers reuse warm connections. Transport errors and 502/503/504 are
+    retried with jittered backoff, but only while the RetryBudget allows it.
+    dispatch_many sends portfolios `batch_size` at a time to /batch; if the service
+    answers 404/405 there, batching is switched off and requests go out concurrently
+    (at most `max_concurrency` in flight) over the same pool.
+    """
+
+    def __init__(
+        self,
+        endpoint_url: str,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        local: bool = False,
+        max_attempts: int = 3,
+        batch_size: int = 16,
+        max_concurrency: int = 8,
+        timeout_s: float = 10.0,
+    ):
+        self.endpoint_url = endpoint_url.rstrip("/")
+        self.local = local
+        self.transport = httpx.MockTransport(_local_handler) if local else transport
+        self.max_attempts = max_attempts
+        self.batch_size = batch_size
+        self.max_concurrency = max_concurrency
+        self.timeout_s = timeout_s
+        self.budget = RetryBudget()
+        self.batch_supported: Optional[bool] = None
+        self._http: Optional[httpx.AsyncClient] = None
+
+    def _client(self) -> httpx.AsyncClient:
+        if self._http is None:
+            self._http = httpx.AsyncClient(
+                timeout=self.timeout_s,
+                transport=self.transport,
+                limits=httpx.Limits(max_connections=self.max_concurrency * 2, max_keepalive_connections=self.max_concurrency),
+            )
+        return self._http
+
+    async def _post(self, url: str, body: Dict) -> httpx.Response:
+        self.budget.deposit()
+        for attempt in range(self.max_attempts):
+            last = attempt == self.max_attempts - 1
+            try:
+                response = await self._client().post(url, json=body)
+                if response.status_code not in _RETRYABLE_STATUS or last or not self.budget.try_spend():
+                    return response
+            except httpx.TransportError:
+                if last or not self.budget.try_spend():
+                    raise
+            await asyncio.sleep(min(2.0, 0.2 * 2 ** attempt) * (1 - 0.5 * random.random()))
+
+    async def dispatch(self, request: Dict) -> Dict:
+        """One portfolio's node payload -> the service's `result`."""
+        response = await self._post(self.endpoint_url, request)
+        response.raise_for_status()
+        return response.json()["result"]
+
+    async def dispatch_many(self, requests: List[Dict]) -> List[Dict]:
+        """Several portfolios' payloads -> their results, in order."""
+        results = []
+        for start in range(0, len(requests), self.batch_size):
+            chunk = requests[start:start + self.batch_size]
+            if self.batch_supported is not False:
+                response = await self._post(f"{self.endpoint_url}/batch", {"requests": chunk})
+                if response.status_code in (404, 405):
+                    self.batch_supported = False
+                else:
+                    response.raise_for_status()
+                    self.batch_supported = True
+                    results.extend(response.json()["results"])
+                    continue
+            gate = asyncio.Semaphore(self.max_concurrency)
+
+            async def one(request: Dict) -> Dict:
+                async with gate:
+                    return await self.dispatch(request)
+
+            results.extend(await asyncio.gather(*[one(r) for r in chunk]))
+        return results
+
+    async def aclose(self) -> None:
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+    def dispatch_sync(self, request: Dict) -> Dict:
+        return io_loop.submit(self.dispatch(request)).result()
+
+
+_clients: Dict[tuple, CascadeGuardClient] = {}
+_clients_lock = threading.Lock()
+
+
+def cascadeguard_client(endpoint_url: str, local: Optional[bool] = None) -> CascadeGuardClient:
+    """
+    Shared client per endpoint. `local=True` (or CASCADE_GUARD_MODE=local) answers from
+    local_dispatch in-process, for tests and offline demos.
+    """
+    if local is None:
+        local = os.getenv("CASCADE_GUARD_MODE", "remote").strip().lower() == "local"
+    key = (endpoint_url, local)
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = _clients[key] = CascadeGuardClient(endpoint_url, local=local)
+        return client
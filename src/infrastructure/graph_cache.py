@@ -0,0 +1,81 @@
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class CompiledGraph:
+    """
+    Audit-ready form of a stored topology.
+    Holds exactly what SupplyChainContagionAuditor consumes, so repeated
+    audits skip the JSON decode and per-node parsing.
+    """
+    graph_id: str
+    suppliers: Tuple[Dict, ...]
+    dependencies: Tuple[Tuple[str, str], ...]
+    total_exposure: float
+
+
+def compile_graph(graph_id: str, nodes: List[Dict], edges: List) -> CompiledGraph:
+    """
+    Parses raw node/edge JSON into auditor inputs.
+    Mirrors the parsing rules of /api/validate-file (tier defaults to '4', spend to 0.0).
+    """
+    suppliers = []
+    for n in nodes:
+        suppliers.append({
+            "id": str(n.get("id")),
+            "tier": str(n.get("tier", "4")),
+            "spend": float(n.get("spend", 0.0)),
+        })
+
+    dependencies = tuple((str(u), str(v)) for u, v in edges)
+    total_exposure = sum(s["spend"] for s in suppliers)  # Assess against total spend
+
+    return CompiledGraph(
+        graph_id=graph_id,
+        suppliers=tuple(suppliers),
+        dependencies=dependencies,
+        total_exposure=total_exposure,
+    )
+
+
+class GraphCache:
+    """
+    Bounded LRU of CompiledGraph keyed by graph_id.
+    One instance is shared across requests; the lock keeps it safe under
+    threadpool-dispatched handlers as well as the event loop.
+    """
+
+    def __init__(self, max_entries: int = 64):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, CompiledGraph]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, graph_id: str) -> Optional[CompiledGraph]:
+        with self._lock:
+            compiled = self._entries.get(graph_id)
+            if compiled is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(graph_id)
+            self.hits += 1
+            return compiled
+
+    def put(self, compiled: CompiledGraph) -> None:
+        with self._lock:
+            self._entries[compiled.graph_id] = compiled
+            self._entries.move_to_end(compiled.graph_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, graph_id: str) -> None:
+        with self._lock:
+            self._entries.pop(graph_id, None)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._entries), "max_entries": self.max_entries, "hits": self.hits, "misses": self.misses}
@@ -10,10 +10,16 @@ CREATE TABLE IF NOT EXISTS scf_graphs (
     nodes_json JSONB NOT NULL, -- Full 'nodes' array
     edges_json JSONB NOT NULL, -- Full 'edges' array
     meta_json JSONB, -- 'meta' object
-    resilience_score FLOAT DEFAULT 0.0, -- Last known score
+    resilience_score FLOAT DEFAULT 0.0, -- No longer written: rows are shared by identical uploads, scores live in scf_audit_runs
+    content_hash TEXT, -- SHA-256 of canonical nodes+edges (dedup key)
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
 
+-- Existing deployments: add the dedup column in place. Rows stored before it are
+-- hashed by DatabaseService.backfill_content_hashes() on API start-up (the hash is
+-- over Python's canonical JSON, which SQL cannot reproduce from JSONB).
+ALTER TABLE scf_graphs ADD COLUMN IF NOT EXISTS content_hash TEXT;
+
 -- 2. Audit Runs Table (Stores the Evidence)
 CREATE TABLE IF NOT EXISTS scf_audit_runs (
     id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
@@ -28,3 +34,4 @@ CREATE TABLE IF NOT EXISTS scf_audit_runs (
 -- Indexes for Speed
 CREATE INDEX IF NOT EXISTS idx_graphs_created_at ON scf_graphs(created_at DESC);
 CREATE INDEX IF NOT EXISTS idx_audit_runs_graph_id ON scf_audit_runs(graph_id);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_graphs_content_hash ON scf_graphs(content_hash);
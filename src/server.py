@@ -1,13 +1,17 @@
-from fastapi import FastAPI, HTTPException, Body, Depends
+from fastapi import FastAPI, HTTPException, Body, Depends, Request, Header
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
 from typing import List, Dict, Optional, AsyncGenerator
 import os
+import json
+import hmac
 from contextlib import asynccontextmanager
 from domain.topological_core import SupplyChainContagionAuditor
-from infrastructure.database import db_service
+from governance.complexity_governor import ComplexityGovernor, TenantBudget
+from infrastructure.database import db_service, graph_content_hash
 from infrastructure.models import GraphCreate, AuditRunCreate
+from infrastructure.graph_cache import GraphCache, CompiledGraph, compile_graph
 
 # LIFESPAN Context Manager for DB Connection
 @asynccontextmanager
@@ -21,7 +25,17 @@ async def lifespan(app: FastAPI):
 app = FastAPI(title="CascadeGuard Enforcement API", lifespan=lifespan)
 app.add_middleware(CORSMiddleware, allow_origins=["*"], allow_methods=["*"], allow_headers=["*"])
 
-auditor = SupplyChainContagionAuditor()
+# Per-tenant audit budgets, e.g. AUDIT_TENANT_BUDGETS='{"bank_a": {"cpu_ms": 60000, "memory_mb": 512}}'
+tenant_budgets = {
+    tenant: TenantBudget(**budget)
+    for tenant, budget in json.loads(os.getenv("AUDIT_TENANT_BUDGETS", "{}")).items()
+}
+# API keys that bind a caller to a tenant, e.g. AUDIT_API_KEYS='{"<key>": "bank_a"}'
+tenant_api_keys = json.loads(os.getenv("AUDIT_API_KEYS", "{}"))
+governor = ComplexityGovernor(inflation_cap_multiplier=1.5, tenant_budgets=tenant_budgets)
+auditor = SupplyChainContagionAuditor(governor=governor)
+graph_cache = GraphCache(max_entries=int(os.getenv("GRAPH_CACHE_SIZE", "64")))
+BULK_BATCH_SIZE = int(os.getenv("BULK_BATCH_SIZE", "500"))
 
 @app.post("/api/upload-graph")
 async def upload_graph(graph: GraphCreate):
@@ -29,7 +43,7 @@ async def upload_graph(graph: GraphCreate):
     [PHASE 0] Ingest Verification Data (e.g., Digital Twin).
     Stores the full topology in the DB for Audit history.
     """
-    graph_id = await db_service.save_graph(
+    graph_id, created = await db_service.save_graph(
         name=graph.name,
         description=graph.description,
         nodes=graph.nodes,
@@ -39,7 +53,99 @@ async def upload_graph(graph: GraphCreate):
     if not graph_id:
         raise HTTPException(status_code=500, detail="Database Save Failed (Check Logs)")
         
-    return {"status": "UPLOADED", "graph_id": graph_id}
+    # Same topology as a stored graph: its id (and its name and meta) are shared, not copied
+    return {"status": "UPLOADED" if created else "DUPLICATE", "graph_id": graph_id}
+
+async def _flush_bulk_batch(batch: List[Dict], known: Dict[str, str], results: List[Dict]):
+    """
+    Resolves one NDJSON batch: hashes already stored are reported as DUPLICATE,
+    the rest go to the DB in a single COPY. Only rows that COPY actually inserted are
+    UPLOADED; one that lost the race to a concurrent insert is a DUPLICATE.
+    """
+    unresolved = [g for g in batch if g["content_hash"] not in known]
+    if unresolved:
+        known.update(await db_service.find_graphs_by_hash([g["content_hash"] for g in unresolved]))
+
+    # First occurrence per hash only: repeats inside the batch must not be COPY'd twice
+    new_graphs = list({g["content_hash"]: g for g in reversed(batch) if g["content_hash"] not in known}.values())
+    inserted = set()
+    if new_graphs:
+        ids, inserted = await db_service.bulk_save_graphs(new_graphs)
+        known.update(ids)
+
+    for g in batch:
+        results.append({
+            "line": g["line"],
+            "status": "UPLOADED" if g["content_hash"] in inserted and not g["in_stream_duplicate"] else "DUPLICATE",
+            "graph_id": known.get(g["content_hash"]),
+            "content_hash": g["content_hash"]
+        })
+
+@app.post("/api/upload-graphs/bulk")
+async def upload_graphs_bulk(request: Request):
+    """
+    [PHASE 0 - BULK] Streams NDJSON (one GraphCreate object per line).
+    Each graph is canonicalised and hashed; content already stored (or repeated
+    earlier in the same stream) returns the existing id instead of a new row.
+    New graphs are inserted in batches of BULK_BATCH_SIZE via the COPY path.
+    """
+    results: List[Dict] = []
+    known: Dict[str, str] = {}        # content_hash -> graph_id (DB + this stream)
+    pending_hashes: set = set()        # hashes queued in the current batch
+    batch: List[Dict] = []
+    buffer = b""
+    line_no = 0
+
+    async def handle_line(raw_line: bytes):
+        nonlocal line_no
+        line_no += 1
+        if not raw_line.strip():
+            return
+        try:
+            graph = GraphCreate(**json.loads(raw_line))
+        except Exception as e:
+            results.append({"line": line_no, "status": "INVALID", "error": str(e)})
+            return
+
+        content_hash = graph_content_hash(graph.nodes, graph.edges)
+        batch.append({
+            "line": line_no,
+            "name": graph.name,
+            "description": graph.description,
+            "nodes": graph.nodes,
+            "edges": graph.edges,
+            "meta": graph.meta,
+            "content_hash": content_hash,
+            "in_stream_duplicate": content_hash in pending_hashes or content_hash in known
+        })
+        pending_hashes.add(content_hash)
+        if len(batch) >= BULK_BATCH_SIZE:
+            await _flush_bulk_batch(batch, known, results)
+            batch.clear()
+            pending_hashes.clear()
+
+    try:
+        async for chunk in request.stream():
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+            for raw_line in lines:
+                await handle_line(raw_line)
+        if buffer:
+            await handle_line(buffer)
+        if batch:
+            await _flush_bulk_batch(batch, known, results)
+    except Exception as e:
+        print(f"DB ERROR [bulk_upload]: {e}")
+        raise HTTPException(status_code=500, detail=f"Bulk Upload Failed after {len(results)} graphs: {str(e)}")
+
+    results.sort(key=lambda r: r["line"])
+    return {
+        "status": "UPLOADED",
+        "uploaded": sum(1 for r in results if r["status"] == "UPLOADED"),
+        "duplicates": sum(1 for r in results if r["status"] == "DUPLICATE"),
+        "invalid": sum(1 for r in results if r["status"] == "INVALID"),
+        "results": results
+    }
 
 @app.get("/api/live-scenario")
 async def get_live_scenario(scenario: str = "baseline", policy: str = "bafin_standard", run_test: str = "false"):
@@ -90,8 +196,64 @@ async def get_live_scenario(scenario: str = "baseline", policy: str = "bafin_sta
         print(f"ADVERSARIAL ENGINE ERROR: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+def authenticated_tenant(
+    x_api_key: Optional[str] = Header(None),
+    x_tenant_id: Optional[str] = Header(None),
+) -> Optional[str]:
+    """
+    Resolves the tenant whose audit budget applies from its API key.
+    X-Tenant-ID alone is client-supplied and never selects a budget: without a key
+    the default budget applies, and with one it must match the key's tenant.
+    """
+    if x_api_key is None:
+        return None
+    tenant = next(
+        (t for key, t in tenant_api_keys.items() if hmac.compare_digest(key.encode(), x_api_key.encode())),
+        None,
+    )
+    if tenant is None:
+        raise HTTPException(status_code=401, detail="Invalid API key")
+    if x_tenant_id is not None and x_tenant_id != tenant:
+        raise HTTPException(status_code=403, detail=f"API key is not valid for tenant {x_tenant_id}")
+    return tenant
+
+async def _run_logged_audit(compiled: CompiledGraph, graph_id: Optional[str], tenant: Optional[str] = None) -> Dict:
+    """
+    Runs the Full Adversarial Audit on a compiled topology and logs it to the DB.
+    Shared by /api/validate-file (inline JSON) and /api/graphs/{graph_id}/audit (stored graph).
+    """
+    result = auditor.audit_contagion_risk(
+        suppliers=list(compiled.suppliers),
+        total_exposure=compiled.total_exposure,
+        policy_tier="bafin_standard",
+        dependencies=list(compiled.dependencies),
+        run_adversarial_test=True,
+        tenant=tenant
+    )
+
+    # [PHASE 1] LOG AUDIT TO DB
+    status = result.get("status", "UNKNOWN")
+    score = result.get("resilience", 0.0)
+
+    # RWA Estimate Logic (Simple Mock)
+    # If score > 0.85 -> 1% of exposure is saved
+    rwa_saving = 0.0
+    if score > 0.85:
+        rwa_saving = compiled.total_exposure * 0.01
+
+    # Log via DB Service (Fire and Forget or Await)
+    if graph_id:
+        await db_service.log_audit(graph_id, status, score, rwa_saving, result)
+    else:
+        # Create a transient graph record if none exists?
+        # For now just log mock
+        pass
+
+    result["rwa_saving_estimate"] = rwa_saving
+    return result
+
 @app.post("/api/validate-file")
-async def validate_file(file_data: Dict = Body(...)):
+async def validate_file(file_data: Dict = Body(...), tenant: Optional[str] = Depends(authenticated_tenant)):
     """
     [LIVE CHALLENGE VALIDATION]
     Allows Human Auditor to upload raw JSON to test the 'Kill Shot' defenses.
@@ -103,46 +265,8 @@ async def validate_file(file_data: Dict = Body(...)):
         graph_id = file_data.get("graph_id", None) # Optional linkage
         
         # Parse inputs for v36.0 Auditor
-        suppliers = []
-        for n in nodes:
-            # Safe parsing
-            s_id = str(n.get("id"))
-            tier = str(n.get("tier", "4"))
-            spend = float(n.get("spend", 0.0))
-            suppliers.append({"id": s_id, "tier": tier, "spend": spend})
-            
-        dependencies = [(str(u), str(v)) for u, v in edges]
-        total_exposure = sum(s['spend'] for s in suppliers) # Assess against total spend
-        
-        # Run Full Adversarial Audit
-        result = auditor.audit_contagion_risk(
-            suppliers=suppliers, 
-            total_exposure=total_exposure, 
-            policy_tier="bafin_standard", 
-            dependencies=dependencies, 
-            run_adversarial_test=True
-        )
-        
-        # [PHASE 1] LOG AUDIT TO DB
-        status = result.get("status", "UNKNOWN")
-        score = result.get("resilience", 0.0)
-        
-        # RWA Estimate Logic (Simple Mock)
-        # If score > 0.85 -> 1% of exposure is saved
-        rwa_saving = 0.0
-        if score > 0.85:
-            rwa_saving = total_exposure * 0.01
-            
-        # Log via DB Service (Fire and Forget or Await)
-        if graph_id:
-            await db_service.log_audit(graph_id, status, score, rwa_saving, result)
-        else:
-            # Create a transient graph record if none exists? 
-            # For now just log mock
-            pass
-            
-        result["rwa_saving_estimate"] = rwa_saving
-        return result
+        compiled = compile_graph(graph_id or "INLINE", nodes, edges)
+        return await _run_logged_audit(compiled, graph_id, tenant)
         
     except Exception as e:
         # Return the error as a structured failure (so the UI can show the shield)
@@ -153,6 +277,56 @@ async def validate_file(file_data: Dict = Body(...)):
             }
         }
 
+@app.post("/api/audit/estimate")
+async def estimate_audit(file_data: Dict = Body(...), tenant: Optional[str] = Depends(authenticated_tenant)):
+    """
+    [PRE-FLIGHT] Predicts CPU time, memory and the admission decision
+    (ADMIT / APPROXIMATE / REJECT) for an audit of this topology without running it.
+    """
+    try:
+        compiled = compile_graph("PREFLIGHT", file_data.get("nodes", []), file_data.get("edges", []))
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Malformed graph: {str(e)}")
+
+    edges = [{"source": u, "target": v} for u, v in compiled.dependencies]
+    estimate = governor.estimate(list(compiled.suppliers), edges, tenant)
+    return estimate.to_dict()
+
+@app.post("/api/graphs/{graph_id}/audit")
+async def audit_stored_graph(graph_id: str, tenant: Optional[str] = Depends(authenticated_tenant)):
+    """
+    [AUDIT BY REFERENCE]
+    Audits a topology previously stored via /api/upload-graph without re-uploading it.
+    The compiled form is kept in a bounded in-memory cache shared across requests,
+    so repeated audits of large Digital Twins skip the DB read and JSON parsing.
+    """
+    compiled = graph_cache.get(graph_id)
+    cache_status = "HIT"
+    if compiled is None:
+        cache_status = "MISS"
+        graph = await db_service.load_graph(graph_id)
+        if graph is None:
+            raise HTTPException(status_code=404, detail=f"Graph {graph_id} not found")
+        try:
+            compiled = compile_graph(graph_id, graph["nodes"], graph["edges"])
+        except Exception as e:
+            raise HTTPException(status_code=422, detail=f"Stored graph {graph_id} is malformed: {str(e)}")
+        graph_cache.put(compiled)
+
+    try:
+        result = await _run_logged_audit(compiled, graph_id, tenant)
+    except Exception as e:
+        return {
+            "adversarial_test": {
+                "status": "CRASH_PREVENTED",
+                "description": f"Input caused system error: {str(e)}. Challenge Blocked safely."
+            }
+        }
+
+    result["graph_id"] = graph_id
+    result["graph_cache"] = cache_status
+    return result
+
 static_dir = os.path.join(os.getcwd(), "dashboard/dist")
 if os.path.exists(static_dir):
     app.mount("/dashboard", StaticFiles(directory=static_dir, html=True), name="dashboard")
@@ -0,0 +1,138 @@
+"""Unit Tests for the audit cost model, admission decisions and tenant authentication."""
+import pytest
+from fastapi.testclient import TestClient
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import server
+from governance.complexity_governor import (
+    ADMIT, APPROXIMATE, REJECT, AuditCostModel, ComplexityGovernor, TenantBudget,
+)
+
+
+def _chain(n):
+    nodes = [{"id": f"S{i}", "tier": "1", "spend": 10.0} for i in range(n)]
+    edges = [{"source": f"S{i}", "target": f"S{i + 1}"} for i in range(n - 1)]
+    return nodes, edges
+
+
+def _governor(cpu_ms=30_000.0, memory_mb=256.0, **tenants):
+    """Governor with a flat 1 ms max-flow call, so budgets read as max-flow call counts."""
+    return ComplexityGovernor(
+        cost_model=AuditCostModel(ms_coef=1.0, ms_alpha=0.0, depth_coef=0.0),
+        default_budget=TenantBudget(cpu_ms=cpu_ms, memory_mb=memory_mb),
+        tenant_budgets=tenants,
+    )
+
+
+class TestAuditCostModel:
+    """Tests for AuditCostModel."""
+
+    def test_max_candidates_for_pairs(self):
+        """GIVEN a pair budget, WHEN converted, THEN k is the largest with C(k, 2) within budget and limit."""
+        assert AuditCostModel.max_candidates_for_pairs(45, 100) == 10
+        assert AuditCostModel.max_candidates_for_pairs(44, 100) == 9
+        assert AuditCostModel.max_candidates_for_pairs(45, 7) == 7
+        assert AuditCostModel.max_candidates_for_pairs(-1, 100) == 0
+
+    def test_infinite_budget_is_bounded(self):
+        """GIVEN an infinite pair budget, WHEN converted, THEN the limit comes back instead of sys.maxsize."""
+        assert AuditCostModel.max_candidates_for_pairs(float("inf"), 99) == 99
+
+    def test_fit_recovers_power_law(self):
+        """GIVEN timings from a known power law, WHEN fitted, THEN coefficient and exponent are recovered."""
+        truth = AuditCostModel(ms_coef=0.002, ms_alpha=1.3)
+        samples = [(n, 2 * n, 4, truth.maxflow_ms(n, 2 * n, 4)) for n in (50, 300)]
+
+        fitted = AuditCostModel.fit(samples)
+
+        assert fitted.ms_coef == pytest.approx(0.002)
+        assert fitted.ms_alpha == pytest.approx(1.3)
+
+
+class TestComplexityGovernor:
+    """Tests for ComplexityGovernor.estimate and budget selection."""
+
+    def test_admit_within_budget(self):
+        """GIVEN an audit well inside the budget, WHEN estimated, THEN it is admitted with the flood cap."""
+        est = _governor().estimate(*_chain(100))
+
+        assert est.decision == ADMIT
+        assert est.max_candidates == 50
+
+    def test_admit_never_exceeds_flood_cap(self):
+        """GIVEN a zero-cost model (infinite pair budget), WHEN estimated, THEN the N-2 cap stays finite."""
+        governor = ComplexityGovernor(cost_model=AuditCostModel(ms_coef=0.0))
+
+        est = governor.estimate(*_chain(500))
+
+        assert est.decision == ADMIT
+        assert est.max_candidates == max(est.expected_candidates, governor.flood_cap)
+
+    def test_approximate_caps_candidates(self):
+        """GIVEN a budget covering N-1 but not every expected pair, WHEN estimated, THEN N-2 is capped."""
+        est = _governor(cpu_ms=100 + 45).estimate(*_chain(100))
+
+        assert est.expected_candidates == 20
+        assert est.decision == APPROXIMATE
+        assert est.max_candidates == 10
+
+    def test_reject_when_n1_exceeds_budget(self):
+        """GIVEN a budget below the N-1 sweep, WHEN estimated, THEN the audit is rejected."""
+        est = _governor(cpu_ms=50).estimate(*_chain(100))
+
+        assert est.decision == REJECT
+        assert est.max_candidates == 0
+
+    def test_reject_on_memory(self):
+        """GIVEN a tiny memory budget, WHEN estimated, THEN the audit is rejected despite cheap CPU."""
+        est = _governor(memory_mb=0.01).estimate(*_chain(100))
+
+        assert est.decision == REJECT
+
+    def test_tenant_budget_selection(self):
+        """GIVEN a tenant with its own budget, WHEN estimated, THEN it applies; unknown tenants get the default."""
+        governor = _governor(cpu_ms=50, bank_a=TenantBudget(cpu_ms=1e6))
+
+        assert governor.estimate(*_chain(100), tenant="bank_a").decision == ADMIT
+        assert governor.estimate(*_chain(100), tenant="bank_b").decision == REJECT
+        assert governor.estimate(*_chain(100)).budget["cpu_ms"] == 50
+
+
+class TestTenantAuthentication:
+    """Tests for tenant resolution on POST /api/audit/estimate."""
+
+    @pytest.fixture
+    def client(self, monkeypatch):
+        monkeypatch.setattr(server, "tenant_api_keys", {"key-a": "bank_a"})
+        monkeypatch.setattr(server, "governor", _governor(cpu_ms=50, bank_a=TenantBudget(cpu_ms=1e6)))
+        return TestClient(server.app)
+
+    def _estimate(self, client, headers):
+        nodes, edges = _chain(100)
+        body = {"nodes": nodes, "edges": [[e["source"], e["target"]] for e in edges]}
+        return client.post("/api/audit/estimate", json=body, headers=headers)
+
+    def test_api_key_selects_tenant_budget(self, client):
+        """GIVEN a valid API key, WHEN estimating, THEN its tenant's budget applies."""
+        response = self._estimate(client, {"X-API-Key": "key-a", "X-Tenant-ID": "bank_a"})
+
+        assert response.status_code == 200
+        assert response.json()["decision"] == ADMIT
+
+    def test_unauthenticated_tenant_header_is_ignored(self, client):
+        """GIVEN only an X-Tenant-ID header, WHEN estimating, THEN the default budget applies."""
+        response = self._estimate(client, {"X-Tenant-ID": "bank_a"})
+
+        assert response.json()["budget"]["cpu_ms"] == 50
+
+    def test_unknown_key_is_rejected(self, client):
+        """GIVEN an unknown API key, WHEN estimating, THEN the request is refused with 401."""
+        assert self._estimate(client, {"X-API-Key": "guess"}).status_code == 401
+
+    def test_key_for_another_tenant_is_forbidden(self, client):
+        """GIVEN a key whose tenant differs from X-Tenant-ID, WHEN estimating, THEN the request is refused with 403."""
+        assert self._estimate(client, {"X-API-Key": "key-a", "X-Tenant-ID": "bank_b"}).status_code == 403
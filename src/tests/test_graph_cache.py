@@ -0,0 +1,116 @@
+"""Unit Tests for the compiled-graph cache and audit-by-reference."""
+import pytest
+from fastapi.testclient import TestClient
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import server
+from infrastructure.database import DatabaseService
+from infrastructure.graph_cache import GraphCache, compile_graph
+
+NODES = [
+    {"id": "S1", "tier": "1", "spend": 500.0},
+    {"id": "S2", "tier": "2", "spend": 300.0},
+    {"id": "BMW_GROUP", "tier": "Anchor", "spend": 2000.0},
+]
+EDGES = [["S1", "S2"], ["S2", "BMW_GROUP"]]
+
+
+class _Rows:
+    """Stand-in for the `databases` connection: one fetch_one result per graph id."""
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    async def fetch_one(self, query, values):
+        return self.rows.get(values["id"])
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """Test client with an empty cache and load_graph counting DB reads."""
+    loads = []
+
+    async def load_graph(graph_id):
+        loads.append(graph_id)
+        if graph_id != "G1":
+            return None
+        return {"id": "G1", "name": "twin", "nodes": NODES, "edges": EDGES, "meta": {}}
+
+    monkeypatch.setattr(server, "graph_cache", GraphCache(max_entries=4))
+    monkeypatch.setattr(server.db_service, "load_graph", load_graph)
+    test_client = TestClient(server.app)
+    test_client.loads = loads
+    return test_client
+
+
+class TestGraphCache:
+    """Tests for GraphCache."""
+
+    def test_least_recently_used_is_evicted(self):
+        """GIVEN a full cache, WHEN a new graph is added, THEN the least recently read one goes."""
+        cache = GraphCache(max_entries=2)
+        cache.put(compile_graph("A", NODES, EDGES))
+        cache.put(compile_graph("B", NODES, EDGES))
+        cache.get("A")
+
+        cache.put(compile_graph("C", NODES, EDGES))
+
+        assert cache.get("B") is None
+        assert cache.get("A") is not None and cache.get("C") is not None
+        assert cache.stats() == {"entries": 2, "max_entries": 2, "hits": 3, "misses": 1}
+
+    def test_invalidate(self):
+        """GIVEN a cached graph, WHEN invalidated, THEN it is read again next time."""
+        cache = GraphCache()
+        cache.put(compile_graph("A", NODES, EDGES))
+
+        cache.invalidate("A")
+
+        assert cache.get("A") is None
+
+    def test_compile_graph_defaults(self):
+        """GIVEN nodes without tier or spend, WHEN compiled, THEN tier '4' and spend 0 are used."""
+        compiled = compile_graph("A", [{"id": 7}], [])
+
+        assert compiled.suppliers == ({"id": "7", "tier": "4", "spend": 0.0},)
+        assert compiled.total_exposure == 0.0
+
+
+class TestLoadGraph:
+    """Tests for DatabaseService.load_graph."""
+
+    async def test_decodes_json_columns(self):
+        """GIVEN JSONB columns returned as text, WHEN loaded, THEN nodes and edges are decoded."""
+        service = DatabaseService()
+        service.database = _Rows({"G1": {
+            "id": "G1", "name": "twin", "nodes_json": '[{"id": "S1"}]', "edges_json": "[]", "meta_json": None,
+        }})
+
+        graph = await service.load_graph("G1")
+
+        assert graph == {"id": "G1", "name": "twin", "nodes": [{"id": "S1"}], "edges": [], "meta": {}}
+        assert await service.load_graph("missing") is None
+
+
+class TestAuditByReference:
+    """Tests for POST /api/graphs/{graph_id}/audit."""
+
+    def test_second_audit_hits_cache(self, client):
+        """GIVEN a stored graph, WHEN audited twice, THEN only the first audit reads the DB."""
+        first = client.post("/api/graphs/G1/audit").json()
+        second = client.post("/api/graphs/G1/audit").json()
+
+        assert (first["graph_cache"], second["graph_cache"]) == ("MISS", "HIT")
+        assert first["graph_id"] == "G1"
+        assert client.loads == ["G1"]
+
+    def test_unknown_graph_is_404(self, client):
+        """GIVEN an id that is not stored, WHEN audited, THEN 404 is returned and nothing is cached."""
+        response = client.post("/api/graphs/NOPE/audit")
+
+        assert response.status_code == 404
+        assert server.graph_cache.get("NOPE") is None
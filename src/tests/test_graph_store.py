@@ -0,0 +1,250 @@
+"""Unit Tests for graph storage: content-hash dedup, the hash backfill and the NDJSON/COPY bulk path."""
+import json
+import uuid
+from contextlib import asynccontextmanager
+
+import pytest
+from fastapi.testclient import TestClient
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import server
+from infrastructure.database import DatabaseService, graph_content_hash
+
+
+def _graph(k):
+    return {"nodes": [{"id": f"S{k}", "tier": "1", "spend": 100.0 * k}], "edges": []}
+
+
+class _Store:
+    """
+    In-memory stand-in for the `databases` Database: a scf_graphs table with the
+    unique content_hash index, answering the statements DatabaseService issues.
+    """
+
+    def __init__(self):
+        self.rows = []    # dicts in insertion (created_at) order
+        self.audits = []
+
+    def add(self, graph, content_hash=None):
+        row = {"id": uuid.uuid4(), "nodes_json": json.dumps(graph["nodes"]),
+               "edges_json": json.dumps(graph["edges"]), "content_hash": content_hash}
+        self.rows.append(row)
+        return row["id"]
+
+    def by_hash(self, content_hash):
+        return next((r for r in self.rows if r["content_hash"] == content_hash), None)
+
+    async def execute(self, query, values):
+        assert not query.lstrip().startswith("UPDATE scf_graphs")
+        if query.lstrip().startswith("INSERT INTO scf_audit_runs"):
+            self.audits.append(values)
+            return None
+        assert "ON CONFLICT (content_hash) DO NOTHING" in query
+        if self.by_hash(values["content_hash"]):
+            return None
+        graph = {"nodes": json.loads(values["nodes"]), "edges": json.loads(values["edges"])}
+        return self.add(graph, values["content_hash"])
+
+    async def fetch_all(self, query, values=None):
+        if "content_hash IS NULL" in query:
+            return [r for r in self.rows if r["content_hash"] is None]
+        return [r for r in self.rows if r["id"] in values["ids"]]
+
+    async def fetch_one(self, query, values):
+        assert query.lstrip().startswith("UPDATE")
+        row = next(r for r in self.rows if r["id"] == values["id"])
+        if row["content_hash"] is not None or self.by_hash(values["content_hash"]):
+            return None
+        row["content_hash"] = values["content_hash"]
+        return {"id": row["id"]}
+
+    @asynccontextmanager
+    async def connection(self):
+        yield _Connection(self)
+
+
+class _Connection:
+    """The slice of asyncpg used through connection.raw_connection."""
+
+    def __init__(self, store):
+        self.store = store
+        self.raw_connection = self
+        self.staged = []
+        self.copies = 0
+
+    @asynccontextmanager
+    async def transaction(self):
+        yield
+
+    async def fetch(self, query, hashes=None):
+        if query.startswith("INSERT INTO scf_graphs"):
+            assert "ON CONFLICT (content_hash) DO NOTHING RETURNING content_hash" in query
+            inserted = []
+            for record in self.staged:
+                if not self.store.by_hash(record["content_hash"]):
+                    self.store.rows.append(record)
+                    inserted.append({"content_hash": record["content_hash"]})
+            return inserted
+        return [{"id": r["id"], "content_hash": r["content_hash"]} for r in self.store.rows if r["content_hash"] in hashes]
+
+    async def execute(self, query):
+        pass
+
+    async def copy_records_to_table(self, table, records, columns):
+        assert table == "scf_graphs_staging"
+        self.staged += [dict(zip(columns, record)) for record in records]
+
+
+@pytest.fixture
+def store():
+    return _Store()
+
+
+@pytest.fixture
+def service(store):
+    db = DatabaseService()
+    db.database = store
+    return db
+
+
+class TestSaveGraph:
+    """Tests for DatabaseService.save_graph."""
+
+    async def test_same_content_returns_same_id(self, service, store):
+        """GIVEN a stored topology, WHEN saved again under another name, THEN the first id comes back."""
+        first = await service.save_graph("a", None, **_graph(1), meta={})
+        second = await service.save_graph("b", None, **_graph(1), meta={})
+
+        assert first[1] and not second[1]
+        assert first[0] == second[0]
+        assert len(store.rows) == 1
+
+    async def test_concurrent_insert_conflict_reselects(self, service, store, monkeypatch):
+        """GIVEN a concurrent save that stored the content after our lookup, WHEN inserting, THEN its id is returned."""
+        winner = store.add(_graph(1), graph_content_hash(**_graph(1)))
+        lookups = []
+
+        async def racing_lookup(hashes):
+            lookups.append(hashes)
+            if len(lookups) == 1:
+                return {}
+            return await DatabaseService.find_graphs_by_hash(service, hashes)
+
+        monkeypatch.setattr(service, "find_graphs_by_hash", racing_lookup)
+
+        graph_id, created = await service.save_graph("b", None, **_graph(1), meta={})
+
+        assert graph_id == str(winner) and not created
+        assert len(store.rows) == 1
+
+
+class TestBackfill:
+    """Tests for DatabaseService.backfill_content_hashes."""
+
+    async def test_rows_before_migration_get_hashes(self, service, store):
+        """GIVEN unhashed rows, two with the same topology, WHEN backfilled, THEN the oldest of each takes the hash."""
+        oldest = store.add(_graph(1))
+        copy = store.add(_graph(1))
+        other = store.add(_graph(2))
+
+        assert await service.backfill_content_hashes(batch_size=2) == 2
+
+        hashes = {r["id"]: r["content_hash"] for r in store.rows}
+        assert hashes[oldest] == graph_content_hash(**_graph(1))
+        assert hashes[other] == graph_content_hash(**_graph(2))
+        assert hashes[copy] is None
+        assert await service.find_graphs_by_hash([graph_content_hash(**_graph(1))]) == {hashes[oldest]: str(oldest)}
+        assert await service.backfill_content_hashes() == 0
+
+
+class TestBulkSave:
+    """Tests for DatabaseService.bulk_save_graphs."""
+
+    async def test_copy_merges_and_keeps_existing_ids(self, service, store):
+        """GIVEN one stored and two new graphs, WHEN bulk saved, THEN only new rows are added and every hash maps to an id."""
+        existing = store.add(_graph(1), graph_content_hash(**_graph(1)))
+        graphs = [
+            {"name": f"g{k}", **_graph(k), "meta": None, "content_hash": graph_content_hash(**_graph(k))}
+            for k in (1, 2, 3)
+        ]
+
+        ids, inserted = await service.bulk_save_graphs(graphs)
+
+        assert len(store.rows) == 3
+        assert ids[graphs[0]["content_hash"]] == str(existing)
+        assert set(ids) == {g["content_hash"] for g in graphs}
+        assert inserted == {g["content_hash"] for g in graphs[1:]}
+
+
+class TestLogAudit:
+    """Tests for DatabaseService.log_audit."""
+
+    async def test_score_is_not_written_to_shared_graph(self, service, store):
+        """GIVEN a graph shared by two uploads, WHEN one of them is audited, THEN only an audit run is recorded."""
+        graph_id, _ = await service.save_graph("a", None, **_graph(1), meta={})
+        await service.save_graph("b", None, **_graph(1), meta={})
+
+        await service.log_audit(graph_id, "PASSED", 0.9, 0.0, {})
+
+        assert [a["graph_id"] for a in store.audits] == [graph_id]
+
+
+class TestBulkUploadEndpoint:
+    """Tests for POST /api/upload-graphs/bulk."""
+
+    def test_ndjson_stream_across_batches(self, service, store, monkeypatch):
+        """GIVEN stored, repeated and malformed lines over several batches, WHEN streamed, THEN each line is classified."""
+        store.add(_graph(3), graph_content_hash(**_graph(3)))
+        monkeypatch.setattr(server, "db_service", service)
+        monkeypatch.setattr(server, "BULK_BATCH_SIZE", 2)
+        lines = [
+            json.dumps({"name": "a", **_graph(1)}),
+            "{not json",
+            json.dumps({"name": "a again", **_graph(1)}),
+            "",
+            json.dumps({"name": "c", **_graph(3)}),
+            json.dumps({"name": "b", **_graph(2)}),
+        ]
+
+        body = TestClient(server.app).post("/api/upload-graphs/bulk", content="\n".join(lines)).json()
+
+        statuses = [(r["line"], r["status"]) for r in body["results"]]
+        assert statuses == [(1, "UPLOADED"), (2, "INVALID"), (3, "DUPLICATE"), (5, "DUPLICATE"), (6, "UPLOADED")]
+        assert body["results"][0]["graph_id"] == body["results"][2]["graph_id"]
+        assert (body["uploaded"], body["duplicates"], body["invalid"]) == (2, 2, 1)
+        assert len(store.rows) == 3
+
+    def test_row_lost_to_concurrent_insert_is_duplicate(self, service, store, monkeypatch):
+        """GIVEN content stored by another upload after the hash lookup, WHEN the batch is merged, THEN it is a DUPLICATE."""
+        monkeypatch.setattr(server, "db_service", service)
+
+        async def racing_lookup(hashes):
+            store.add(_graph(1), graph_content_hash(**_graph(1)))
+            return {}
+
+        monkeypatch.setattr(service, "find_graphs_by_hash", racing_lookup)
+
+        body = TestClient(server.app).post("/api/upload-graphs/bulk", content=json.dumps({"name": "a", **_graph(1)})).json()
+
+        assert [r["status"] for r in body["results"]] == ["DUPLICATE"]
+        assert body["results"][0]["graph_id"] == str(store.rows[0]["id"])
+        assert len(store.rows) == 1
+
+
+class TestUploadEndpoint:
+    """Tests for POST /api/upload-graph."""
+
+    def test_same_topology_reports_duplicate(self, service, monkeypatch):
+        """GIVEN a stored topology, WHEN uploaded again under another name, THEN the existing id comes back as DUPLICATE."""
+        monkeypatch.setattr(server, "db_service", service)
+        client = TestClient(server.app)
+
+        first = client.post("/api/upload-graph", json={"name": "a", **_graph(1)}).json()
+        second = client.post("/api/upload-graph", json={"name": "b", **_graph(1)}).json()
+
+        assert (first["status"], second["status"]) == ("UPLOADED", "DUPLICATE")
+        assert first["graph_id"] == second["graph_id"]